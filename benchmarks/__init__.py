@@ -0,0 +1,32 @@
+"""
+Standalone performance benchmarks for the HPO backend
+
+Each module is run with ``python -m benchmarks.<name>`` from the project
+root. Unless ``DATABASE_URL`` is set, benchmarks run against a fresh
+in-memory SQLite database so they never touch ``db.sqlite3``.
+"""
+import os
+import time
+
+from hpo_app.metrics import percentile  # noqa: F401
+
+
+def setup_django():
+    """Configure Django for a benchmark run and migrate the database"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hpo.settings')
+    os.environ.setdefault('DATABASE_URL', 'sqlite://:memory:')
+    os.environ.setdefault('DEBUG', 'False')
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def timed(func, repeat):
+    """Call ``func`` ``repeat`` times and return the mean latency in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
@@ -0,0 +1,108 @@
+"""
+Card metadata cost when serializing 10k questions
+
+    python -m benchmarks.card_info
+
+Compares the previous ``get_card_info()``, which built a 36-entry dict
+literal on every call, with the static registry in ``hpo_app.cards``.
+No database access is needed; questions are unsaved instances.
+"""
+import argparse
+import time
+
+from benchmarks import setup_django
+
+
+def legacy_card_info(card):
+    """Copy of the pre-registry Question.get_card_info() body"""
+    if not card:
+        return None
+    card_data = {
+        # Spades
+        'S3': {'suit': 'Spades', 'value': '3', 'pointValue': 0, 'symbol': '♠'},
+        'S4': {'suit': 'Spades', 'value': '4', 'pointValue': 0, 'symbol': '♠'},
+        'S5': {'suit': 'Spades', 'value': '5', 'pointValue': 0, 'symbol': '♠'},
+        'S6': {'suit': 'Spades', 'value': '6', 'pointValue': 0, 'symbol': '♠'},
+        'S7': {'suit': 'Spades', 'value': '7', 'pointValue': 10, 'symbol': '♠'},
+        'SJ': {'suit': 'Spades', 'value': 'J', 'pointValue': 3, 'symbol': '♠'},
+        'SQ': {'suit': 'Spades', 'value': 'Q', 'pointValue': 2, 'symbol': '♠'},
+        'SK': {'suit': 'Spades', 'value': 'K', 'pointValue': 4, 'symbol': '♠'},
+        'SA': {'suit': 'Spades', 'value': 'A', 'pointValue': 11, 'symbol': '♠'},
+        # Hearts
+        'H3': {'suit': 'Hearts', 'value': '3', 'pointValue': 0, 'symbol': '♥'},
+        'H4': {'suit': 'Hearts', 'value': '4', 'pointValue': 0, 'symbol': '♥'},
+        'H5': {'suit': 'Hearts', 'value': '5', 'pointValue': 0, 'symbol': '♥'},
+        'H6': {'suit': 'Hearts', 'value': '6', 'pointValue': 0, 'symbol': '♥'},
+        'H7': {'suit': 'Hearts', 'value': '7', 'pointValue': 10, 'symbol': '♥'},
+        'HJ': {'suit': 'Hearts', 'value': 'J', 'pointValue': 3, 'symbol': '♥'},
+        'HQ': {'suit': 'Hearts', 'value': 'Q', 'pointValue': 2, 'symbol': '♥'},
+        'HK': {'suit': 'Hearts', 'value': 'K', 'pointValue': 4, 'symbol': '♥'},
+        'HA': {'suit': 'Hearts', 'value': 'A', 'pointValue': 11, 'symbol': '♥'},
+        # Clubs
+        'C3': {'suit': 'Clubs', 'value': '3', 'pointValue': 0, 'symbol': '♣'},
+        'C4': {'suit': 'Clubs', 'value': '4', 'pointValue': 0, 'symbol': '♣'},
+        'C5': {'suit': 'Clubs', 'value': '5', 'pointValue': 0, 'symbol': '♣'},
+        'C6': {'suit': 'Clubs', 'value': '6', 'pointValue': 0, 'symbol': '♣'},
+        'C7': {'suit': 'Clubs', 'value': '7', 'pointValue': 10, 'symbol': '♣'},
+        'CJ': {'suit': 'Clubs', 'value': 'J', 'pointValue': 3, 'symbol': '♣'},
+        'CQ': {'suit': 'Clubs', 'value': 'Q', 'pointValue': 2, 'symbol': '♣'},
+        'CK': {'suit': 'Clubs', 'value': 'K', 'pointValue': 4, 'symbol': '♣'},
+        'CA': {'suit': 'Clubs', 'value': 'A', 'pointValue': 11, 'symbol': '♣'},
+        # Diamonds
+        'D3': {'suit': 'Diamonds', 'value': '3', 'pointValue': 0, 'symbol': '♦'},
+        'D4': {'suit': 'Diamonds', 'value': '4', 'pointValue': 0, 'symbol': '♦'},
+        'D5': {'suit': 'Diamonds', 'value': '5', 'pointValue': 0, 'symbol': '♦'},
+        'D6': {'suit': 'Diamonds', 'value': '6', 'pointValue': 0, 'symbol': '♦'},
+        'D7': {'suit': 'Diamonds', 'value': '7', 'pointValue': 10, 'symbol': '♦'},
+        'DJ': {'suit': 'Diamonds', 'value': 'J', 'pointValue': 3, 'symbol': '♦'},
+        'DQ': {'suit': 'Diamonds', 'value': 'Q', 'pointValue': 2, 'symbol': '♦'},
+        'DK': {'suit': 'Diamonds', 'value': 'K', 'pointValue': 4, 'symbol': '♦'},
+        'DA': {'suit': 'Diamonds', 'value': 'A', 'pointValue': 11, 'symbol': '♦'},
+    }
+    card_info = card_data.get(card, {})
+    card_info['id'] = card
+    return card_info
+
+
+def serialize(questions, card_info):
+    return [
+        {
+            'id': index,
+            'question_text': question.question_text,
+            'card': question.card,
+            'card_info': card_info(question),
+        }
+        for index, question in enumerate(questions)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from hpo_app.cards import CARD_IDS
+    from hpo_app.models import Question
+
+    questions = [
+        Question(question_text=f'Question {i}', card=CARD_IDS[i % len(CARD_IDS)])
+        for i in range(args.questions)
+    ]
+
+    variants = [
+        ('legacy dict literal', lambda q: legacy_card_info(q.card)),
+        ('card registry', lambda q: q.get_card_info()),
+    ]
+    for name, card_info in variants:
+        best = float('inf')
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            serialize(questions, card_info)
+            best = min(best, time.perf_counter() - start)
+        print(f'{name:<20} {best * 1000:8.1f} ms for {args.questions} questions')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""
+Load test of the player-centric game flow
+
+    python -m benchmarks.game_flow
+    python -m benchmarks.game_flow --games 500 --concurrency 8 --participants 4
+    python -m benchmarks.game_flow --save-baseline            # store results under the current commit
+    python -m benchmarks.game_flow --compare main --tolerance 0.25
+
+Seeds ``--players`` players, ``--questions`` questions and ``--history``
+completed games, then replays ``--games`` full games from ``--concurrency``
+threads: create → submit-player-result for every participant → award-points
+(correct answer) or record-wrong-answer for each loser. Requests go through
+the whole Django stack with the test client.
+
+Reports p50/p95/p99 latency, throughput and SQL queries per request for each
+endpoint. Uses a temporary SQLite file unless ``DATABASE_URL`` is set (point
+it at a scratch PostgreSQL database; it is written to).
+
+Baselines are stored in ``--baseline-file`` (JSON, keyed by name; the default
+name is the current git commit). ``--compare NAME`` prints the change per
+endpoint and exits with status 1 when p95 latency grows by more than
+``--tolerance`` or any endpoint runs more queries per request.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks import percentile, setup_django
+
+
+ENDPOINTS = ('create', 'submit-player-result', 'award-points', 'record-wrong-answer')
+DEFAULT_BASELINE_FILE = Path(__file__).resolve().parent / 'baselines' / 'game_flow.json'
+
+
+def seed(players, questions, history, participants):
+    """Create players, questions and completed games; returns (player ids and names, {question id: answer})"""
+    from django.contrib.auth.hashers import make_password
+    from django.utils import timezone
+    from hpo_app.cards import CARD_IDS
+    from hpo_app.models import Game, GameParticipant, GameResult, Player, Question
+
+    rng = random.Random(7)
+    password = make_password('benchmark-pass')
+    Player.objects.bulk_create([
+        Player(username=f'flow{i}', player_name=f'Flow {i}', password=password, age_group='15-19')
+        for i in range(players)
+    ], batch_size=1000)
+    Question.objects.bulk_create([
+        Question(
+            question_text=f'Flow question {i}', language='english', card=CARD_IDS[i % len(CARD_IDS)],
+            options=['Right', 'Wrong'], correct_answer='Right', explanation=f'Fact {i}',
+        )
+        for i in range(questions)
+    ], batch_size=1000)
+
+    player_rows = list(Player.objects.order_by('pk').values_list('pk', 'username', 'player_name'))
+    now = timezone.now()
+    games = Game.objects.bulk_create([
+        Game(participant_count=participants, team_count=2, status='completed', winning_team=1, completed_at=now)
+        for _ in range(history)
+    ], batch_size=1000)
+    if games and games[0].pk is None:
+        games = list(Game.objects.order_by('pk'))
+    GameParticipant.objects.bulk_create([
+        GameParticipant(
+            game=game, player_id=player_id, team=index % 2 + 1, is_winner=index % 2 == 0,
+            marks_earned=1 if index % 2 == 0 else 0,
+            lost_card=None if index % 2 == 0 else rng.choice(CARD_IDS),
+        )
+        for game in games
+        for index, (player_id, _, _) in enumerate(rng.sample(player_rows, participants))
+    ], batch_size=1000)
+    GameResult.objects.bulk_create([GameResult(game=game, team1_marks=participants // 2) for game in games], batch_size=1000)
+
+    answers = dict(Question.objects.values_list('pk', 'correct_answer'))
+    return player_rows, answers
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def play_games(games, concurrency, participants, player_rows, answers, wrong_rate):
+    """Replay games from several threads; returns ({endpoint: [(ms, queries, ok)]}, elapsed seconds)"""
+    from django.db import connection
+    from django.test import Client
+    from hpo_app.cards import CARD_IDS
+
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    per_thread = max(1, games // concurrency)
+
+    def call(client, endpoint, path, payload):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = client.post(path, data=json.dumps(payload), content_type='application/json', secure=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            samples[endpoint].append((elapsed, counter.count, response.status_code == 200))
+        return response.json() if response.status_code == 200 else None
+
+    def worker(seed_value):
+        rng = random.Random(seed_value)
+        client = Client(SERVER_NAME='localhost')
+        try:
+            for _ in range(per_thread):
+                game = call(client, 'create', '/api/games/create/', {'participant_count': participants})
+                if game is None:
+                    continue
+                match_id = game['game']['match_id']
+                losers = []
+                for index, (player_id, username, player_name) in enumerate(rng.sample(player_rows, participants)):
+                    is_winner = index % 2 == 0
+                    result = call(client, 'submit-player-result', '/api/games/submit-player-result/', {
+                        'match_id': match_id, 'player_id': player_id, 'username': username,
+                        'player_name': player_name, 'team': 1 if is_winner else 2,
+                        'marks_earned': 1 if is_winner else 0, 'is_winner': is_winner,
+                        'lost_card': None if is_winner else rng.choice(CARD_IDS),
+                    })
+                    question = (result or {}).get('response', {}).get('question')
+                    if question:
+                        losers.append((username, question['id']))
+                for username, question_id in losers:
+                    payload = {'match_id': match_id, 'username': username, 'question_id': question_id}
+                    if rng.random() < wrong_rate:
+                        call(client, 'record-wrong-answer', '/api/games/record-wrong-answer/',
+                             {**payload, 'answer': 'Wrong'})
+                    else:
+                        call(client, 'award-points', '/api/games/award-points/',
+                             {**payload, 'answer': answers[question_id], 'points': 1})
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    results = {}
+    for endpoint in ENDPOINTS:
+        rows = samples.get(endpoint)
+        if not rows:
+            continue
+        latencies = sorted(ms for ms, _, _ in rows)
+        results[endpoint] = {
+            'requests': len(rows),
+            'errors': sum(1 for _, _, ok in rows if not ok),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'throughput_rps': round(len(rows) / elapsed, 1),
+            'queries_per_request': round(sum(queries for _, queries, _ in rows) / len(rows), 2),
+        }
+    return results
+
+
+def print_results(results, elapsed, games):
+    print(f'{"endpoint":<22} {"reqs":>6} {"errors":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"req/s":>8} {"queries":>8}')
+    for endpoint, row in results.items():
+        print(
+            f'{endpoint:<22} {row["requests"]:>6} {row["errors"]:>6} {row["p50_ms"]:>8} {row["p95_ms"]:>8} '
+            f'{row["p99_ms"]:>8} {row["throughput_rps"]:>8} {row["queries_per_request"]:>8}'
+        )
+    print(f'{games} games in {elapsed:.2f}s ({games / elapsed:.1f} games/s)')
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against a baseline; returns True when there is a regression"""
+    regressed = False
+    print(f'\n{"endpoint":<22} {"p95 ms":>18} {"change":>8} {"queries":>14}')
+    for endpoint, row in results.items():
+        before = baseline['results'].get(endpoint)
+        if before is None:
+            continue
+        change = (row['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+        flags = []
+        if change > tolerance:
+            flags.append('SLOWER')
+        if row['queries_per_request'] > before['queries_per_request']:
+            flags.append('MORE QUERIES')
+        regressed = regressed or bool(flags)
+        print(
+            f'{endpoint:<22} {before["p95_ms"]:>8} -> {row["p95_ms"]:<7} {change:>+8.0%} '
+            f'{before["queries_per_request"]:>5} -> {row["queries_per_request"]:<5} {" ".join(flags)}'
+        )
+    return regressed
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--questions', type=int, default=1000)
+    parser.add_argument('--history', type=int, default=2000, help='Completed games seeded before the run')
+    parser.add_argument('--games', type=int, default=200, help='Games played during the run')
+    parser.add_argument('--participants', type=int, choices=[2, 4, 6], default=4)
+    parser.add_argument('--concurrency', type=int, default=4, help='Client threads')
+    parser.add_argument('--wrong-rate', type=float, default=0.5, help='Fraction of losers answering wrong')
+    parser.add_argument('--baseline-file', type=Path, default=DEFAULT_BASELINE_FILE)
+    parser.add_argument('--save-baseline', nargs='?', const='', metavar='NAME',
+                        help='Store the results (default name: current git commit)')
+    parser.add_argument('--compare', metavar='NAME', help='Compare with a stored baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95 growth when comparing')
+    args = parser.parse_args()
+
+    db_path = None
+    if 'DATABASE_URL' not in os.environ:
+        handle, db_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    setup_django()
+
+    from django.db import connection
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+    try:
+        player_rows, answers = seed(args.players, args.questions, args.history, args.participants)
+        samples, elapsed = play_games(
+            args.games, args.concurrency, args.participants, player_rows, answers, args.wrong_rate
+        )
+    finally:
+        if db_path:
+            connection.close()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+    results = summarize(samples, elapsed)
+    games = (args.games // args.concurrency or 1) * args.concurrency
+    print_results(results, elapsed, games)
+
+    baselines = json.loads(args.baseline_file.read_text()) if args.baseline_file.exists() else {}
+    regressed = False
+    if args.compare:
+        if args.compare not in baselines:
+            sys.exit(f'No baseline named {args.compare!r} in {args.baseline_file}')
+        regressed = compare(results, baselines[args.compare], args.tolerance)
+
+    if args.save_baseline is not None:
+        name = args.save_baseline or current_commit()
+        baselines[name] = {
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'database': connection.vendor,
+            'options': {
+                key: getattr(args, key)
+                for key in ('players', 'questions', 'history', 'games', 'participants', 'concurrency', 'wrong_rate')
+            },
+            'results': results,
+        }
+        args.baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline_file.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n')
+        print(f'Saved baseline {name!r} to {args.baseline_file}')
+
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
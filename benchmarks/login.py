@@ -0,0 +1,96 @@
+"""
+Login throughput of a single worker process
+
+    python -m benchmarks.login
+    python -m benchmarks.login --iterations 600000 100000 --pool-workers 1 4 --threads 8
+
+Simulates a threaded worker: ``--threads`` request threads post to
+``/api/v1/auth/login/`` while password checks run in the bounded hashing
+pool (``LOGIN_HASH_WORKERS``). Reports logins per second for each PBKDF2
+work factor and pool size. Uses a temporary SQLite file (unless
+``DATABASE_URL`` is set) so request threads share one database.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks import setup_django
+
+
+def run(client_factory, usernames, threads, logins):
+    per_thread = max(1, logins // threads)
+    failures = []
+
+    def worker(index):
+        client = client_factory()
+        for i in range(per_thread):
+            username = usernames[(index * per_thread + i) % len(usernames)]
+            response = client.post(
+                '/api/v1/auth/login/',
+                data=json.dumps({'username': username, 'password': 'benchmark-pass'}),
+                content_type='application/json',
+                secure=True,
+            )
+            if response.status_code != 200:
+                failures.append(response.status_code)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads / elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, nargs='+', default=[600000, 260000, 100000])
+    parser.add_argument('--pool-workers', type=int, nargs='+', default=[1, os.cpu_count() or 2])
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent request threads')
+    parser.add_argument('--logins', type=int, default=64, help='Logins per measurement')
+    parser.add_argument('--players', type=int, default=50)
+    args = parser.parse_args()
+
+    db_path = None
+    if 'DATABASE_URL' not in os.environ:
+        handle, db_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    setup_django()
+
+    from django.contrib.auth.hashers import make_password
+    from django.test import Client
+    from django.test.utils import override_settings
+    from hpo_app.login import PasswordVerifier
+    from hpo_app import api_views
+    from hpo_app.models import Player
+
+    print(f'{"iterations":>10} {"pool":>5} {"threads":>8} {"logins/s":>9} {"failures":>9}')
+    for iterations in args.iterations:
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+            Player.objects.all().delete()
+            encoded = make_password('benchmark-pass')
+            Player.objects.bulk_create([
+                Player(username=f'login{i}', player_name=f'Login {i}', password=encoded)
+                for i in range(args.players)
+            ])
+            usernames = [f'login{i}' for i in range(args.players)]
+
+            for pool_workers in args.pool_workers:
+                verifier = PasswordVerifier(workers=pool_workers, queue_size=args.threads)
+                api_views.password_verifier = verifier
+                rate, failures = run(lambda: Client(SERVER_NAME='localhost'), usernames, args.threads, args.logins)
+                verifier.shutdown()
+                print(f'{iterations:>10} {pool_workers:>5} {args.threads:>8} {rate:>9.1f} {len(failures):>9}')
+
+    if db_path:
+        os.remove(db_path)
+
+
+if __name__ == '__main__':
+    main()
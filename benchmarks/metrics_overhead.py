@@ -0,0 +1,54 @@
+"""
+Overhead of QueryMetricsMiddleware per request
+
+    python -m benchmarks.metrics_overhead
+    python -m benchmarks.metrics_overhead --rates 0 0.05 1 --repeat 2000
+
+Calls the game status view for a 6-player game through a minimal handler
+(the view wrapped by the middleware, no other middleware) and reports the
+mean latency without the middleware and at each sample rate.
+"""
+import argparse
+
+from benchmarks import setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rates', type=float, nargs='+', default=[0.0, 0.05, 1.0])
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import RequestFactory
+    from django.test.utils import override_settings
+    from django.urls import resolve
+    from hpo_app.metrics import QueryMetricsMiddleware, registry
+    from hpo_app.models import Game, GameParticipant, Player
+    from hpo_app.views import get_game_status_api
+
+    game = Game.objects.create(participant_count=6)
+    for i in range(6):
+        player = Player.objects.create(username=f'metrics{i}', player_name=f'Metrics {i}', password='x' * 10)
+        GameParticipant.objects.create(game=game, player=player, team=i % 2 + 1)
+
+    path = f'/api/games/{game.match_id}/status/'
+    request = RequestFactory().get(path)
+    request.resolver_match = resolve(path)
+
+    def view(request):
+        return get_game_status_api(request, match_id=game.match_id)
+
+    baseline = timed(lambda: view(request), args.repeat)
+    print(f'{"mode":>16} {"us/request":>11} {"overhead us":>12}')
+    print(f'{"no middleware":>16} {baseline:>11.1f} {"":>12}')
+    middleware = QueryMetricsMiddleware(view)
+    for rate in args.rates:
+        registry.reset()
+        with override_settings(METRICS_SAMPLE_RATE=rate):
+            latency = timed(lambda: middleware(request), args.repeat)
+        print(f'{f"sample {rate:g}":>16} {latency:>11.1f} {latency - baseline:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
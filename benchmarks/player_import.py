@@ -0,0 +1,61 @@
+"""
+Bulk player import throughput
+
+    python -m benchmarks.player_import
+    python -m benchmarks.player_import --players 100000 --workers 0 4 8 --iterations 600000
+
+Generates a CSV of ``--players`` rows (1% invalid) and imports it with
+``import_players`` for each number of hashing processes, reporting players
+per second and the projected time for 100k players. Each run starts from an
+empty Player table.
+"""
+import argparse
+import io
+import os
+import time
+
+from benchmarks import setup_django
+
+
+def make_csv(players, locations):
+    lines = ['player_name,username,password,email,age_group,province,district']
+    for i in range(players):
+        province, district = locations[i % len(locations)]
+        # Every hundredth row is rejected
+        if i % 100 == 99:
+            district = 'Nowhere'
+        lines.append(f'Student {i},student{i},pass-{i:06d},student{i}@example.com,15-19,{province},{district}')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, os.cpu_count() or 2])
+    parser.add_argument('--iterations', type=int, default=600000, help='PBKDF2 work factor')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test.utils import override_settings
+    from hpo_app.locations import PROVINCE_DISTRICTS
+    from hpo_app.models import Player
+    from hpo_app.player_import import import_players
+
+    locations = [(province, district) for province, districts in PROVINCE_DISTRICTS.items() for district in districts]
+    data = make_csv(args.players, locations)
+
+    print(f'{"workers":>8} {"created":>8} {"rejected":>9} {"players/s":>10} {"100k in":>9}')
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=args.iterations):
+        for workers in args.workers:
+            Player.objects.all().delete()
+            start = time.perf_counter()
+            result = import_players(io.StringIO(data), 'csv', workers=workers, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            rate = args.players / elapsed
+            print(f'{workers:>8} {result.created:>8} {result.failed:>9} {rate:>10.1f} {100000 / rate / 60:>8.1f}m')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Random question selection latency as the question table grows
+
+    python -m benchmarks.question_sampling
+    python -m benchmarks.question_sampling --sizes 1000 10000 --skip-order-by
+
+Compares the legacy ``order_by('?').first()`` query with the cached id
+pool in ``hpo_app.question_sampling``. The pool latency should stay flat
+from 1k to 1M rows while ``ORDER BY RANDOM()`` grows linearly.
+"""
+import argparse
+
+from benchmarks import setup_django, timed
+
+
+def grow_table(target, batch_size=10000):
+    from hpo_app.models import Question
+
+    languages = [choice[0] for choice in Question.LANGUAGE_CHOICES]
+    cards = [choice[0] for choice in Question.CARD_CHOICES]
+    current = Question.objects.count()
+    while current < target:
+        size = min(batch_size, target - current)
+        Question.objects.bulk_create([
+            Question(
+                question_text=f'Benchmark question {current + i}',
+                language=languages[(current + i) % len(languages)],
+                card=cards[(current + i) % len(cards)],
+                options=['A', 'B'],
+                correct_answer='A',
+                explanation=f'Benchmark explanation {current + i}',
+            )
+            for i in range(size)
+        ], batch_size=batch_size)
+        current += size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--skip-order-by', action='store_true', help='Skip the ORDER BY RANDOM() baseline')
+    args = parser.parse_args()
+
+    setup_django()
+    from hpo_app.models import Question
+    from hpo_app.question_sampling import QuestionSampler
+
+    print(f'{"rows":>10} {"order_by(?) us":>16} {"pool us":>10} {"pool+lang us":>13} {"cold load ms":>13}')
+    for size in sorted(args.sizes):
+        grow_table(size)
+        sampler = QuestionSampler(ttl=3600)
+
+        cold = timed(sampler.get_pool, 1) / 1000
+        pool = timed(sampler.random_question, args.repeat)
+        sampler.random_question(language='english')
+        filtered = timed(lambda: sampler.random_question(language='english'), args.repeat)
+
+        if args.skip_order_by:
+            baseline = '-'
+        else:
+            repeat = max(1, args.repeat // 20)
+            baseline = f'{timed(lambda: Question.objects.all().order_by("?").first(), repeat):.0f}'
+
+        print(f'{size:>10} {baseline:>16} {pool:>10.0f} {filtered:>13.0f} {cold:>13.1f}')
+
+
+if __name__ == '__main__':
+    main()
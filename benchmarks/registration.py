@@ -0,0 +1,65 @@
+"""
+Bulk player registration
+
+    python -m benchmarks.registration
+    python -m benchmarks.registration --signups 10000 --iterations 1000
+
+Posts ``--signups`` registrations to ``/api/v1/auth/register/`` (every tenth
+one a duplicate username or email) and reports sign-ups per second and
+database queries per sign-up. PBKDF2 runs with a low work factor so the
+numbers reflect validation and database work rather than hashing.
+"""
+import argparse
+import json
+import time
+
+from benchmarks import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--signups', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=1000, help='PBKDF2 work factor')
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from hpo_app.locations import PROVINCE_DISTRICTS
+
+    locations = [(province, district) for province, districts in PROVINCE_DISTRICTS.items() for district in districts]
+    client = Client(SERVER_NAME='localhost')
+
+    def payload(i):
+        # Every tenth sign-up reuses an earlier username or email
+        username = f'player{i - 5}' if i % 20 == 10 else f'player{i}'
+        email = f'player{i - 5}@example.com' if i % 20 == 0 and i else f'player{i}@example.com'
+        province, district = locations[i % len(locations)]
+        return json.dumps({
+            'player_name': f'Player {i}', 'username': username, 'email': email, 'phone': '0780000000',
+            'password': 'benchmark-pass', 'password_confirm': 'benchmark-pass',
+            'province': province, 'district': district,
+        })
+
+    created = rejected = 0
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=args.iterations), CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        for i in range(args.signups):
+            response = client.post(
+                '/api/v1/auth/register/', data=payload(i), content_type='application/json', secure=True
+            )
+            if response.status_code == 201:
+                created += 1
+            else:
+                rejected += 1
+        elapsed = time.perf_counter() - start
+
+    print(f'sign-ups:           {args.signups} ({created} created, {rejected} rejected)')
+    print(f'sign-ups/s:         {args.signups / elapsed:.1f}')
+    print(f'queries per signup: {len(ctx.captured_queries) / args.signups:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Token authentication cost on cold and warm requests
+
+    python -m benchmarks.token_auth
+    python -m benchmarks.token_auth --players 10000 --repeat 2000
+
+Authenticates legacy ``Token <uuid>`` and signed ``Token <payload:signature>``
+headers with ``PlayerTokenAuthentication``. Cold lookups hit the database
+once; warm lookups are served from the per-worker token cache (signed tokens
+still verify their signature and expiry) and should run zero queries.
+"""
+import argparse
+
+from benchmarks import setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+    from hpo_app.authentication import player_authenticator, token_cache
+    from hpo_app.models import Player
+    from hpo_app.tokens import issue_token
+
+    Player.objects.bulk_create([
+        Player(username=f'bench{i}', player_name=f'Bench {i}', password='x' * 10)
+        for i in range(args.players)
+    ], batch_size=1000)
+    player = Player.objects.order_by('-pk').first()
+    signed_token, _ = issue_token(player)
+
+    print(f'{"token":>7} {"mode":>6} {"queries":>8} {"us/request":>11}')
+    for kind, token in (('legacy', player.uuid), ('signed', signed_token)):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {token}')
+
+        def cold():
+            token_cache.invalidate()
+            player_authenticator.authenticate(request)
+
+        def warm():
+            player_authenticator.authenticate(request)
+
+        for mode, func in (('cold', cold), ('warm', warm)):
+            func()
+            with CaptureQueriesContext(connection) as ctx:
+                func()
+            latency = timed(func, args.repeat)
+            print(f'{kind:>7} {mode:>6} {len(ctx.captured_queries):>8} {latency:>11.1f}')
+
+    print(f'cache: {token_cache.stats()}')
+
+
+if __name__ == '__main__':
+    main()
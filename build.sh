@@ -12,5 +12,9 @@ python3 manage.py collectstatic --no-input
 # Run migrations
 python3 manage.py migrate
 
+# Refresh the daily stats behind the day/week/month leaderboards (the hpo-admin-rollup
+# cron job in render.yaml keeps today's rows current between deploys)
+python3 manage.py rollup_player_stats --days 31
+
 # Create superuser if none exists
 python3 manage.py create_superuser_if_none_exists
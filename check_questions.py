@@ -6,25 +6,25 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hpo.settings')
 django.setup()
 
+from django.db.models import Count
+
 from hpo_app.models import Question
 
-# Check questions
-questions = Question.objects.all()
-print(f'Total questions: {questions.count()}')
+# Check questions; counts come from aggregate queries so this stays fast on large tables
+total = Question.objects.count()
+print(f'Total questions: {total}')
+
+if total:
+    language_counts = Question.objects.values('language').annotate(count=Count('id')).order_by('language')
+    print(f'Languages found: {set(row["language"] for row in language_counts)}')
 
-if questions.exists():
-    languages = set(q.language for q in questions)
-    print(f'Languages found: {languages}')
-    
     print('\nFirst few questions:')
-    for q in questions[:3]:
+    for q in Question.objects.order_by('id').only('id', 'language', 'question_text')[:3]:
         print(f'  ID: {q.id}, Language: {q.language}, Question: {q.question_text[:50]}...')
-        
+
     # Count by language
     print('\nLanguage distribution:')
-    from collections import Counter
-    language_counts = Counter(q.language for q in questions)
-    for lang, count in language_counts.items():
-        print(f'  {lang}: {count} questions')
+    for row in language_counts:
+        print(f'  {row["language"]}: {row["count"]} questions')
 else:
     print('No questions found in database')
@@ -107,6 +107,8 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # File-backed test database so multi-threaded tests can write concurrently
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 
@@ -130,6 +132,27 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing: the first hasher is used for new hashes; stored hashes made
+# with any other listed hasher (or another PBKDF2 work factor) are upgraded on login
+PASSWORD_HASHERS = [
+    hasher.strip() for hasher in os.getenv(
+        'PASSWORD_HASHERS',
+        'hpo_app.hashers.TunablePBKDF2PasswordHasher,'
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher,'
+        'django.contrib.auth.hashers.Argon2PasswordHasher,'
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher,'
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ).split(',') if hasher.strip()
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', '600000'))
+
+# Password checks during login run in a bounded per-worker thread pool; keep it
+# the size of gunicorn's --threads (render.yaml, Procfile), since a sync worker
+# serves one request at a time and never overlaps checks
+LOGIN_HASH_WORKERS = int(os.getenv('LOGIN_HASH_WORKERS', '4'))
+LOGIN_HASH_QUEUE_SIZE = int(os.getenv('LOGIN_HASH_QUEUE_SIZE', '64'))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -222,3 +245,66 @@ CORS_ALLOW_METHODS = [
     'POST',
     'PUT',
 ]
+
+# Per-worker question caches (seconds before a worker reloads from the database)
+QUESTION_POOL_TTL = int(os.getenv('QUESTION_POOL_TTL', '300'))
+QUESTION_CACHE_TTL = int(os.getenv('QUESTION_CACHE_TTL', '300'))
+
+# Leaderboards: minimum games/answers before a player is ranked by win rate/answer accuracy
+LEADERBOARD_MIN_GAMES = int(os.getenv('LEADERBOARD_MIN_GAMES', '5'))
+LEADERBOARD_MIN_ANSWERS = int(os.getenv('LEADERBOARD_MIN_ANSWERS', '5'))
+
+# Per-worker token -> player cache used by PlayerTokenAuthentication
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '10000'))
+TOKEN_CACHE_TTL = int(os.getenv('TOKEN_CACHE_TTL', '300'))
+
+# Signed player tokens (seconds); legacy Player UUID tokens are accepted while PLAYER_TOKEN_ACCEPT_LEGACY is on
+PLAYER_TOKEN_TTL = int(os.getenv('PLAYER_TOKEN_TTL', str(7 * 24 * 3600)))
+PLAYER_TOKEN_ACCEPT_LEGACY = os.getenv('PLAYER_TOKEN_ACCEPT_LEGACY', 'True').lower() == 'true'
+PLAYER_TOKEN_REVOCATION_REFRESH = int(os.getenv('PLAYER_TOKEN_REVOCATION_REFRESH', '30'))
+
+# Game history exports stop this many seconds before now, so a game whose change commits
+# after the export started (in a transaction that began earlier) is picked up by the next run
+EXPORT_WATERMARK_LAG = int(os.getenv('EXPORT_WATERMARK_LAG', '60'))
+
+# Processes used to hash passwords by the import_players command (the admin upload hashes in-process)
+PLAYER_IMPORT_WORKERS = int(os.getenv('PLAYER_IMPORT_WORKERS', str(os.cpu_count() or 2)))
+# The admin upload hashes and inserts inside the request, so keep it well under the
+# gunicorn timeout (30s; one PBKDF2 hash takes ~0.25s per core); use import_players for more
+PLAYER_IMPORT_ADMIN_MAX_ROWS = int(os.getenv('PLAYER_IMPORT_ADMIN_MAX_ROWS', '50'))
+PLAYER_IMPORT_ADMIN_MAX_BYTES = int(os.getenv('PLAYER_IMPORT_ADMIN_MAX_BYTES', str(256 * 1024)))
+
+# Game content view/usage counts are buffered per worker and written every
+# CONTENT_COUNTER_FLUSH_INTERVAL seconds (0 writes each increment immediately)
+CONTENT_COUNTER_FLUSH_INTERVAL = int(os.getenv('CONTENT_COUNTER_FLUSH_INTERVAL', '10'))
+CONTENT_COUNTER_MAX_PENDING = int(os.getenv('CONTENT_COUNTER_MAX_PENDING', '1000'))
+
+# Opt-in request metrics (see hpo_app/metrics.py): latency for every request, SQL query
+# counts and fingerprints for a METRICS_SAMPLE_RATE fraction of them
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+METRICS_SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', '0.05'))
+METRICS_MAX_FINGERPRINTS = int(os.getenv('METRICS_MAX_FINGERPRINTS', '500'))
+# Bearer token for scraping /api/metrics/ without a staff session (empty: staff only)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# JSON line per sampled request, summarized by `manage.py metrics_report`
+METRICS_LOG_FILE = os.getenv('METRICS_LOG_FILE', '')
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'hpo_app.metrics.QueryMetricsMiddleware')
+
+if METRICS_LOG_FILE:
+    LOGGING = {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {'raw': {'format': '%(message)s'}},
+        'handlers': {
+            'metrics_file': {
+                'class': 'logging.FileHandler',
+                'filename': METRICS_LOG_FILE,
+                'formatter': 'raw',
+            },
+        },
+        'loggers': {
+            'hpo_app.metrics': {'handlers': ['metrics_file'], 'level': 'INFO', 'propagate': False},
+        },
+    }
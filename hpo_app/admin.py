@@ -1,13 +1,20 @@
 from django.contrib import admin
 from django import forms
 from django.db import models
+from django.db.models.functions import Coalesce, Now
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from .models import (
     Organisation, Admin, Group, Player, Question, QuestionPackage, 
     OrganizationalPackage, PublicPackage, PackageAttempt,
     Game, GameParticipant, GameResult, GameResponse, 
-    Topic, Subtopic, GameContent
+    LeaderboardEntry, Topic, Subtopic, GameContent
 )
-from .forms import QuestionAdminForm, PlayerAdminForm, GameContentAdminForm
+from .forms import QuestionAdminForm, PlayerAdminForm, PlayerImportForm, GameContentAdminForm
+from . import exports
+from .player_import import admin_upload_limits, detect_format, import_players, open_upload
 
 # Customize admin site headers and titles
 admin.site.site_header = "HPO Administration"
@@ -100,6 +107,50 @@ class PlayerAdmin(admin.ModelAdmin):
         return f"{obj.win_rate}%"
     win_rate_display.short_description = "Win Rate"
     
+    change_list_template = 'admin/hpo_app/player/change_list.html'
+    
+    # Row errors shown on the result page; the counts always cover every row
+    IMPORT_ERRORS_SHOWN = 200
+    
+    def get_urls(self):
+        urls = [
+            path(
+                'import/', self.admin_site.admin_view(self.import_players_view),
+                name='hpo_app_player_import'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def import_players_view(self, request):
+        """Upload a CSV/JSONL file of players (see player_import.py)"""
+        if not self.has_add_permission(request):
+            return redirect(reverse('admin:hpo_app_player_changelist'))
+        
+        result = None
+        form = PlayerImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            fmt = form.cleaned_data['format'] or detect_format(upload.name)
+            # Small capped files: hash in this thread rather than starting processes from a web worker
+            result = import_players(
+                open_upload(upload), fmt, organization=form.cleaned_data['organization'], workers=0
+            )
+            self.message_user(
+                request,
+                f'Imported {result.created} of {result.rows} players ({result.failed} rows rejected).'
+            )
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import players',
+            'form': form,
+            'result': result,
+            'errors_shown': result.errors[:self.IMPORT_ERRORS_SHOWN] if result else [],
+            'max_rows': admin_upload_limits()[0],
+        }
+        return TemplateResponse(request, 'admin/hpo_app/player/import_players.html', context)
+    
     # Custom Actions
     actions = [
         'make_premium', 'make_free', 'reset_points', 'reset_game_stats',
@@ -107,6 +158,8 @@ class PlayerAdmin(admin.ModelAdmin):
     ]
     
     def reset_game_stats(self, request, queryset):
+        # Entries first: the queryset may be filtered on the columns being reset
+        LeaderboardEntry.objects.filter(player__in=queryset).delete()
         updated = queryset.update(
             games_played=0, games_won=0, games_lost=0, total_game_marks=0,
             questions_answered=0, correct_answers=0, current_win_streak=0,
@@ -131,12 +184,14 @@ class PlayerAdmin(admin.ModelAdmin):
     reset_points.short_description = "Reset points and attempts for selected players"
     
     def update_to_kigali(self, request, queryset):
+        LeaderboardEntry.objects.filter(player__in=queryset).update(province='Kigali City', district='Gasabo')
         updated = queryset.update(province='Kigali City', district='Gasabo')
         self.message_user(request, f'{updated} players moved to Kigali City, Gasabo district.')
     update_to_kigali.short_description = "Move selected players to Kigali City (Gasabo)"
     
     def bulk_edit_age_group(self, request, queryset):
         # This could be enhanced with a custom form
+        LeaderboardEntry.objects.filter(player__in=queryset).update(age_group='20-24')
         updated = queryset.update(age_group='20-24')
         self.message_user(request, f'{updated} players age group updated to 20-24.')
     bulk_edit_age_group.short_description = "Set age group to 20-24 for selected players"
@@ -388,7 +443,7 @@ class GameAdmin(admin.ModelAdmin):
     ]
     list_filter = ['status', 'participant_count', 'winning_team', 'created_at']
     search_fields = ['match_id']
-    readonly_fields = ['match_id', 'team_count', 'created_at', 'completed_at']
+    readonly_fields = ['match_id', 'team_count', 'created_at', 'completed_at', 'updated_at']
     
     fieldsets = (
         ('Game Information', {
@@ -398,7 +453,7 @@ class GameAdmin(admin.ModelAdmin):
             'fields': ('winning_team', 'cards_chosen')
         }),
         ('Timestamps', {
-            'fields': ('created_at', 'completed_at')
+            'fields': ('created_at', 'completed_at', 'updated_at')
         })
     )
     
@@ -406,15 +461,65 @@ class GameAdmin(admin.ModelAdmin):
         return str(obj.match_id)[:8] + "..."
     match_id_short.short_description = "Match ID"
     
+    def get_urls(self):
+        urls = [
+            path(
+                'export/', self.admin_site.admin_view(self.export_history_view),
+                name='hpo_app_game_export'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def export_history_view(self, request):
+        """
+        Stream game history for analytics, e.g.
+        /admin/hpo_app/game/export/?dataset=participants&format=jsonl&since=2025-01-01T00:00:00Z
+        The X-Export-Watermark header is the since value for the next incremental export.
+        """
+        if not request.user.is_staff or not self.has_view_permission(request):
+            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        
+        dataset = request.GET.get('dataset', 'games')
+        fmt = request.GET.get('format', 'csv')
+        if dataset not in exports.DATASETS:
+            return JsonResponse({
+                'success': False,
+                'error': f'Invalid dataset. Valid options: {", ".join(sorted(exports.DATASETS))}'
+            }, status=400)
+        if fmt not in exports.FORMATS:
+            return JsonResponse({
+                'success': False,
+                'error': f'Invalid format. Valid options: {", ".join(exports.FORMATS)}'
+            }, status=400)
+        
+        bounds = {}
+        for param in ('since', 'until'):
+            if request.GET.get(param):
+                bounds[param] = exports.parse_timestamp(request.GET[param])
+                if bounds[param] is None:
+                    return JsonResponse({'success': False, 'error': f'{param} must be an ISO 8601 timestamp'}, status=400)
+        until = bounds.get('until') or exports.default_until()
+        
+        rows = exports.export_rows(dataset, bounds.get('since'), until)
+        response = StreamingHttpResponse(
+            exports.render_lines(dataset, fmt, rows), content_type=exports.CONTENT_TYPES[fmt]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{dataset}-{until:%Y%m%dT%H%M%S}.{fmt}"'
+        response['X-Export-Watermark'] = until.isoformat()
+        return response
+    
     actions = ['mark_completed', 'mark_cancelled']
     
     def mark_completed(self, request, queryset):
-        updated = queryset.update(status='completed')
+        # update() skips auto_now; updated_at is the export watermark (see exports.py)
+        updated = queryset.update(
+            status='completed', completed_at=Coalesce('completed_at', Now()), updated_at=Now()
+        )
         self.message_user(request, f'{updated} games marked as completed.')
     mark_completed.short_description = "Mark selected games as completed"
     
     def mark_cancelled(self, request, queryset):
-        updated = queryset.update(status='cancelled')
+        updated = queryset.update(status='cancelled', updated_at=Now())
         self.message_user(request, f'{updated} games marked as cancelled.')
     mark_cancelled.short_description = "Mark selected games as cancelled"
 
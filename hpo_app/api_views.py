@@ -1,12 +1,16 @@
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.contrib.auth.hashers import check_password
 from django.db import IntegrityError
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from .authentication import token_cache
+from .conditional import static_condition
+from .locations import PROVINCE_DISTRICT_OPTIONS
+from .login import LoginBusy, password_verifier
 from .models import Player
 from .serializers import PlayerRegistrationSerializer, PlayerSerializer, PlayerLoginSerializer
+from .tokens import issue_token, revoke_token
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -27,12 +31,13 @@ class PlayerRegistrationView(generics.CreateAPIView):
                 player = serializer.save()
                 
                 # Since we're using a custom Player model (not extending User),
-                # we'll create a simple token-like response without using DRF's Token model
-                # For now, we'll use the player's UUID as a simple token
+                # we issue our own signed, expiring token instead of DRF's Token model
+                token, expires_at = issue_token(player)
                 response_data = {
                     'message': 'Player registered successfully',
                     'player': PlayerSerializer(player).data,
-                    'token': str(player.uuid)  # Using player's UUID as token
+                    'token': token,
+                    'token_expires_at': expires_at.isoformat()
                 }
                 
                 return Response(response_data, status=status.HTTP_201_CREATED)
@@ -73,18 +78,30 @@ def player_login_view(request):
             # Find player by username
             player = Player.objects.get(username=username)
             
-            # Check password
-            if check_password(password, player.password):
-                # Update last login timestamp
+            # Check password in the bounded hashing pool
+            try:
+                valid, new_hash = password_verifier.verify(password, player.password)
+            except LoginBusy:
+                return Response({
+                    'error': 'Login temporarily unavailable',
+                    'details': 'Too many logins in progress, please retry in a few seconds'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '2'})
+            
+            if valid:
+                # Update last login timestamp (and an outdated password hash) without a full save
                 from django.utils import timezone
                 player.last_login = timezone.now()
-                player.save()
+                updates = {'last_login': player.last_login}
+                if new_hash:
+                    updates['password'] = player.password = new_hash
+                Player.objects.filter(pk=player.pk).update(**updates)
                 
-                # Use player's UUID as token for consistency
+                token, expires_at = issue_token(player)
                 return Response({
                     'message': 'Login successful',
                     'player': PlayerSerializer(player).data,
-                    'token': str(player.uuid)
+                    'token': token,
+                    'token_expires_at': expires_at.isoformat()
                 }, status=status.HTTP_200_OK)
             else:
                 return Response({
@@ -110,33 +127,26 @@ def player_login_view(request):
 def player_logout_view(request):
     """
     API endpoint for player logout
-    Since we're using Player UUIDs as tokens, logout is essentially just a client-side operation.
-    The server can validate the token and respond accordingly.
+    Signed tokens are revoked until they expire. Legacy Player UUID tokens
+    cannot be revoked, so for them logout remains a client-side operation.
     """
     try:
-        # Get the token from the request header
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if auth_header.startswith('Token '):
-            token_key = auth_header.split(' ')[1]
-            
-            # Verify the token is a valid Player UUID
-            try:
-                player = Player.objects.get(uuid=token_key)
-                # Since we're using UUIDs as tokens and they don't expire,
-                # logout is mainly a client-side operation
-                return Response({
-                    'message': 'Logout successful',
-                    'player_name': player.player_name
-                }, status=status.HTTP_200_OK)
-            except Player.DoesNotExist:
-                return Response({
-                    'error': 'Invalid token'
-                }, status=status.HTTP_401_UNAUTHORIZED)
-        else:
+        # PlayerTokenAuthentication has already verified the token (invalid ones never get here)
+        token_key = request.auth
+        if token_key is None:
             return Response({
                 'error': 'No token provided',
-                'details': 'Authorization header must be in format: Token <uuid>'
+                'details': 'Authorization header must be in format: Token <token>'
             }, status=status.HTTP_400_BAD_REQUEST)
+        
+        token_revoked = revoke_token(token_key)
+        if token_revoked:
+            token_cache.discard(token_key)
+        return Response({
+            'message': 'Logout successful',
+            'player_name': request.user.player_name,
+            'token_revoked': token_revoked
+        }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
             'error': 'Logout failed',
@@ -152,16 +162,12 @@ def player_profile_view(request):
     API endpoint to get and update player profile
     Requires authentication
     """
-    # Get token from Authorization header
-    auth_header = request.META.get('HTTP_AUTHORIZATION')
-    if not auth_header or not auth_header.startswith('Token '):
+    # Authenticated by PlayerTokenAuthentication before the view runs
+    if request.auth is None:
         return Response({'error': 'Token required'}, status=status.HTTP_401_UNAUTHORIZED)
     
-    token_key = auth_header.split(' ')[1]
-    
     try:
-        # Use Player UUID as token (same as login/logout views)
-        player = Player.objects.get(uuid=token_key)
+        player = request.user.get_player()
         
         if request.method == 'GET':
             return Response(PlayerSerializer(player).data, status=status.HTTP_200_OK)
@@ -182,6 +188,7 @@ def player_profile_view(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@static_condition(Player.AGE_GROUP_CHOICES)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_age_groups_view(request):
@@ -199,6 +206,7 @@ def get_age_groups_view(request):
     }, status=status.HTTP_200_OK)
 
 
+@static_condition(PROVINCE_DISTRICT_OPTIONS)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_provinces_districts_view(request):
@@ -206,27 +214,12 @@ def get_provinces_districts_view(request):
     API endpoint to get available provinces and their districts
     No authentication required
     """
-    province_districts = {
-        'Kigali City': ['Gasabo', 'Kicukiro', 'Nyarugenge'],
-        'Northern Province': ['Burera', 'Gakenke', 'Gicumbi', 'Musanze', 'Rulindo'],
-        'Southern Province': ['Gisagara', 'Huye', 'Kamonyi', 'Muhanga', 'Nyamagabe', 'Nyanza', 'Nyaruguru', 'Ruhango'],
-        'Eastern Province': ['Bugesera', 'Gatsibo', 'Kayonza', 'Kirehe', 'Ngoma', 'Nyagatare', 'Rwamagana'],
-        'Western Province': ['Karongi', 'Ngororero', 'Nyabihu', 'Nyamasheke', 'Rubavu', 'Rusizi', 'Rutsiro'],
-    }
-    
-    # Format for frontend consumption
-    provinces_data = []
-    for province, districts in province_districts.items():
-        provinces_data.append({
-            'province': province,
-            'districts': [{'value': district, 'label': district} for district in districts]
-        })
-    
     return Response({
-        'provinces': provinces_data
+        'provinces': PROVINCE_DISTRICT_OPTIONS
     }, status=status.HTTP_200_OK)
 
 
+@static_condition(Player.GENDER_CHOICES)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_gender_choices_view(request):
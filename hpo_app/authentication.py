@@ -1,12 +1,128 @@
+"""
+Token authentication for players
+
+Tokens (signed tokens from ``tokens.py`` or legacy player UUIDs) are
+resolved to a lightweight ``PlayerPrincipal`` and kept in a per-worker LRU
+cache, so warm requests authenticate without a database query. Entries are
+dropped when the player is saved or deleted in this process (see
+``signals.py``) and expire after ``TOKEN_CACHE_TTL`` seconds so that
+deletions and token changes made by other workers are picked up.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
+
 from .models import Player
-import uuid
+from .tokens import accept_legacy_tokens, read_token
+
+
+class PlayerPrincipal(namedtuple('PlayerPrincipal', 'id uuid username player_name')):
+    """Authenticated player identity, without the rest of the Player row"""
+    __slots__ = ()
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def get_player(self):
+        """Load the full Player row"""
+        return Player.objects.get(pk=self.id)
+
+
+class TokenCache:
+    """LRU cache of token -> PlayerPrincipal with a time-to-live"""
+
+    def __init__(self, maxsize=None, ttl=None):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        # player id -> set of cached tokens, so a player's tokens can be dropped without a scan
+        self._tokens_by_player = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        if self._maxsize is not None:
+            return self._maxsize
+        return getattr(settings, 'TOKEN_CACHE_SIZE', 10000)
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'TOKEN_CACHE_TTL', 300)
+
+    def get(self, token):
+        """Return the cached principal for a token, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or now - entry[0] >= self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, token, principal):
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = (time.monotonic(), principal)
+            self._tokens_by_player.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, token):
+        with self._lock:
+            self._remove(token)
+
+    def discard_player(self, player_id):
+        """Drop every token that resolves to the given player"""
+        with self._lock:
+            for token in list(self._tokens_by_player.get(player_id, ())):
+                self._remove(token)
+
+    def _remove(self, token):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_player.get(entry[1].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_player[entry[1].id]
+
+    def invalidate(self):
+        """Drop all cached tokens"""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_player.clear()
+
+    def stats(self):
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+            }
+
+
+token_cache = TokenCache()
 
 
 class PlayerTokenAuthentication(BaseAuthentication):
     """
-    Custom token authentication using Player UUID as token
+    Custom token authentication accepting signed tokens (see tokens.py)
+    and, during the migration, legacy Player UUID tokens
     """
     keyword = 'Token'
     
@@ -33,14 +149,46 @@ class PlayerTokenAuthentication(BaseAuthentication):
     
     def authenticate_credentials(self, key):
         try:
-            # Validate that the token is a valid UUID
+            # Legacy tokens are the player's UUID
             uuid.UUID(key)
+        except ValueError:
+            return self.authenticate_signed_token(key)
+        
+        if not accept_legacy_tokens():
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        
+        principal = token_cache.get(key)
+        if principal is not None:
+            return (principal, key)
+        
+        try:
             # Find player by UUID
-            player = Player.objects.get(uuid=key)
-        except (ValueError, Player.DoesNotExist):
+            row = Player.objects.values_list(*PlayerPrincipal._fields).get(uuid=key)
+        except Player.DoesNotExist:
             raise exceptions.AuthenticationFailed('Invalid token.')
         
-        return (player, key)
+        principal = PlayerPrincipal(*row)
+        token_cache.set(key, principal)
+        return (principal, key)
+    
+    def authenticate_signed_token(self, key):
+        # Signature, expiry and revocation are checked before the cache on every request
+        payload = read_token(key)
+        if payload is None:
+            raise exceptions.AuthenticationFailed('Invalid or expired token.')
+        
+        principal = token_cache.get(key)
+        if principal is not None:
+            return (principal, key)
+        
+        try:
+            row = Player.objects.values_list(*PlayerPrincipal._fields).get(pk=payload['p'])
+        except Player.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        
+        principal = PlayerPrincipal(*row)
+        token_cache.set(key, principal)
+        return (principal, key)
     
     def get_authorization_header(self, request):
         """
@@ -50,3 +198,6 @@ class PlayerTokenAuthentication(BaseAuthentication):
         if isinstance(auth, str):
             auth = auth.encode('iso-8859-1')
         return auth
+
+
+player_authenticator = PlayerTokenAuthentication()
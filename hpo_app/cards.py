@@ -0,0 +1,78 @@
+"""
+Static playing card registry
+
+Card metadata (suit, value, pointValue and symbol) never changes, so it is
+built once at import time instead of on every ``Question.get_card_info()``
+call. Models, views and caches read card data from here.
+"""
+from collections import namedtuple
+from types import MappingProxyType
+
+
+class Card(namedtuple('Card', 'id label suit value point_value symbol')):
+    """Immutable metadata for a single playing card"""
+    __slots__ = ()
+
+    def get_info(self):
+        """Return card information as a new dictionary"""
+        return {
+            'suit': self.suit,
+            'value': self.value,
+            'pointValue': self.point_value,
+            'symbol': self.symbol,
+            'id': self.id,
+        }
+
+    @property
+    def display(self):
+        return f"{self.symbol} {self.value} ({self.suit})"
+
+
+SUITS = (
+    ('S', 'Spades', '♠'),
+    ('H', 'Hearts', '♥'),
+    ('C', 'Clubs', '♣'),
+    ('D', 'Diamonds', '♦'),
+)
+
+# (value, label, pointValue): 7s = 10, Jacks = 3, Queens = 2, Kings = 4, Aces = 11
+VALUES = (
+    ('3', '3', 0),
+    ('4', '4', 0),
+    ('5', '5', 0),
+    ('6', '6', 0),
+    ('7', '7', 10),
+    ('J', 'Jack', 3),
+    ('Q', 'Queen', 2),
+    ('K', 'King', 4),
+    ('A', 'Ace', 11),
+)
+
+CARDS = tuple(
+    Card(f'{prefix}{value}', f'{suit} {label}', suit, value, point_value, symbol)
+    for prefix, suit, symbol in SUITS
+    for value, label, point_value in VALUES
+)
+
+CARD_REGISTRY = MappingProxyType({card.id: card for card in CARDS})
+
+# Card ids in display order, e.g. for validation error messages
+CARD_IDS = tuple(card.id for card in CARDS)
+
+# Django field choices, kept as a list of tuples to match existing migrations
+CARD_CHOICES = [(card.id, card.label) for card in CARDS]
+
+
+def is_valid_card(card_id):
+    """Return True if card_id is one of the 36 known cards"""
+    return card_id in CARD_REGISTRY
+
+
+def get_card_info(card_id):
+    """Return card information as a dictionary, or None for no/unknown card"""
+    if not card_id:
+        return None
+    card = CARD_REGISTRY.get(card_id)
+    if card is None:
+        return {'id': card_id}
+    return card.get_info()
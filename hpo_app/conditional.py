@@ -0,0 +1,82 @@
+"""
+Conditional GET (ETag) for read-mostly catalog endpoints
+
+The mobile client fetches questions, packages, game content and the
+registration form options on every app start, although they rarely change.
+The decorators here wrap Django's ``condition`` so a client that sends
+back the validators it already holds gets ``304 Not Modified`` without the
+view running:
+
+- ``catalog_condition(version)`` derives the ETag from one aggregate query
+  over the rows a response is built from: the row count and the latest
+  ``updated_at`` (plus any extra aggregates the endpoint needs, e.g.
+  counters changed with ``update()``). Adding, editing or deleting a row
+  changes the ETag. No Last-Modified is sent: a delete leaves the latest
+  ``updated_at`` where it was, so If-Modified-Since alone would answer 304
+  for a changed catalog.
+- ``static_condition(data)`` gives a constant ETag to responses built from
+  code-level choices, so revalidating them costs no query at all.
+
+Responses also carry ``Cache-Control: no-cache``, so HTTP caches store them
+but revalidate before every use.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+def make_etag(*parts):
+    payload = json.dumps(parts, default=str, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode()).hexdigest()[:32]
+
+
+def catalog_version(queryset, **aggregates):
+    """
+    Return the version parts of the rows in a queryset with one aggregate
+    query; extra keyword aggregates are folded into the version
+    """
+    values = queryset.order_by().aggregate(
+        row_count=Count('pk'), last_modified=Max('updated_at'), **aggregates
+    )
+    return sorted(values.items())
+
+
+def _revalidate(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if response.status_code in (200, 304) and not response.has_header('Cache-Control'):
+            patch_cache_control(response, no_cache=True)
+        return response
+    return wrapper
+
+
+def catalog_condition(version):
+    """
+    Decorate a GET view with an ETag computed by
+    ``version(request, *args, **kwargs)``, which returns the result of
+    ``catalog_version`` or None when the request is invalid (the view then
+    runs unconditionally and reports the error)
+    """
+    def etag(request, *args, **kwargs):
+        parts = version(request, *args, **kwargs)
+        if parts is None:
+            return None
+        return make_etag(request.get_full_path(), parts)
+
+    def decorator(view):
+        return _revalidate(condition(etag_func=etag)(view))
+    return decorator
+
+
+def static_condition(data):
+    """Decorate a GET view whose response only depends on `data`, fixed for the process lifetime"""
+    etag = make_etag(data)
+
+    def decorator(view):
+        return _revalidate(condition(etag_func=lambda request, *args, **kwargs: etag)(view))
+    return decorator
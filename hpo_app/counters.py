@@ -0,0 +1,134 @@
+"""
+Buffered view and usage counters for GameContent
+
+Reading a content page used to save the row with ``view_count + 1``
+computed in Python, so every GET took a row lock and concurrent viewers
+lost increments. ``CounterBuffer`` adds the deltas up in process memory
+instead. They are written back by ``flush()`` with ``F()`` expressions, one
+UPDATE per distinct (views, usage) delta pair for each batch of rows, so
+increments from several workers add up in the database.
+
+A worker flushes when ``CONTENT_COUNTER_FLUSH_INTERVAL`` seconds have passed
+since its last flush (checked when a request finishes, see ``signals.py``),
+when ``CONTENT_COUNTER_MAX_PENDING`` rows have pending deltas, and at
+interpreter exit. An interval of 0 writes every increment straight away.
+Counts read from the database lag by at most the flush interval; the
+content endpoints add this worker's pending deltas to what they return.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F
+
+from .models import GameContent
+
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('view_count', 'usage_count')
+
+
+def flush_interval():
+    return getattr(settings, 'CONTENT_COUNTER_FLUSH_INTERVAL', 10)
+
+
+def max_pending():
+    return getattr(settings, 'CONTENT_COUNTER_MAX_PENDING', 1000)
+
+
+class CounterBuffer:
+    """Per-worker {content id: [views, usage]} deltas waiting to be written"""
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def add(self, pk, field, delta=1):
+        """Count `delta` for one content row; flushes when the buffer is due or full"""
+        index = FIELDS.index(field)
+        with self._lock:
+            deltas = self._pending.get(pk)
+            if deltas is None:
+                deltas = self._pending[pk] = [0, 0]
+            deltas[index] += delta
+            full = len(self._pending) >= max_pending()
+        if full or not flush_interval():
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def pending(self, pk):
+        """Return {field: delta} not yet written for a content row"""
+        with self._lock:
+            deltas = self._pending.get(pk, (0, 0))
+            return dict(zip(FIELDS, deltas))
+
+    def apply_pending(self, content):
+        """Add this worker's pending deltas to a loaded GameContent instance"""
+        for field, delta in self.pending(content.pk).items():
+            setattr(content, field, getattr(content, field) + delta)
+        return content
+
+    def flush_if_due(self):
+        if self._pending and time.monotonic() - self._last_flush >= flush_interval():
+            self.flush()
+
+    def flush(self):
+        """Write the pending deltas; returns the number of rows updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        groups = {}
+        for pk, deltas in pending.items():
+            groups.setdefault(tuple(deltas), []).append(pk)
+        updated = 0
+        try:
+            for (views, usage), pks in groups.items():
+                changes = {}
+                if views:
+                    changes['view_count'] = F('view_count') + views
+                if usage:
+                    changes['usage_count'] = F('usage_count') + usage
+                for start in range(0, len(pks), self.batch_size):
+                    batch = pks[start:start + self.batch_size]
+                    updated += GameContent.objects.filter(pk__in=batch).update(**changes)
+                    for pk in batch:
+                        del pending[pk]
+        except DatabaseError:
+            # Keep the unwritten deltas for the next flush instead of losing them
+            logger.exception('Flushing game content counters failed; keeping %d rows for the next flush', len(pending))
+            self._merge(pending)
+        return updated
+
+    def _merge(self, pending):
+        with self._lock:
+            for pk, (views, usage) in pending.items():
+                deltas = self._pending.setdefault(pk, [0, 0])
+                deltas[0] += views
+                deltas[1] += usage
+
+    def clear(self):
+        """Drop pending deltas without writing them"""
+        with self._lock:
+            self._pending = {}
+            self._last_flush = time.monotonic()
+
+
+content_counters = CounterBuffer()
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        content_counters.flush()
+    except Exception:
+        logger.exception('Could not flush game content counters at exit')
@@ -0,0 +1,177 @@
+"""
+Streaming export of game history for analytics
+
+Four datasets cover completed games: ``games``, ``participants`` (joined with
+player demographics), ``responses`` (likewise) and ``results``. Rows are read
+with ``values_list().iterator()``, which uses a server-side cursor on
+PostgreSQL, and written out one at a time as CSV or JSONL, so memory stays
+flat however many rows are exported.
+
+Incremental exports select the completed games that changed after a
+watermark (``Game.updated_at`` > since) and up to ``until``, which defaults
+to ``EXPORT_WATERMARK_LAG`` seconds before the start of the export:
+``updated_at`` is set when a transaction writes it, not when it commits, so a
+change still in flight at export time may carry an earlier timestamp than the
+export and would be missed for good without the lag. Games still change after they are finalized:
+answers, awarded points and late submissions update their participants,
+responses and result. The endpoints that do so bump ``Game.updated_at``
+(``Game.mark_changed``), so passing the previous export's ``until`` as the
+next ``since`` exports such a game again with all of its current rows.
+Consumers upsert on the row keys (``match_id``, plus ``player_id`` for
+participants and ``response_id`` for responses) rather than append.
+"""
+import csv
+import json
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Game, GameParticipant, GameResponse, GameResult
+
+
+FORMATS = ('csv', 'jsonl')
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+DEMOGRAPHICS = ('age_group', 'gender', 'province', 'district')
+
+# dataset: (model, path from the model to Game, [(column, lookup), ...])
+DATASETS = {
+    'games': (Game, '', [
+        ('match_id', 'match_id'),
+        ('participant_count', 'participant_count'),
+        ('team_count', 'team_count'),
+        ('winning_team', 'winning_team'),
+        ('cards_chosen', 'cards_chosen'),
+        ('created_at', 'created_at'),
+        ('completed_at', 'completed_at'),
+        ('updated_at', 'updated_at'),
+    ]),
+    'participants': (GameParticipant, 'game__', [
+        ('match_id', 'game__match_id'),
+        ('completed_at', 'game__completed_at'),
+        ('player_id', 'player_id'),
+        *[(field, f'player__{field}') for field in DEMOGRAPHICS],
+        ('team', 'team'),
+        ('is_winner', 'is_winner'),
+        ('marks_earned', 'marks_earned'),
+        ('lost_card', 'lost_card'),
+        ('question_answered', 'question_answered'),
+        ('answer_correct', 'answer_correct'),
+        ('joined_at', 'joined_at'),
+    ]),
+    'responses': (GameResponse, 'game__', [
+        ('response_id', 'id'),
+        ('match_id', 'game__match_id'),
+        ('completed_at', 'game__completed_at'),
+        ('player_id', 'participant__player_id'),
+        *[(field, f'participant__player__{field}') for field in DEMOGRAPHICS],
+        ('team', 'participant__team'),
+        ('response_type', 'response_type'),
+        ('fun_fact_card', 'fun_fact_card'),
+        ('question_id', 'question_id'),
+        ('question_card', 'question__card'),
+        ('player_answer', 'player_answer'),
+        ('is_correct', 'is_correct'),
+        ('created_at', 'created_at'),
+    ]),
+    'results': (GameResult, 'game__', [
+        ('match_id', 'game__match_id'),
+        ('completed_at', 'game__completed_at'),
+        ('winning_team', 'game__winning_team'),
+        ('team1_marks', 'team1_marks'),
+        ('team2_marks', 'team2_marks'),
+        ('result_summary', 'result_summary'),
+        ('created_at', 'created_at'),
+    ]),
+}
+
+
+def columns(dataset):
+    return [column for column, _ in DATASETS[dataset][2]]
+
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 watermark (naive values use the current time zone); None if invalid"""
+    try:
+        timestamp = parse_datetime(value.strip())
+    except ValueError:
+        return None
+    if timestamp is not None and timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    return timestamp
+
+
+def default_until():
+    """Upper bound of an export that does not pass one; leaves time for in-flight changes to commit"""
+    return timezone.now() - timedelta(seconds=getattr(settings, 'EXPORT_WATERMARK_LAG', 60))
+
+
+def export_rows(dataset, since=None, until=None, chunk_size=2000):
+    """Yield one tuple per row of a dataset, for completed games changed in (since, until]"""
+    model, game_path, fields = DATASETS[dataset]
+    lookup = Q(**{f'{game_path}status': 'completed', f'{game_path}completed_at__isnull': False})
+    if since is not None:
+        lookup &= Q(**{f'{game_path}updated_at__gt': since})
+    if until is not None:
+        lookup &= Q(**{f'{game_path}updated_at__lte': until})
+    queryset = model.objects.filter(lookup).order_by('pk').values_list(*[path for _, path in fields])
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, separators=(',', ':'))
+    return str(value)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class _LineBuffer:
+    """File-like object that hands back what csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def render_lines(dataset, fmt, rows):
+    """Yield the output lines (CSV with a header row, or JSONL) for rows of a dataset"""
+    names = columns(dataset)
+    if fmt == 'csv':
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(names)
+        for row in rows:
+            yield writer.writerow([_text(value) for value in row])
+    else:
+        for row in rows:
+            yield json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False) + '\n'
+
+
+def export(dataset, fmt, out, since=None, until=None):
+    """
+    Write a dataset to a text stream; returns (rows written, until)
+    until is the watermark to pass as since to the next incremental export.
+    """
+    until = until or default_until()
+    written = -1 if fmt == 'csv' else 0
+    for line in render_lines(dataset, fmt, export_rows(dataset, since, until)):
+        out.write(line)
+        written += 1
+    return written, until
@@ -1,6 +1,9 @@
 from django import forms
 from django.core.exceptions import ValidationError
-from .models import Question, Player, GameContent
+from django.template.defaultfilters import filesizeformat
+from .locations import PROVINCE_DISTRICTS, is_valid_district
+from .models import Question, Player, GameContent, Organisation
+from .player_import import FORMATS, admin_upload_limits, count_rows, detect_format
 
 
 class PlayerAdminForm(forms.ModelForm):
@@ -18,15 +21,6 @@ class PlayerAdminForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Province-District mapping
-        self.province_districts = {
-            'Kigali City': ['Gasabo', 'Kicukiro', 'Nyarugenge'],
-            'Northern Province': ['Burera', 'Gakenke', 'Gicumbi', 'Musanze', 'Rulindo'],
-            'Southern Province': ['Gisagara', 'Huye', 'Kamonyi', 'Muhanga', 'Nyamagabe', 'Nyanza', 'Nyaruguru', 'Ruhango'],
-            'Eastern Province': ['Bugesera', 'Gatsibo', 'Kayonza', 'Kirehe', 'Ngoma', 'Nyagatare', 'Rwamagana'],
-            'Western Province': ['Karongi', 'Ngororero', 'Nyabihu', 'Nyamasheke', 'Rubavu', 'Rusizi', 'Rutsiro'],
-        }
-        
         # Add help text for location fields
         self.fields['province'].help_text = 'Select your province in Rwanda'
         self.fields['district'].help_text = 'Select your district (filtered based on province)'
@@ -38,7 +32,7 @@ class PlayerAdminForm(forms.ModelForm):
         # If editing existing player with province selected, filter districts
         if self.instance and self.instance.pk and self.instance.province:
             district_choices = [('', '--- Select District ---')]
-            for district in self.province_districts.get(self.instance.province, []):
+            for district in PROVINCE_DISTRICTS.get(self.instance.province, ()):
                 district_choices.append((district, district))
             self.fields['district'].choices = district_choices
     
@@ -49,8 +43,7 @@ class PlayerAdminForm(forms.ModelForm):
         
         # Validate province-district combination
         if province and district:
-            valid_districts = self.province_districts.get(province, [])
-            if district not in valid_districts:
+            if not is_valid_district(province, district):
                 raise ValidationError(f'District {district} is not valid for {province}')
         
         return cleaned_data
@@ -59,6 +52,39 @@ class PlayerAdminForm(forms.ModelForm):
         js = ('admin/js/player_location_filter.js',)
 
 
+class PlayerImportForm(forms.Form):
+    """Upload form for bulk player imports"""
+    file = forms.FileField(help_text="CSV with a header row, or JSONL (one JSON object per line)")
+    format = forms.ChoiceField(
+        choices=[('', 'Detect from file name')] + [(fmt, fmt.upper()) for fmt in FORMATS],
+        required=False
+    )
+    organization = forms.ModelChoiceField(
+        queryset=Organisation.objects.all(),
+        required=False,
+        help_text="Assign every imported player to this organisation"
+    )
+    
+    def clean(self):
+        """Reject files too large to import within one request"""
+        cleaned_data = super().clean()
+        upload = cleaned_data.get('file')
+        if upload is None:
+            return cleaned_data
+        
+        max_rows, max_bytes = admin_upload_limits()
+        larger_files = 'Import larger files with "python manage.py import_players".'
+        if upload.size > max_bytes:
+            raise ValidationError(f'The file is larger than {filesizeformat(max_bytes)}. {larger_files}')
+        try:
+            rows = count_rows(upload, cleaned_data.get('format') or detect_format(upload.name))
+        except UnicodeDecodeError:
+            raise ValidationError('The file must be UTF-8 encoded.')
+        if rows > max_rows:
+            raise ValidationError(f'The file has {rows} rows; the upload takes at most {max_rows}. {larger_files}')
+        return cleaned_data
+
+
 class QuestionAdminForm(forms.ModelForm):
     # Additional fields for multiple choice options
     option_1 = forms.CharField(max_length=255, required=False, help_text="First option (required for multiple choice)")
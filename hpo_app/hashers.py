@@ -0,0 +1,29 @@
+"""
+Password hasher with a configurable PBKDF2 work factor
+
+Uses the same ``pbkdf2_sha256`` encoding as Django's default hasher, so
+existing hashes keep verifying. When ``PASSWORD_PBKDF2_ITERATIONS`` changes,
+``check_password`` reports the stored hash as outdated and the login view
+re-hashes it with the new iteration count.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count taken from settings"""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+def init_hash_worker():
+    """
+    Set up Django in a spawned password hashing process (see player_import.py)
+    Lives here because this module can be imported before Django is set up.
+    """
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
@@ -0,0 +1,257 @@
+"""
+Leaderboard reads over the denormalized ``LeaderboardEntry`` table
+
+Each metric maps to an index-backed ordering, so the top of a board is an
+``ORDER BY ... LIMIT`` that touches only ``limit`` rows. Ratio metrics rank
+by the true percentage and only include players above a minimum number of
+games (``LEADERBOARD_MIN_GAMES``) or answers (``LEADERBOARD_MIN_ANSWERS``).
+A player's own rank is the count of eligible entries ordered ahead of them.
+
+Windowed boards (day, week, month) sum the ``PlayerDailyStats`` rollups that
+the ``rollup_player_stats`` command maintains from ``GameParticipant``, so
+their cost is bounded by the number of active players in the window.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, NullIf, TruncDate
+from django.utils import timezone
+
+from .models import GameParticipant, LeaderboardEntry, Player, PlayerDailyStats
+
+
+# metric: ordering columns, highest first; ties fall back to the oldest player id
+METRICS = {
+    'total_marks': ('total_marks', 'games_won'),
+    'games_won': ('games_won', 'total_marks'),
+    'win_rate': ('win_rate', 'games_played'),
+    'answer_accuracy': ('answer_accuracy', 'questions_answered'),
+    'win_streak': ('longest_win_streak', 'total_marks'),
+}
+
+# metric: ordering annotations for windowed boards (streaks are only tracked all-time)
+WINDOW_METRICS = {
+    'total_marks': ('marks', 'wins'),
+    'games_won': ('wins', 'marks'),
+    'win_rate': ('win_rate', 'games'),
+    'answer_accuracy': ('accuracy', 'answered'),
+}
+
+WINDOWS = ('day', 'week', 'month')
+
+# Query parameter -> LeaderboardEntry column for scoped boards
+SCOPES = {
+    'province': 'province',
+    'district': 'district',
+    'age_group': 'age_group',
+    'organization': 'organization_id',
+}
+
+SCOPE_CHOICES = {
+    'province': {value for value, _ in Player.PROVINCE_CHOICES},
+    'district': {value for value, _ in Player.DISTRICT_CHOICES},
+    'age_group': {value for value, _ in Player.AGE_GROUP_CHOICES},
+}
+
+
+def min_games():
+    return getattr(settings, 'LEADERBOARD_MIN_GAMES', 5)
+
+
+def min_answers():
+    return getattr(settings, 'LEADERBOARD_MIN_ANSWERS', 5)
+
+
+def parse_scope(params):
+    """
+    Return ({column: value}, error) for the scope parameters present in params
+    """
+    scope = {}
+    for param, column in SCOPES.items():
+        value = params.get(param)
+        if value in (None, ''):
+            continue
+        if param == 'organization':
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                return None, 'organization must be an integer id'
+        elif value not in SCOPE_CHOICES[param]:
+            return None, f'Invalid {param}. Valid options: {", ".join(sorted(SCOPE_CHOICES[param]))}'
+        scope[column] = value
+    return scope, None
+
+
+def eligible_entries(metric, scope=None):
+    """Return the queryset of entries that may appear on the board"""
+    queryset = LeaderboardEntry.objects.filter(games_played__gt=0, **(scope or {}))
+    if metric == 'win_rate':
+        queryset = queryset.filter(games_played__gte=max(min_games(), 1))
+    elif metric == 'answer_accuracy':
+        queryset = queryset.filter(questions_answered__gte=max(min_answers(), 1))
+    return queryset
+
+
+def top_entries(metric, limit, scope=None):
+    """Return the first `limit` entries of the board"""
+    primary, secondary = METRICS[metric]
+    return list(eligible_entries(metric, scope).order_by(f'-{primary}', f'-{secondary}', 'player_id')[:limit])
+
+
+def rank_of(entry, metric, scope=None):
+    """
+    Return the 1-based rank of an entry on the board, or None if it is not eligible
+    """
+    queryset = eligible_entries(metric, scope)
+    if not queryset.filter(pk=entry.pk).exists():
+        return None
+
+    primary, secondary = METRICS[metric]
+    primary_value, secondary_value = getattr(entry, primary), getattr(entry, secondary)
+    ahead = (
+        Q(**{f'{primary}__gt': primary_value})
+        | Q(**{primary: primary_value, f'{secondary}__gt': secondary_value})
+        | Q(**{primary: primary_value, secondary: secondary_value, 'player_id__lt': entry.player_id})
+    )
+    return queryset.filter(ahead).count() + 1
+
+
+def serialize_entry(entry, rank):
+    return {
+        'rank': rank,
+        'username': entry.username,
+        'player_name': entry.player_name,
+        'games_played': entry.games_played,
+        'games_won': entry.games_won,
+        'total_marks': entry.total_marks,
+        'win_rate': round(entry.win_rate, 2),
+        'answer_accuracy': round(entry.answer_accuracy, 2),
+        'current_win_streak': entry.current_win_streak,
+        'longest_win_streak': entry.longest_win_streak,
+        'last_played': entry.last_played.isoformat() if entry.last_played else None
+    }
+
+
+def rebuild(batch_size=1000):
+    """Recreate every entry from the Player table; returns the number of entries"""
+    LeaderboardEntry.objects.all().delete()
+    players = Player.objects.filter(games_played__gt=0).order_by('pk')
+    batch = []
+    created = 0
+    for player in players.iterator(chunk_size=batch_size):
+        batch.append(LeaderboardEntry.from_player(player))
+        if len(batch) >= batch_size:
+            LeaderboardEntry.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        LeaderboardEntry.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def window_start(window, today=None):
+    """Return the first day of the current day/week/month window (weeks start on Monday)"""
+    today = today or timezone.localdate()
+    if window == 'day':
+        return today
+    if window == 'week':
+        return today - timedelta(days=today.weekday())
+    return today.replace(day=1)
+
+
+def rollup(start_day, end_day=None):
+    """
+    Recompute PlayerDailyStats for the days from start_day to end_day (inclusive)
+    Returns the number of rollup rows written.
+    """
+    end_day = end_day or timezone.localdate()
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(start_day, time.min, tzinfo=tz)
+    end = datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=tz)
+
+    rows = (
+        GameParticipant.objects.filter(joined_at__gte=start, joined_at__lt=end)
+        .annotate(day=TruncDate('joined_at'))
+        .values('player_id', 'day')
+        .annotate(
+            games_played=Count('id'),
+            games_won=Count('id', filter=Q(is_winner=True)),
+            total_marks=Sum('marks_earned'),
+            questions_answered=Count('id', filter=Q(question_answered=True)),
+            correct_answers=Count('id', filter=Q(answer_correct=True)),
+        )
+        .order_by()
+    )
+    stats = [PlayerDailyStats(**row) for row in rows]
+
+    with transaction.atomic():
+        PlayerDailyStats.objects.filter(day__gte=start_day, day__lte=end_day).delete()
+        PlayerDailyStats.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
+
+
+def window_rows(metric, start_day, scope=None):
+    """Return per-player sums over the rollups since start_day, limited to eligible players"""
+    scope = {f'player__{column}': value for column, value in (scope or {}).items()}
+    queryset = (
+        PlayerDailyStats.objects.filter(day__gte=start_day, **scope)
+        .values('player_id')
+        .annotate(
+            username=F('player__username'),
+            player_name=F('player__player_name'),
+            games=Sum('games_played'),
+            wins=Sum('games_won'),
+            marks=Sum('total_marks'),
+            answered=Sum('questions_answered'),
+            correct=Sum('correct_answers'),
+        )
+        .annotate(
+            win_rate=Cast(F('wins'), FloatField()) * 100 / NullIf(F('games'), 0),
+            accuracy=Cast(F('correct'), FloatField()) * 100 / NullIf(F('answered'), 0),
+        )
+    )
+    if metric == 'win_rate':
+        queryset = queryset.filter(games__gte=max(min_games(), 1))
+    elif metric == 'answer_accuracy':
+        queryset = queryset.filter(answered__gte=max(min_answers(), 1))
+    return queryset
+
+
+def top_window_rows(metric, limit, start_day, scope=None):
+    """Return the first `limit` rows of a windowed board"""
+    primary, secondary = WINDOW_METRICS[metric]
+    return list(window_rows(metric, start_day, scope).order_by(f'-{primary}', f'-{secondary}', 'player_id')[:limit])
+
+
+def window_rank(username, metric, start_day, scope=None):
+    """
+    Return (rank, row) for a player on a windowed board, or (None, None) if not ranked
+    """
+    queryset = window_rows(metric, start_day, scope)
+    row = queryset.filter(player__username=username).order_by('player_id').first()
+    if row is None:
+        return None, None
+
+    primary, secondary = WINDOW_METRICS[metric]
+    ahead = (
+        Q(**{f'{primary}__gt': row[primary]})
+        | Q(**{primary: row[primary], f'{secondary}__gt': row[secondary]})
+        | Q(**{primary: row[primary], secondary: row[secondary], 'player_id__lt': row['player_id']})
+    )
+    return queryset.filter(ahead).count() + 1, row
+
+
+def serialize_window_row(row, rank):
+    return {
+        'rank': rank,
+        'username': row['username'],
+        'player_name': row['player_name'],
+        'games_played': row['games'],
+        'games_won': row['wins'],
+        'total_marks': row['marks'] or 0,
+        'win_rate': round(row['win_rate'] or 0.0, 2),
+        'answer_accuracy': round(row['accuracy'] or 0.0, 2),
+    }
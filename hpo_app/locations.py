@@ -0,0 +1,38 @@
+"""
+Rwanda provinces and districts
+
+Built once at import time and shared by the Player model choices, the
+registration serializer, the admin form and the form-data API.
+"""
+from types import MappingProxyType
+
+
+PROVINCE_DISTRICTS = MappingProxyType({
+    'Kigali City': ('Gasabo', 'Kicukiro', 'Nyarugenge'),
+    'Northern Province': ('Burera', 'Gakenke', 'Gicumbi', 'Musanze', 'Rulindo'),
+    'Southern Province': ('Gisagara', 'Huye', 'Kamonyi', 'Muhanga', 'Nyamagabe', 'Nyanza', 'Nyaruguru', 'Ruhango'),
+    'Eastern Province': ('Bugesera', 'Gatsibo', 'Kayonza', 'Kirehe', 'Ngoma', 'Nyagatare', 'Rwamagana'),
+    'Western Province': ('Karongi', 'Ngororero', 'Nyabihu', 'Nyamasheke', 'Rubavu', 'Rusizi', 'Rutsiro'),
+})
+
+# Django field choices, kept as lists of tuples to match existing migrations
+PROVINCE_CHOICES = [(province, province) for province in PROVINCE_DISTRICTS]
+DISTRICT_CHOICES = [
+    (district, district)
+    for districts in PROVINCE_DISTRICTS.values()
+    for district in districts
+]
+
+# Response body of the provinces/districts form-data endpoint
+PROVINCE_DISTRICT_OPTIONS = tuple(
+    MappingProxyType({
+        'province': province,
+        'districts': tuple(MappingProxyType({'value': district, 'label': district}) for district in districts),
+    })
+    for province, districts in PROVINCE_DISTRICTS.items()
+)
+
+
+def is_valid_district(province, district):
+    """Return True if district belongs to province"""
+    return district in PROVINCE_DISTRICTS.get(province, ())
@@ -0,0 +1,85 @@
+"""
+Password verification for player logins
+
+Hash checks run in a bounded per-worker thread pool (``LOGIN_HASH_WORKERS``
+threads). PBKDF2 releases the GIL while hashing, so a threaded worker
+(gunicorn ``gthread``, as deployed with ``--threads`` equal to the pool size)
+can verify several logins at once while other requests keep being served. At
+most ``LOGIN_HASH_QUEUE_SIZE`` further checks may wait for a thread; beyond
+that ``LoginBusy`` is raised so the view can answer 503 immediately instead
+of letting requests pile up during a login burst.
+
+When the stored hash uses an outdated hasher or work factor, the new hash is
+computed in the pool as well and returned to the caller to be saved.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+class LoginBusy(Exception):
+    """Raised when too many password checks are already running or queued"""
+
+
+def _check(password, encoded):
+    upgraded = []
+    valid = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return valid, (upgraded[0] if upgraded else None)
+
+
+class PasswordVerifier:
+    """Bounded thread pool for password checks"""
+
+    def __init__(self, workers=None, queue_size=None):
+        self._workers = workers
+        self._queue_size = queue_size
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self):
+        if self._workers is not None:
+            return self._workers
+        return getattr(settings, 'LOGIN_HASH_WORKERS', 2)
+
+    @property
+    def queue_size(self):
+        if self._queue_size is not None:
+            return self._queue_size
+        return getattr(settings, 'LOGIN_HASH_QUEUE_SIZE', 64)
+
+    def _get_executor(self):
+        # Created on first use so each forked worker gets its own threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='login-hash'
+                    )
+        return self._executor
+
+    def verify(self, password, encoded):
+        """
+        Return (valid, new_hash); new_hash is set when the stored hash should be replaced
+        Raises LoginBusy when the pool and its queue are full.
+        """
+        executor = self._get_executor()
+        if not self._slots.acquire(blocking=False):
+            raise LoginBusy()
+        try:
+            return executor.submit(_check, password, encoded).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_verifier = PasswordVerifier()
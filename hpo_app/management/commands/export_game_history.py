@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hpo_app import exports
+
+
+def parse_timestamp(value):
+    timestamp = exports.parse_timestamp(value)
+    if timestamp is None:
+        raise CommandError(f'Invalid timestamp {value!r}; use ISO 8601, e.g. 2025-01-31T00:00:00+00:00')
+    return timestamp
+
+
+class Command(BaseCommand):
+    help = 'Stream game history (games, participants, responses or results) as CSV or JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(exports.DATASETS))
+        parser.add_argument('--format', choices=exports.FORMATS, default='csv')
+        parser.add_argument('--output', help='Output file (default: standard output)')
+        parser.add_argument('--since', help='Only completed games changed after this ISO 8601 timestamp')
+        parser.add_argument('--until', help='Only completed games changed up to this ISO 8601 timestamp (default: EXPORT_WATERMARK_LAG seconds ago)')
+        parser.add_argument(
+            '--watermark-file',
+            help='Read --since from this file when it exists and store the new watermark in it after the export'
+        )
+
+    def handle(self, *args, **options):
+        since = parse_timestamp(options['since']) if options['since'] else None
+        until = parse_timestamp(options['until']) if options['until'] else None
+        watermark_file = options['watermark_file']
+        if watermark_file and since is None:
+            try:
+                with open(watermark_file) as stream:
+                    since = parse_timestamp(stream.read())
+            except FileNotFoundError:
+                pass
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as out:
+                written, until = exports.export(options['dataset'], options['format'], out, since, until)
+        else:
+            written, until = exports.export(options['dataset'], options['format'], self.stdout, since, until)
+
+        if watermark_file:
+            with open(watermark_file, 'w') as stream:
+                stream.write(until.isoformat())
+        # Summary goes to stderr so it never mixes with data written to stdout
+        self.stderr.write(f'Exported {written} {options["dataset"]} rows; watermark {until.isoformat()}')
@@ -0,0 +1,60 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hpo_app.models import Organisation
+from hpo_app.player_import import FORMATS, detect_format, import_players
+
+
+class Command(BaseCommand):
+    help = 'Import players from a CSV (with header) or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for standard input")
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Input format (default: from the file extension, otherwise csv)'
+        )
+        parser.add_argument('--organization', type=int, help='Organisation id to assign to every imported player')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows validated and inserted together')
+        parser.add_argument(
+            '--workers', type=int,
+            help='Password hashing processes (default PLAYER_IMPORT_WORKERS; 0 hashes in this process)'
+        )
+        parser.add_argument('--max-errors', type=int, default=100, help='Row errors to print (default 100)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        organization = None
+        if options['organization'] is not None:
+            try:
+                organization = Organisation.objects.get(pk=options['organization'])
+            except Organisation.DoesNotExist:
+                raise CommandError(f"Organisation {options['organization']} does not exist")
+
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        importer_options = {
+            'organization': organization,
+            'batch_size': options['batch_size'],
+            'workers': options['workers'],
+        }
+        if path == '-':
+            result = import_players(sys.stdin, fmt, **importer_options)
+        else:
+            try:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    result = import_players(stream, fmt, **importer_options)
+            except OSError as exc:
+                raise CommandError(f'Cannot read {path}: {exc}')
+
+        for error in result.errors[:options['max_errors']]:
+            self.stderr.write(f"Row {error.row} {error.username}: {'; '.join(error.errors)}")
+        if result.failed > options['max_errors']:
+            self.stderr.write(f'... and {result.failed - options["max_errors"]} more row errors')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} of {result.rows} players ({result.failed} rows rejected)'
+        ))
@@ -0,0 +1,108 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hpo_app.metrics import percentile
+
+
+class Command(BaseCommand):
+    help = 'Summarize request metrics logged by QueryMetricsMiddleware (METRICS_LOG_FILE) per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="Metrics log files (default: standard input)")
+        parser.add_argument('--top', type=int, default=10, help='SQL fingerprints to list (default 10)')
+        parser.add_argument(
+            '--sort', choices=['total', 'p95', 'queries', 'requests'], default='total',
+            help='Endpoint ordering: total time, p95 latency, mean queries or request count'
+        )
+        parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+
+    def handle(self, *args, **options):
+        endpoints = {}
+        fingerprints = {}
+        skipped = 0
+
+        for line in self.read_lines(options['paths']):
+            try:
+                record = json.loads(line)
+                endpoint = record['endpoint']
+                duration, queries, db_ms = record['duration_ms'], record['queries'], record['db_ms']
+            except (ValueError, KeyError, TypeError):
+                skipped += 1
+                continue
+
+            stats = endpoints.setdefault(endpoint, {'durations': [], 'queries': [], 'db_ms': 0.0, 'errors': 0})
+            stats['durations'].append(duration)
+            stats['queries'].append(queries)
+            stats['db_ms'] += db_ms
+            if record.get('status', 200) >= 500:
+                stats['errors'] += 1
+            for sql, (count, ms) in record.get('fingerprints', {}).items():
+                entry = fingerprints.setdefault(sql, {'executions': 0, 'time_ms': 0.0, 'max_per_request': 0, 'endpoints': set()})
+                entry['executions'] += count
+                entry['time_ms'] += ms
+                entry['max_per_request'] = max(entry['max_per_request'], count)
+                entry['endpoints'].add(endpoint)
+
+        summary = []
+        for endpoint, stats in endpoints.items():
+            durations = sorted(stats['durations'])
+            requests = len(durations)
+            summary.append({
+                'endpoint': endpoint,
+                'requests': requests,
+                'errors': stats['errors'],
+                'total_ms': round(sum(durations), 1),
+                'p50_ms': round(percentile(durations, 0.5), 1),
+                'p95_ms': round(percentile(durations, 0.95), 1),
+                'p99_ms': round(percentile(durations, 0.99), 1),
+                'queries_mean': round(sum(stats['queries']) / requests, 1),
+                'queries_max': max(stats['queries']),
+                'db_ms_mean': round(stats['db_ms'] / requests, 1),
+            })
+        sort_key = {'total': 'total_ms', 'p95': 'p95_ms', 'queries': 'queries_mean', 'requests': 'requests'}[options['sort']]
+        summary.sort(key=lambda row: -row[sort_key])
+
+        top_sql = sorted(fingerprints.items(), key=lambda item: -item[1]['executions'])[:options['top']]
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'endpoints': summary,
+                'top_fingerprints': [
+                    {**entry, 'sql': sql, 'time_ms': round(entry['time_ms'], 1), 'endpoints': sorted(entry['endpoints'])}
+                    for sql, entry in top_sql
+                ],
+                'skipped_lines': skipped,
+            }, indent=2))
+            return
+
+        self.stdout.write(
+            f'{"endpoint":<45} {"reqs":>6} {"5xx":>4} {"p50ms":>8} {"p95ms":>8} {"p99ms":>8} '
+            f'{"queries":>8} {"maxq":>5} {"db ms":>7}'
+        )
+        for row in summary:
+            self.stdout.write(
+                f'{row["endpoint"][:45]:<45} {row["requests"]:>6} {row["errors"]:>4} {row["p50_ms"]:>8} '
+                f'{row["p95_ms"]:>8} {row["p99_ms"]:>8} {row["queries_mean"]:>8} {row["queries_max"]:>5} '
+                f'{row["db_ms_mean"]:>7}'
+            )
+        if top_sql:
+            self.stdout.write('\nMost executed SQL (executions, max per request, total ms):')
+            for sql, entry in top_sql:
+                self.stdout.write(
+                    f'{entry["executions"]:>8} {entry["max_per_request"]:>5} {entry["time_ms"]:>9.1f}  {sql[:160]}'
+                )
+        if skipped:
+            self.stderr.write(f'Skipped {skipped} unreadable lines')
+
+    def read_lines(self, paths):
+        if not paths:
+            yield from sys.stdin
+            return
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as stream:
+                    yield from stream
+            except OSError as exc:
+                raise CommandError(f'Cannot read {path}: {exc}')
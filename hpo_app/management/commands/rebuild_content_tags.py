@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hpo_app import tags
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the normalized tag links of game content from the comma-separated tags (e.g. after bulk loads)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Content rows linked per batch')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            linked = tags.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Content tags rebuilt with {linked} links'))
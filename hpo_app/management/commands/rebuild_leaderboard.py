@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hpo_app import leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the leaderboard table from player statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Entries inserted per query')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = leaderboard.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Leaderboard rebuilt with {created} entries'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hpo_app import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index of game content and questions (e.g. after bulk loads)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Documents indexed per batch')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = search.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt with {written} entries'))
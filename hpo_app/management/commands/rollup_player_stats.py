@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from hpo_app import leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-player daily stats used by the day/week/month leaderboards'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=2,
+            help='Number of most recent days to recompute, including today (default 2)'
+        )
+        parser.add_argument(
+            '--since', type=date.fromisoformat,
+            help='Recompute every day from this date (YYYY-MM-DD) until today, e.g. for a backfill'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options['since']:
+            start_day = options['since']
+        elif options['days'] >= 1:
+            start_day = today - timedelta(days=options['days'] - 1)
+        else:
+            raise CommandError('--days must be at least 1')
+
+        written = leaderboard.rollup(start_day, today)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rolled up {written} player-day rows from {start_day} to {today}'
+        ))
@@ -0,0 +1,71 @@
+import json
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from hpo_app import search, tags
+from hpo_app.models import Player
+from hpo_app.seeding import ScaleSeeder, dataset_summary
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a deterministic scale-testing dataset: players, questions per card and language, '
+        'game content and completed games with participants, responses and results'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=10000)
+        parser.add_argument('--questions-per-card', type=int, default=5,
+                            help='Questions per card and language (default 5)')
+        parser.add_argument('--content', type=int, default=500, help='Game content records (default 500)')
+        parser.add_argument('--games', type=int, default=20000, help='Completed games (default 20000)')
+        parser.add_argument('--days', type=int, default=90, help='Days of history the games span (default 90)')
+        parser.add_argument('--end-date', type=date.fromisoformat,
+                            help='Last day of the seeded history, YYYY-MM-DD (default today)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default 1)')
+        parser.add_argument('--prefix', default='seed', help="Username prefix of seeded players (default 'seed')")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--summary-only', action='store_true', help='Print the dataset summary and exit')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if options['summary_only']:
+            self.stdout.write(json.dumps(dataset_summary(), indent=2))
+            return
+        for name in ('players', 'questions_per_card', 'content', 'games'):
+            if options[name] < 0:
+                raise CommandError(f'--{name.replace("_", "-")} cannot be negative')
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--days and --batch-size must be at least 1')
+        prefix = options['prefix']
+        if Player.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f"Players with prefix '{prefix}_' already exist; choose another --prefix")
+
+        seeder = ScaleSeeder(
+            seed=options['seed'], batch_size=options['batch_size'], prefix=prefix,
+            end_date=options['end_date'], progress=self.progress,
+        )
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                seeder.players(options['players'])
+                seeder.questions(options['questions_per_card'])
+                seeder.game_content(options['content'])
+                # bulk_create skips the signals that keep the search index and tag links current
+                self.progress(f'search index entries: {search.rebuild()}')
+                self.progress(f'content tag links: {tags.rebuild()}')
+                if options['games']:
+                    seeder.games(options['games'], options['days'])
+                    seeder.refresh_player_stats(options['days'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(json.dumps(dataset_summary(), indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {time.perf_counter() - started:.1f}s'))
+
+    def progress(self, message):
+        if self.verbosity >= 1:
+            self.stderr.write(message)
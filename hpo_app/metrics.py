@@ -0,0 +1,332 @@
+"""
+Per-endpoint request latency and SQL query metrics
+
+``QueryMetricsMiddleware`` is opt-in (``METRICS_ENABLED``). Every request
+adds its latency to a histogram keyed by URL name, which costs two clock
+reads and a dict update. A ``METRICS_SAMPLE_RATE`` fraction of requests is
+also run under ``connection.execute_wrapper`` to count queries and DB time
+and to group statements by fingerprint (SQL with placeholder lists and
+savepoint names collapsed), which surfaces N+1 patterns as one fingerprint
+executed many times per request.
+
+Metrics are kept per worker process and served by the JSON and Prometheus
+endpoints in ``views.py``. When ``METRICS_LOG_FILE`` is set, each sampled
+request is also written as one JSON line to the ``hpo_app.metrics`` logger;
+``manage.py metrics_report`` summarizes those files across workers.
+"""
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger('hpo_app.metrics')
+
+# Upper bounds in seconds (Prometheus "le" buckets; +Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_VALUES_LIST = re.compile(r'(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+', re.IGNORECASE)
+_SAVEPOINT = re.compile(r'"s\d+_x\d+"')
+_NUMBER = re.compile(r'\b\d+\b')
+_SPACES = re.compile(r'\s+')
+
+
+def sample_rate():
+    return getattr(settings, 'METRICS_SAMPLE_RATE', 0.05)
+
+
+def max_fingerprints():
+    return getattr(settings, 'METRICS_MAX_FINGERPRINTS', 500)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """Normalize a SQL statement so repeats of the same query compare equal"""
+    sql = _IN_LIST.sub('(...)', sql)
+    sql = _VALUES_LIST.sub(r'\1, ...', sql)
+    sql = _SAVEPOINT.sub('"<savepoint>"', sql)
+    sql = _NUMBER.sub('N', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that counts queries, DB time and fingerprints of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        # raw SQL -> [executions, seconds]; fingerprinted once per request in by_fingerprint()
+        self.fingerprints = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.time += elapsed
+            entry = self.fingerprints.get(sql)
+            if entry is None:
+                self.fingerprints[sql] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def by_fingerprint(self):
+        """Return {fingerprint: [executions, seconds]}"""
+        grouped = {}
+        for sql, (count, seconds) in self.fingerprints.items():
+            entry = grouped.setdefault(fingerprint(sql), [0, 0.0])
+            entry[0] += count
+            entry[1] += seconds
+        return grouped
+
+
+def _histogram(bounds):
+    return [0] * (len(bounds) + 1)
+
+
+class EndpointStats:
+    __slots__ = (
+        'requests', 'errors', 'latency', 'latency_sum',
+        'sampled', 'queries', 'query_sum', 'max_queries', 'db_time',
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency = _histogram(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.sampled = 0
+        self.queries = _histogram(QUERY_BUCKETS)
+        self.query_sum = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+
+
+class MetricsRegistry:
+    """Thread-safe per-worker metrics store"""
+
+    def __init__(self, max_fingerprints=None):
+        self._max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def max_fingerprints(self):
+        if self._max_fingerprints is not None:
+            return self._max_fingerprints
+        return max_fingerprints()
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            # fingerprint -> [executions, seconds, max per request, {endpoint: executions}]
+            self._fingerprints = {}
+            self._dropped_fingerprints = 0
+            self._started = time.time()
+
+    def record(self, endpoint, status, duration, recorder=None):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.requests += 1
+            if status >= 500:
+                stats.errors += 1
+            stats.latency[bisect_left(LATENCY_BUCKETS, duration)] += 1
+            stats.latency_sum += duration
+            if recorder is None:
+                return
+
+            stats.sampled += 1
+            stats.queries[bisect_left(QUERY_BUCKETS, recorder.count)] += 1
+            stats.query_sum += recorder.count
+            stats.max_queries = max(stats.max_queries, recorder.count)
+            stats.db_time += recorder.time
+            for sql, (count, seconds) in recorder.by_fingerprint().items():
+                entry = self._fingerprints.get(sql)
+                if entry is None:
+                    if len(self._fingerprints) >= self.max_fingerprints:
+                        self._dropped_fingerprints += 1
+                        continue
+                    entry = self._fingerprints[sql] = [0, 0.0, 0, {}]
+                entry[0] += count
+                entry[1] += seconds
+                entry[2] = max(entry[2], count)
+                entry[3][endpoint] = entry[3].get(endpoint, 0) + count
+
+    def snapshot(self, top=20):
+        """Return the metrics as a JSON-serializable dict"""
+        with self._lock:
+            endpoints = {}
+            for name, stats in sorted(self._endpoints.items()):
+                endpoints[name] = {
+                    'requests': stats.requests,
+                    'errors': stats.errors,
+                    'latency_ms': {
+                        'mean': round(stats.latency_sum / stats.requests * 1000, 2),
+                        'p50': round(_percentile(stats.latency, LATENCY_BUCKETS, 0.5) * 1000, 2),
+                        'p95': round(_percentile(stats.latency, LATENCY_BUCKETS, 0.95) * 1000, 2),
+                        'p99': round(_percentile(stats.latency, LATENCY_BUCKETS, 0.99) * 1000, 2),
+                    },
+                    'latency_seconds_sum': round(stats.latency_sum, 6),
+                    'latency_buckets': _cumulative(stats.latency, LATENCY_BUCKETS),
+                    'sampled': stats.sampled,
+                    'queries': {
+                        'mean': round(stats.query_sum / stats.sampled, 2) if stats.sampled else None,
+                        'max': stats.max_queries,
+                        'sum': stats.query_sum,
+                        'buckets': _cumulative(stats.queries, QUERY_BUCKETS),
+                    },
+                    'db_time_seconds': round(stats.db_time, 6),
+                    'db_time_ms_mean': round(stats.db_time / stats.sampled * 1000, 2) if stats.sampled else None,
+                }
+            fingerprints = [
+                {
+                    'sql': sql,
+                    'executions': executions,
+                    'time_ms': round(seconds * 1000, 2),
+                    'max_per_request': max_per_request,
+                    'endpoints': dict(sorted(by_endpoint.items(), key=lambda item: -item[1])[:5]),
+                }
+                for sql, (executions, seconds, max_per_request, by_endpoint) in sorted(
+                    self._fingerprints.items(), key=lambda item: -item[1][0]
+                )[:top]
+            ]
+            return {
+                'since': self._started,
+                'sample_rate': sample_rate(),
+                'endpoints': endpoints,
+                'top_fingerprints': fingerprints,
+                'dropped_fingerprints': self._dropped_fingerprints,
+            }
+
+    def prometheus(self, top=20):
+        """Return the metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot(top)
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def histogram(name, buckets, total, count, labels):
+            for bound, cumulative in buckets.items():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {total}')
+            lines.append(f'{name}_count{{{labels}}} {count}')
+
+        endpoints = snapshot['endpoints']
+        metric('hpo_http_requests_total', 'counter', 'Requests by URL name')
+        for name, data in endpoints.items():
+            lines.append(f'hpo_http_requests_total{{endpoint="{_escape(name)}"}} {data["requests"]}')
+        metric('hpo_http_request_errors_total', 'counter', 'Requests answered with a 5xx status')
+        for name, data in endpoints.items():
+            lines.append(f'hpo_http_request_errors_total{{endpoint="{_escape(name)}"}} {data["errors"]}')
+        metric('hpo_http_request_duration_seconds', 'histogram', 'Request latency')
+        for name, data in endpoints.items():
+            histogram(
+                'hpo_http_request_duration_seconds', data['latency_buckets'],
+                data['latency_seconds_sum'], data['requests'], f'endpoint="{_escape(name)}"'
+            )
+        metric('hpo_db_queries_per_request', 'histogram', 'SQL queries per sampled request')
+        for name, data in endpoints.items():
+            histogram(
+                'hpo_db_queries_per_request', data['queries']['buckets'],
+                data['queries']['sum'], data['sampled'], f'endpoint="{_escape(name)}"'
+            )
+        metric('hpo_db_time_seconds_total', 'counter', 'Database time of sampled requests')
+        for name, data in endpoints.items():
+            lines.append(f'hpo_db_time_seconds_total{{endpoint="{_escape(name)}"}} {data["db_time_seconds"]}')
+        metric('hpo_sql_fingerprint_executions_total', 'counter', 'Executions of the most repeated SQL statements')
+        for entry in snapshot['top_fingerprints']:
+            lines.append(
+                f'hpo_sql_fingerprint_executions_total{{sql="{_escape(entry["sql"][:200])}"}} {entry["executions"]}'
+            )
+        return '\n'.join(lines) + '\n'
+
+
+def _cumulative(counts, bounds):
+    result = {}
+    running = 0
+    for bound, count in zip(bounds + ('+Inf',), counts):
+        running += count
+        result[str(bound)] = running
+    return result
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _percentile(counts, bounds, fraction):
+    """Upper bound of the bucket holding the given fraction of observations"""
+    total = sum(counts)
+    if not total:
+        return 0.0
+    running = 0
+    for index, count in enumerate(counts):
+        running += count
+        if running >= total * fraction:
+            return bounds[index] if index < len(bounds) else float(bounds[-1])
+    return float(bounds[-1])
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+class QueryMetricsMiddleware:
+    """Record latency for every request and SQL metrics for a sample of them"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sampled = random.random() < sample_rate()
+        recorder = QueryRecorder() if sampled else None
+        start = time.perf_counter()
+        if recorder is None:
+            response = self.get_response(request)
+        else:
+            with connection.execute_wrapper(recorder):
+                response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.view_name if match else '<unresolved>'
+        registry.record(endpoint, response.status_code, duration, recorder)
+        if recorder is not None and logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'ts': round(time.time(), 3),
+                'endpoint': endpoint,
+                'method': request.method,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 3),
+                'queries': recorder.count,
+                'db_ms': round(recorder.time * 1000, 3),
+                'fingerprints': {
+                    sql: [count, round(seconds * 1000, 3)]
+                    for sql, (count, seconds) in recorder.by_fingerprint().items()
+                },
+            }))
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0020_add_language_to_question'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['card', 'language'], name='hpo_app_que_card_01ad77_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['language', 'difficulty'], name='hpo_app_que_languag_bf70d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['question_type'], name='hpo_app_que_questio_aea77f_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_leaderboard(apps, schema_editor):
+    """Create leaderboard entries for players that have already played"""
+    Player = apps.get_model('hpo_app', 'Player')
+    LeaderboardEntry = apps.get_model('hpo_app', 'LeaderboardEntry')
+    entries = []
+    for player in Player.objects.filter(games_played__gt=0).iterator():
+        entries.append(LeaderboardEntry(
+            player_id=player.pk,
+            username=player.username,
+            player_name=player.player_name,
+            province=player.province,
+            district=player.district,
+            age_group=player.age_group,
+            organization_id=player.organization_id,
+            games_played=player.games_played,
+            games_won=player.games_won,
+            total_marks=player.total_game_marks,
+            questions_answered=player.questions_answered,
+            correct_answers=player.correct_answers,
+            current_win_streak=player.current_win_streak,
+            longest_win_streak=player.longest_win_streak,
+            win_rate=player.games_won * 100 / player.games_played,
+            answer_accuracy=player.correct_answers * 100 / player.questions_answered if player.questions_answered else 0.0,
+            last_played=player.last_game_played,
+        ))
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0021_question_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='leaderboard_entry', serialize=False, to='hpo_app.player')),
+                ('username', models.CharField(max_length=150)),
+                ('player_name', models.CharField(max_length=200)),
+                ('province', models.CharField(blank=True, max_length=30, null=True)),
+                ('district', models.CharField(blank=True, max_length=30, null=True)),
+                ('age_group', models.CharField(blank=True, max_length=10, null=True)),
+                ('games_played', models.IntegerField(default=0)),
+                ('games_won', models.IntegerField(default=0)),
+                ('total_marks', models.IntegerField(default=0)),
+                ('questions_answered', models.IntegerField(default=0)),
+                ('correct_answers', models.IntegerField(default=0)),
+                ('current_win_streak', models.IntegerField(default=0)),
+                ('longest_win_streak', models.IntegerField(default=0)),
+                ('win_rate', models.FloatField(default=0.0, help_text='Win percentage (unrounded)')),
+                ('answer_accuracy', models.FloatField(default=0.0, help_text='Correct answer percentage (unrounded)')),
+                ('last_played', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='hpo_app.organisation')),
+            ],
+            options={
+                'verbose_name': 'Leaderboard Entry',
+                'verbose_name_plural': 'Leaderboard Entries',
+                'indexes': [models.Index(fields=['-total_marks', '-games_won', 'player'], name='leaderboard_marks_idx'), models.Index(fields=['-games_won', '-total_marks', 'player'], name='leaderboard_wins_idx'), models.Index(fields=['-win_rate', '-games_played', 'player'], name='leaderboard_win_rate_idx'), models.Index(fields=['-answer_accuracy', '-questions_answered', 'player'], name='leaderboard_accuracy_idx'), models.Index(fields=['-longest_win_streak', '-total_marks', 'player'], name='leaderboard_streak_idx'), models.Index(fields=['province', '-total_marks'], name='leaderboard_province_idx'), models.Index(fields=['district', '-total_marks'], name='leaderboard_district_idx'), models.Index(fields=['age_group', '-total_marks'], name='leaderboard_age_group_idx'), models.Index(fields=['organization', '-total_marks'], name='leaderboard_org_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_leaderboard, migrations.RunPython.noop),
+    ]
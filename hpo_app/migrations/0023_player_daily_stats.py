@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0022_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('games_played', models.IntegerField(default=0)),
+                ('games_won', models.IntegerField(default=0)),
+                ('total_marks', models.IntegerField(default=0)),
+                ('questions_answered', models.IntegerField(default=0)),
+                ('correct_answers', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Player Daily Stats',
+                'verbose_name_plural': 'Player Daily Stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='gameparticipant',
+            index=models.Index(fields=['joined_at'], name='participant_joined_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='playerdailystats',
+            name='player',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='hpo_app.player'),
+        ),
+        migrations.AddIndex(
+            model_name='playerdailystats',
+            index=models.Index(fields=['day', 'player'], name='daily_stats_day_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='playerdailystats',
+            unique_together={('player', 'day')},
+        ),
+    ]
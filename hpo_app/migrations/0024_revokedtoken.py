@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0023_player_daily_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('jti', models.CharField(help_text='Token id', max_length=32, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='When the token would have expired')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revoked_tokens', to='hpo_app.player')),
+            ],
+            options={
+                'verbose_name': 'Revoked Token',
+                'verbose_name_plural': 'Revoked Tokens',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0024_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='player',
+            name='email',
+            field=models.EmailField(blank=True, db_index=True, max_length=254, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0025_player_email_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['completed_at'], name='game_completed_at_idx'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:58
+
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import migrations, models
+
+
+# Frozen copy of the tokenizer and field weights in hpo_app/search.py at the time
+# of this migration, so later changes there do not alter what it writes
+CONTENT_FIELD_WEIGHTS = {'title': 4, 'topic': 4, 'subtopic': 3, 'tags': 3, 'subtopics': 2, 'info': 1}
+QUESTION_FIELD_WEIGHTS = {'question_text': 2}
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+STOPWORDS = frozenset(
+    'an and are as at be by for from has in is it its of on or that the to was were will with '
+    'au aux ce de des du en est et la le les un une'.split()
+)
+TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    if not text:
+        return []
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return [
+        token for token in TOKEN.findall(text)
+        if MIN_TERM_LENGTH <= len(token) <= MAX_TERM_LENGTH and token not in STOPWORDS
+    ]
+
+
+def document_fields(kind, document):
+    if kind == 'question':
+        return {'question_text': document.question_text}, QUESTION_FIELD_WEIGHTS
+    subtopics = []
+    for item in document.subtopics_data or []:
+        if isinstance(item, dict):
+            subtopics.append(str(item.get('subtopic', '')))
+            subtopics.append(str(item.get('info', '')))
+    fields = {
+        'title': document.title,
+        'topic': document.topic,
+        'subtopic': document.subtopic,
+        'tags': document.tags,
+        'subtopics': ' '.join(subtopics),
+        'info': document.info,
+    }
+    return fields, CONTENT_FIELD_WEIGHTS
+
+
+def build_entries(kind, document, SearchIndexEntry):
+    fields, weights = document_fields(kind, document)
+    return [
+        SearchIndexEntry(
+            term=term, kind=kind, object_id=document.pk, language=document.language or '',
+            field=field, weight=occurrences * weights[field],
+        )
+        for field, text in fields.items()
+        for term, occurrences in Counter(tokenize(text)).items()
+    ]
+
+
+def backfill_search_index(apps, schema_editor):
+    """Index existing game content and questions"""
+    SearchIndexEntry = apps.get_model('hpo_app', 'SearchIndexEntry')
+    for kind, model in (('content', 'GameContent'), ('question', 'Question')):
+        entries = []
+        for document in apps.get_model('hpo_app', model).objects.order_by('pk').iterator():
+            entries.extend(build_entries(kind, document, SearchIndexEntry))
+            if len(entries) >= 5000:
+                SearchIndexEntry.objects.bulk_create(entries, batch_size=1000)
+                entries = []
+        SearchIndexEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0026_game_completed_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('kind', models.CharField(choices=[('content', 'Game Content'), ('question', 'Question')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('language', models.CharField(max_length=20)),
+                ('field', models.CharField(help_text='Document field the term occurs in', max_length=20)),
+                ('weight', models.PositiveIntegerField(default=1, help_text='Occurrences times the field weight')),
+            ],
+            options={
+                'verbose_name': 'Search Index Entry',
+                'verbose_name_plural': 'Search Index Entries',
+                'indexes': [models.Index(fields=['term', 'language', 'kind', 'object_id'], name='search_term_idx'), models.Index(fields=['kind', 'object_id'], name='search_document_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:00
+
+from django.db import migrations, models
+
+
+# Frozen copy of the parsing rules in hpo_app/tags.py at the time of this migration
+MAX_TAG_LENGTH = 50
+
+
+def parse(text):
+    """Unique normalized tag names of a comma-separated string, in order"""
+    if not text:
+        return []
+    names = (' '.join(part.split()).lower()[:MAX_TAG_LENGTH] for part in text.split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def backfill_tags(apps, schema_editor):
+    """Create tags and links from the comma-separated tags of existing game content"""
+    GameContent = apps.get_model('hpo_app', 'GameContent')
+    Tag = apps.get_model('hpo_app', 'Tag')
+    Through = GameContent.tag_set.through
+    parsed = [(pk, parse(text)) for pk, text in GameContent.objects.exclude(tags__isnull=True).values_list('pk', 'tags')]
+    names = sorted({name for _, tag_names in parsed for name in tag_names})
+    Tag.objects.bulk_create([Tag(name=name) for name in names], batch_size=1000)
+    tag_ids = dict(Tag.objects.values_list('name', 'pk'))
+    Through.objects.bulk_create(
+        [Through(gamecontent_id=pk, tag_id=tag_ids[name]) for pk, tag_names in parsed for name in tag_names],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0027_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Lowercase tag name', max_length=50, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='gamecontent',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='contents', to='hpo_app.tag'),
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
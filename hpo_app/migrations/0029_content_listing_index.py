@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0028_content_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gamecontent',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='content_listing_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:10
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+import django.utils.timezone
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Existing games last changed when they completed (or were created)"""
+    Game = apps.get_model('hpo_app', 'Game')
+    Game.objects.update(updated_at=Coalesce('completed_at', 'created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hpo_app', '0029_content_listing_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['updated_at'], name='game_updated_at_idx'),
+        ),
+    ]
@@ -1,8 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinLengthValidator
 import uuid
 
+from .cards import CARD_CHOICES, CARD_REGISTRY, get_card_info
+from .locations import DISTRICT_CHOICES, PROVINCE_CHOICES
+
 
 class Organisation(models.Model):
     """Organisation model based on organisationSchema"""
@@ -118,7 +121,7 @@ class Player(models.Model):
     """Player model based on playerSchema"""
     player_name = models.CharField(max_length=200, help_text="Full name of the player", default="Unknown Player")
     username = models.CharField(max_length=150, unique=True)
-    email = models.EmailField(blank=True, null=True)
+    email = models.EmailField(blank=True, null=True, db_index=True)
     password = models.CharField(max_length=128, validators=[MinLengthValidator(6)])
     phone = models.CharField(max_length=20, blank=True, null=True)
     
@@ -150,13 +153,7 @@ class Player(models.Model):
     )
     
     # Rwanda Location Fields
-    PROVINCE_CHOICES = [
-        ('Kigali City', 'Kigali City'),
-        ('Northern Province', 'Northern Province'),
-        ('Southern Province', 'Southern Province'),
-        ('Eastern Province', 'Eastern Province'),
-        ('Western Province', 'Western Province'),
-    ]
+    PROVINCE_CHOICES = PROVINCE_CHOICES
     province = models.CharField(
         max_length=30,
         choices=PROVINCE_CHOICES,
@@ -165,43 +162,7 @@ class Player(models.Model):
         help_text="Select province in Rwanda"
     )
     
-    DISTRICT_CHOICES = [
-        # Kigali City
-        ('Gasabo', 'Gasabo'),
-        ('Kicukiro', 'Kicukiro'),
-        ('Nyarugenge', 'Nyarugenge'),
-        # Northern Province
-        ('Burera', 'Burera'),
-        ('Gakenke', 'Gakenke'),
-        ('Gicumbi', 'Gicumbi'),
-        ('Musanze', 'Musanze'),
-        ('Rulindo', 'Rulindo'),
-        # Southern Province
-        ('Gisagara', 'Gisagara'),
-        ('Huye', 'Huye'),
-        ('Kamonyi', 'Kamonyi'),
-        ('Muhanga', 'Muhanga'),
-        ('Nyamagabe', 'Nyamagabe'),
-        ('Nyanza', 'Nyanza'),
-        ('Nyaruguru', 'Nyaruguru'),
-        ('Ruhango', 'Ruhango'),
-        # Eastern Province
-        ('Bugesera', 'Bugesera'),
-        ('Gatsibo', 'Gatsibo'),
-        ('Kayonza', 'Kayonza'),
-        ('Kirehe', 'Kirehe'),
-        ('Ngoma', 'Ngoma'),
-        ('Nyagatare', 'Nyagatare'),
-        ('Rwamagana', 'Rwamagana'),
-        # Western Province
-        ('Karongi', 'Karongi'),
-        ('Ngororero', 'Ngororero'),
-        ('Nyabihu', 'Nyabihu'),
-        ('Nyamasheke', 'Nyamasheke'),
-        ('Rubavu', 'Rubavu'),
-        ('Rusizi', 'Rusizi'),
-        ('Rutsiro', 'Rutsiro'),
-    ]
+    DISTRICT_CHOICES = DISTRICT_CHOICES
     district = models.CharField(
         max_length=30,
         choices=DISTRICT_CHOICES,
@@ -329,27 +290,78 @@ class Player(models.Model):
             return 0.0
         return round(self.total_game_marks / self.games_played, 2)
     
-    def update_game_stats(self, won=False, marks_earned=0, questions_answered=0, correct_answers=0):
-        """Update player's game statistics after a game"""
+    # Columns written when a game result is recorded
+    GAME_STATS_FIELDS = [
+        'games_played', 'games_won', 'games_lost', 'current_win_streak', 'longest_win_streak',
+        'last_game_result', 'total_game_marks', 'questions_answered', 'correct_answers',
+        'last_game_played', 'updated_at',
+    ]
+    
+    # Columns written when a post-game question is answered
+    ANSWER_STATS_FIELDS = ['total_game_marks', 'questions_answered', 'correct_answers', 'updated_at']
+    
+    @staticmethod
+    def game_stats_updates(won=False, marks_earned=0, questions_answered=0, correct_answers=0):
+        """
+        Return {field: expression} that records a game result in the database
+        Covers every GAME_STATS_FIELDS column. All counters are computed from
+        the current row values, so concurrent updates never overwrite each other.
+        """
         from django.utils import timezone
         
-        self.games_played += 1
+        now = timezone.now()
+        updates = {
+            'games_played': models.F('games_played') + 1,
+            'total_game_marks': models.F('total_game_marks') + marks_earned,
+            'questions_answered': models.F('questions_answered') + questions_answered,
+            'correct_answers': models.F('correct_answers') + correct_answers,
+            'last_game_played': now,
+            'updated_at': now,
+        }
         if won:
-            self.games_won += 1
-            self.current_win_streak += 1
-            if self.current_win_streak > self.longest_win_streak:
-                self.longest_win_streak = self.current_win_streak
-            self.last_game_result = 'won'
+            updates.update({
+                'games_won': models.F('games_won') + 1,
+                'games_lost': models.F('games_lost'),
+                'current_win_streak': models.F('current_win_streak') + 1,
+                # Every right-hand side sees the old row, so compare against the old streak + 1
+                'longest_win_streak': models.Case(
+                    models.When(longest_win_streak__lte=models.F('current_win_streak'), then=models.F('current_win_streak') + 1),
+                    default=models.F('longest_win_streak'),
+                ),
+                'last_game_result': 'won',
+            })
         else:
-            self.games_lost += 1
-            self.current_win_streak = 0
-            self.last_game_result = 'lost'
+            updates.update({
+                'games_won': models.F('games_won'),
+                'games_lost': models.F('games_lost') + 1,
+                'current_win_streak': 0,
+                'longest_win_streak': models.F('longest_win_streak'),
+                'last_game_result': 'lost',
+            })
+        return updates
+    
+    def update_game_stats(self, won=False, marks_earned=0, questions_answered=0, correct_answers=0):
+        """Update player's game statistics after a game"""
+        updates = self.game_stats_updates(won, marks_earned, questions_answered, correct_answers)
+        # The row stays locked until commit, so leaderboard writes for a player are serialized
+        with transaction.atomic():
+            Player.objects.filter(pk=self.pk).update(**updates)
+            self.refresh_from_db(fields=self.GAME_STATS_FIELDS)
+            LeaderboardEntry.sync([self])
+    
+    def record_answer(self, correct, marks_earned=0):
+        """Count an answered post-game question, plus marks for a correct answer"""
+        from django.utils import timezone
         
-        self.total_game_marks += marks_earned
-        self.questions_answered += questions_answered
-        self.correct_answers += correct_answers
-        self.last_game_played = timezone.now()
-        self.save()
+        with transaction.atomic():
+            Player.objects.filter(pk=self.pk).update(
+                total_game_marks=models.F('total_game_marks') + marks_earned,
+                questions_answered=models.F('questions_answered') + 1,
+                correct_answers=models.F('correct_answers') + (1 if correct else 0),
+                updated_at=timezone.now(),
+            )
+            self.refresh_from_db(fields=self.GAME_STATS_FIELDS)
+            LeaderboardEntry.sync([self])
     
     def get_game_history_summary(self):
         """Get a summary of player's game history"""
@@ -375,6 +387,146 @@ class Player(models.Model):
         verbose_name_plural = 'Players'
 
 
+class RevokedToken(models.Model):
+    """Signed player token revoked before its expiry (e.g. by logout)"""
+    jti = models.CharField(max_length=32, primary_key=True, help_text="Token id")
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='revoked_tokens')
+    expires_at = models.DateTimeField(db_index=True, help_text="When the token would have expired")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.jti} (player {self.player_id})"
+    
+    class Meta:
+        verbose_name = 'Revoked Token'
+        verbose_name_plural = 'Revoked Tokens'
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Denormalized copy of a player's ranking columns
+    Kept up to date whenever player statistics change, so leaderboards are
+    read with an indexed ORDER BY ... LIMIT instead of sorting all players.
+    """
+    player = models.OneToOneField(Player, on_delete=models.CASCADE, primary_key=True, related_name='leaderboard_entry')
+    
+    # Profile columns used for scoped boards, kept in sync by signals.py
+    username = models.CharField(max_length=150)
+    player_name = models.CharField(max_length=200)
+    province = models.CharField(max_length=30, blank=True, null=True)
+    district = models.CharField(max_length=30, blank=True, null=True)
+    age_group = models.CharField(max_length=10, blank=True, null=True)
+    organization = models.ForeignKey(Organisation, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    
+    # Ranking columns
+    games_played = models.IntegerField(default=0)
+    games_won = models.IntegerField(default=0)
+    total_marks = models.IntegerField(default=0)
+    questions_answered = models.IntegerField(default=0)
+    correct_answers = models.IntegerField(default=0)
+    current_win_streak = models.IntegerField(default=0)
+    longest_win_streak = models.IntegerField(default=0)
+    win_rate = models.FloatField(default=0.0, help_text="Win percentage (unrounded)")
+    answer_accuracy = models.FloatField(default=0.0, help_text="Correct answer percentage (unrounded)")
+    last_played = models.DateTimeField(blank=True, null=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    PROFILE_FIELDS = ['username', 'player_name', 'province', 'district', 'age_group', 'organization']
+    STATS_FIELDS = [
+        'games_played', 'games_won', 'total_marks', 'questions_answered', 'correct_answers',
+        'current_win_streak', 'longest_win_streak', 'win_rate', 'answer_accuracy', 'last_played', 'updated_at',
+    ]
+    
+    @classmethod
+    def from_player(cls, player):
+        """Build an (unsaved) entry from a player's current values"""
+        return cls(
+            player_id=player.pk,
+            username=player.username,
+            player_name=player.player_name,
+            province=player.province,
+            district=player.district,
+            age_group=player.age_group,
+            organization_id=player.organization_id,
+            games_played=player.games_played,
+            games_won=player.games_won,
+            total_marks=player.total_game_marks,
+            questions_answered=player.questions_answered,
+            correct_answers=player.correct_answers,
+            current_win_streak=player.current_win_streak,
+            longest_win_streak=player.longest_win_streak,
+            win_rate=player.games_won * 100 / player.games_played if player.games_played else 0.0,
+            answer_accuracy=player.correct_answers * 100 / player.questions_answered if player.questions_answered else 0.0,
+            last_played=player.last_game_played,
+        )
+    
+    @classmethod
+    def sync(cls, players, update_fields=None):
+        """
+        Upsert entries for players that have played, with one query
+        By default only the ranking columns are overwritten on existing rows.
+        """
+        entries = [cls.from_player(player) for player in players if player.games_played]
+        if entries:
+            cls.objects.bulk_create(
+                entries,
+                update_conflicts=True,
+                unique_fields=['player'],
+                update_fields=update_fields or cls.STATS_FIELDS,
+            )
+    
+    def __str__(self):
+        return f"{self.username}: {self.total_marks} marks"
+    
+    class Meta:
+        verbose_name = 'Leaderboard Entry'
+        verbose_name_plural = 'Leaderboard Entries'
+        indexes = [
+            models.Index(fields=['-total_marks', '-games_won', 'player'], name='leaderboard_marks_idx'),
+            models.Index(fields=['-games_won', '-total_marks', 'player'], name='leaderboard_wins_idx'),
+            models.Index(fields=['-win_rate', '-games_played', 'player'], name='leaderboard_win_rate_idx'),
+            models.Index(fields=['-answer_accuracy', '-questions_answered', 'player'], name='leaderboard_accuracy_idx'),
+            models.Index(fields=['-longest_win_streak', '-total_marks', 'player'], name='leaderboard_streak_idx'),
+            models.Index(fields=['province', '-total_marks'], name='leaderboard_province_idx'),
+            models.Index(fields=['district', '-total_marks'], name='leaderboard_district_idx'),
+            models.Index(fields=['age_group', '-total_marks'], name='leaderboard_age_group_idx'),
+            models.Index(fields=['organization', '-total_marks'], name='leaderboard_org_idx'),
+        ]
+
+
+class PlayerDailyStats(models.Model):
+    """
+    Per-player, per-day rollup of game participations
+    Rebuilt for recent days by the rollup_player_stats command, so windowed
+    leaderboards sum at most a month of rows per player instead of scanning
+    the whole game history.
+    """
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    
+    games_played = models.IntegerField(default=0)
+    games_won = models.IntegerField(default=0)
+    total_marks = models.IntegerField(default=0)
+    questions_answered = models.IntegerField(default=0)
+    correct_answers = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    COUNTER_FIELDS = ['games_played', 'games_won', 'total_marks', 'questions_answered', 'correct_answers']
+    
+    def __str__(self):
+        return f"{self.player_id} on {self.day}: {self.total_marks} marks"
+    
+    class Meta:
+        verbose_name = 'Player Daily Stats'
+        verbose_name_plural = 'Player Daily Stats'
+        unique_together = ['player', 'day']
+        indexes = [
+            models.Index(fields=['day', 'player'], name='daily_stats_day_idx'),
+        ]
+
+
 class Question(models.Model):
     """Individual question model"""
     
@@ -403,49 +555,8 @@ class Question(models.Model):
         default='multiple_choice'
     )
     
-    # Card association
-    CARD_CHOICES = [
-        # Spades
-        ('S3', 'Spades 3'),
-        ('S4', 'Spades 4'),
-        ('S5', 'Spades 5'),
-        ('S6', 'Spades 6'),
-        ('S7', 'Spades 7'),
-        ('SJ', 'Spades Jack'),
-        ('SQ', 'Spades Queen'),
-        ('SK', 'Spades King'),
-        ('SA', 'Spades Ace'),
-        # Hearts
-        ('H3', 'Hearts 3'),
-        ('H4', 'Hearts 4'),
-        ('H5', 'Hearts 5'),
-        ('H6', 'Hearts 6'),
-        ('H7', 'Hearts 7'),
-        ('HJ', 'Hearts Jack'),
-        ('HQ', 'Hearts Queen'),
-        ('HK', 'Hearts King'),
-        ('HA', 'Hearts Ace'),
-        # Clubs
-        ('C3', 'Clubs 3'),
-        ('C4', 'Clubs 4'),
-        ('C5', 'Clubs 5'),
-        ('C6', 'Clubs 6'),
-        ('C7', 'Clubs 7'),
-        ('CJ', 'Clubs Jack'),
-        ('CQ', 'Clubs Queen'),
-        ('CK', 'Clubs King'),
-        ('CA', 'Clubs Ace'),
-        # Diamonds
-        ('D3', 'Diamonds 3'),
-        ('D4', 'Diamonds 4'),
-        ('D5', 'Diamonds 5'),
-        ('D6', 'Diamonds 6'),
-        ('D7', 'Diamonds 7'),
-        ('DJ', 'Diamonds Jack'),
-        ('DQ', 'Diamonds Queen'),
-        ('DK', 'Diamonds King'),
-        ('DA', 'Diamonds Ace'),
-    ]
+    # Card association (see cards.py for the card registry)
+    CARD_CHOICES = CARD_CHOICES
     
     card = models.CharField(
         max_length=3,
@@ -514,63 +625,14 @@ class Question(models.Model):
     
     def get_card_info(self):
         """Return card information as a dictionary"""
-        if not self.card:
-            return None
-        
-        # Card data mapping
-        card_data = {
-            # Spades
-            'S3': {'suit': 'Spades', 'value': '3', 'pointValue': 0, 'symbol': '♠'},
-            'S4': {'suit': 'Spades', 'value': '4', 'pointValue': 0, 'symbol': '♠'},
-            'S5': {'suit': 'Spades', 'value': '5', 'pointValue': 0, 'symbol': '♠'},
-            'S6': {'suit': 'Spades', 'value': '6', 'pointValue': 0, 'symbol': '♠'},
-            'S7': {'suit': 'Spades', 'value': '7', 'pointValue': 10, 'symbol': '♠'},
-            'SJ': {'suit': 'Spades', 'value': 'J', 'pointValue': 3, 'symbol': '♠'},
-            'SQ': {'suit': 'Spades', 'value': 'Q', 'pointValue': 2, 'symbol': '♠'},
-            'SK': {'suit': 'Spades', 'value': 'K', 'pointValue': 4, 'symbol': '♠'},
-            'SA': {'suit': 'Spades', 'value': 'A', 'pointValue': 11, 'symbol': '♠'},
-            # Hearts
-            'H3': {'suit': 'Hearts', 'value': '3', 'pointValue': 0, 'symbol': '♥'},
-            'H4': {'suit': 'Hearts', 'value': '4', 'pointValue': 0, 'symbol': '♥'},
-            'H5': {'suit': 'Hearts', 'value': '5', 'pointValue': 0, 'symbol': '♥'},
-            'H6': {'suit': 'Hearts', 'value': '6', 'pointValue': 0, 'symbol': '♥'},
-            'H7': {'suit': 'Hearts', 'value': '7', 'pointValue': 10, 'symbol': '♥'},
-            'HJ': {'suit': 'Hearts', 'value': 'J', 'pointValue': 3, 'symbol': '♥'},
-            'HQ': {'suit': 'Hearts', 'value': 'Q', 'pointValue': 2, 'symbol': '♥'},
-            'HK': {'suit': 'Hearts', 'value': 'K', 'pointValue': 4, 'symbol': '♥'},
-            'HA': {'suit': 'Hearts', 'value': 'A', 'pointValue': 11, 'symbol': '♥'},
-            # Clubs
-            'C3': {'suit': 'Clubs', 'value': '3', 'pointValue': 0, 'symbol': '♣'},
-            'C4': {'suit': 'Clubs', 'value': '4', 'pointValue': 0, 'symbol': '♣'},
-            'C5': {'suit': 'Clubs', 'value': '5', 'pointValue': 0, 'symbol': '♣'},
-            'C6': {'suit': 'Clubs', 'value': '6', 'pointValue': 0, 'symbol': '♣'},
-            'C7': {'suit': 'Clubs', 'value': '7', 'pointValue': 10, 'symbol': '♣'},
-            'CJ': {'suit': 'Clubs', 'value': 'J', 'pointValue': 3, 'symbol': '♣'},
-            'CQ': {'suit': 'Clubs', 'value': 'Q', 'pointValue': 2, 'symbol': '♣'},
-            'CK': {'suit': 'Clubs', 'value': 'K', 'pointValue': 4, 'symbol': '♣'},
-            'CA': {'suit': 'Clubs', 'value': 'A', 'pointValue': 11, 'symbol': '♣'},
-            # Diamonds
-            'D3': {'suit': 'Diamonds', 'value': '3', 'pointValue': 0, 'symbol': '♦'},
-            'D4': {'suit': 'Diamonds', 'value': '4', 'pointValue': 0, 'symbol': '♦'},
-            'D5': {'suit': 'Diamonds', 'value': '5', 'pointValue': 0, 'symbol': '♦'},
-            'D6': {'suit': 'Diamonds', 'value': '6', 'pointValue': 0, 'symbol': '♦'},
-            'D7': {'suit': 'Diamonds', 'value': '7', 'pointValue': 10, 'symbol': '♦'},
-            'DJ': {'suit': 'Diamonds', 'value': 'J', 'pointValue': 3, 'symbol': '♦'},
-            'DQ': {'suit': 'Diamonds', 'value': 'Q', 'pointValue': 2, 'symbol': '♦'},
-            'DK': {'suit': 'Diamonds', 'value': 'K', 'pointValue': 4, 'symbol': '♦'},
-            'DA': {'suit': 'Diamonds', 'value': 'A', 'pointValue': 11, 'symbol': '♦'},
-        }
-        
-        card_info = card_data.get(self.card, {})
-        card_info['id'] = self.card
-        return card_info
+        return get_card_info(self.card)
     
     def get_card_display(self):
         """Return a formatted string for card display"""
-        card_info = self.get_card_info()
-        if not card_info:
+        card = CARD_REGISTRY.get(self.card) if self.card else None
+        if card is None:
             return "No card"
-        return f"{card_info['symbol']} {card_info['value']} ({card_info['suit']})"
+        return card.display
     
     def __str__(self):
         return self.question_text[:100] + "..." if len(self.question_text) > 100 else self.question_text
@@ -578,6 +640,11 @@ class Question(models.Model):
     class Meta:
         verbose_name = 'Question'
         verbose_name_plural = 'Questions'
+        indexes = [
+            models.Index(fields=['card', 'language']),
+            models.Index(fields=['language', 'difficulty']),
+            models.Index(fields=['question_type']),
+        ]
 
 
 class QuestionPackage(models.Model):
@@ -785,6 +852,8 @@ class Game(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(blank=True, null=True)
+    # Last change to the game or its participants, responses and result (see mark_changed)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def save(self, *args, **kwargs):
         """Auto-calculate team count based on participants"""
@@ -794,6 +863,16 @@ class Game(models.Model):
             self.team_count = 2
         super().save(*args, **kwargs)
     
+    def mark_changed(self):
+        """
+        Bump updated_at after writing the game's participants, responses or
+        result directly, so incremental history exports pick the game up again
+        """
+        from django.utils import timezone
+
+        self.updated_at = timezone.now()
+        Game.objects.filter(pk=self.pk).update(updated_at=self.updated_at)
+    
     @property
     def players_per_team(self):
         """Calculate players per team"""
@@ -807,6 +886,11 @@ class Game(models.Model):
     class Meta:
         verbose_name = 'Game'
         verbose_name_plural = 'Games'
+        indexes = [
+            models.Index(fields=['completed_at'], name='game_completed_at_idx'),
+            # Watermark for incremental history exports (see exports.py)
+            models.Index(fields=['updated_at'], name='game_updated_at_idx'),
+        ]
 
 
 class GameParticipant(models.Model):
@@ -827,7 +911,7 @@ class GameParticipant(models.Model):
     # If player lost, they get a card and must answer question
     lost_card = models.CharField(
         max_length=3,
-        choices=Question.CARD_CHOICES,
+        choices=CARD_CHOICES,
         blank=True,
         null=True,
         help_text="Card assigned to losing player"
@@ -846,6 +930,9 @@ class GameParticipant(models.Model):
         verbose_name = 'Game Participant'
         verbose_name_plural = 'Game Participants'
         unique_together = ['game', 'player']
+        indexes = [
+            models.Index(fields=['joined_at'], name='participant_joined_at_idx'),
+        ]
 
 
 class GameResult(models.Model):
@@ -1011,6 +1098,19 @@ class Subtopic(models.Model):
         unique_together = ['topic', 'name']
 
 
+class Tag(models.Model):
+    """Normalized game content tag (see tags.py)"""
+    name = models.CharField(max_length=50, unique=True, help_text="Lowercase tag name")
+    
+    def __str__(self):
+        return self.name
+    
+    class Meta:
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        ordering = ['name']
+
+
 class GameContent(models.Model):
     """Game Content model for managing educational content with manual user input"""
     
@@ -1131,6 +1231,8 @@ class GameContent(models.Model):
         null=True,
         help_text="Comma-separated tags for categorization (e.g., 'history, rwanda, culture')"
     )
+    # Normalized copy of `tags` for indexed tag filters and the tag cloud, kept in sync by signals.py
+    tag_set = models.ManyToManyField(Tag, blank=True, editable=False, related_name='contents')
     
     # Metadata fields
     created_by = models.ForeignKey(
@@ -1245,14 +1347,14 @@ class GameContent(models.Model):
         return []
     
     def increment_view_count(self):
-        """Increment view count"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """Increment view count in the database (the API buffers views instead, see counters.py)"""
+        GameContent.objects.filter(pk=self.pk).update(view_count=models.F('view_count') + 1)
+        self.refresh_from_db(fields=['view_count'])
     
     def increment_usage_count(self):
-        """Increment usage count"""
-        self.usage_count += 1
-        self.save(update_fields=['usage_count'])
+        """Increment usage count in the database (the API buffers usage instead, see counters.py)"""
+        GameContent.objects.filter(pk=self.pk).update(usage_count=models.F('usage_count') + 1)
+        self.refresh_from_db(fields=['usage_count'])
     
     class Meta:
         verbose_name = 'Game Content'
@@ -1264,4 +1366,36 @@ class GameContent(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['content_type']),
             models.Index(fields=['created_at']),
+            # Newest-first keyset pages of the content listing (see views.get_game_content_api)
+            models.Index(fields=['status', '-created_at', '-id'], name='content_listing_idx'),
+        ]
+
+
+class SearchIndexEntry(models.Model):
+    """
+    One term of a searchable game content or question document
+    Maintained by search.py (through signals.py) so text search looks up
+    indexed terms instead of scanning every row with icontains.
+    """
+    KIND_CHOICES = [
+        ('content', 'Game Content'),
+        ('question', 'Question'),
+    ]
+    
+    term = models.CharField(max_length=64)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    language = models.CharField(max_length=20)
+    field = models.CharField(max_length=20, help_text="Document field the term occurs in")
+    weight = models.PositiveIntegerField(default=1, help_text="Occurrences times the field weight")
+    
+    def __str__(self):
+        return f"{self.term} → {self.kind} {self.object_id} ({self.field})"
+    
+    class Meta:
+        verbose_name = 'Search Index Entry'
+        verbose_name_plural = 'Search Index Entries'
+        indexes = [
+            models.Index(fields=['term', 'language', 'kind', 'object_id'], name='search_term_idx'),
+            models.Index(fields=['kind', 'object_id'], name='search_document_idx'),
         ]
@@ -0,0 +1,289 @@
+"""
+Bulk player import for school and organisation onboarding
+
+Rows are streamed from CSV (with a header line) or JSONL and handled in
+chunks of ``batch_size``. For each chunk the rows are validated with the
+registration rules (required fields, age group, gender, province/district,
+unique username and email), the passwords of the valid rows are hashed in a
+process pool (PBKDF2 holds a CPU for its whole work factor, so processes
+scale where threads cannot), and the players are inserted with one
+``bulk_create``. Invalid rows are reported with their row number and do not
+stop the import.
+
+Bulk-inserted players fire no ``post_save`` signals; none are needed, since
+new players have no ``LeaderboardEntry`` and no cached tokens.
+"""
+import csv
+import io
+import json
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from .hashers import init_hash_worker
+from .locations import PROVINCE_DISTRICTS, is_valid_district
+from .models import Player
+
+
+FORMATS = ('csv', 'jsonl')
+
+# Columns read from each row; anything else is ignored
+IMPORT_FIELDS = (
+    'player_name', 'username', 'email', 'phone', 'password',
+    'age_group', 'gender', 'province', 'district', 'education_level',
+)
+REQUIRED_FIELDS = ('player_name', 'username', 'password')
+
+CHOICE_FIELDS = {
+    'age_group': {value for value, _ in Player.AGE_GROUP_CHOICES},
+    'gender': {value for value, _ in Player.GENDER_CHOICES},
+    'education_level': {value for value, _ in Player.EDUCATION_LEVEL_CHOICES},
+}
+
+MAX_LENGTHS = {
+    name: Player._meta.get_field(name).max_length
+    for name in IMPORT_FIELDS if name != 'password'
+}
+
+RowError = namedtuple('RowError', 'row username errors')
+
+
+class ImportResult:
+    """Counters and per-row errors of one import run"""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    def add_error(self, row, username, errors):
+        self.errors.append(RowError(row, username or '', errors))
+
+
+def import_workers():
+    return getattr(settings, 'PLAYER_IMPORT_WORKERS', 2)
+
+
+def admin_upload_limits():
+    """Return (max rows, max bytes) of a file imported through the admin upload"""
+    return (
+        getattr(settings, 'PLAYER_IMPORT_ADMIN_MAX_ROWS', 50),
+        getattr(settings, 'PLAYER_IMPORT_ADMIN_MAX_BYTES', 256 * 1024),
+    )
+
+
+def detect_format(filename):
+    """Guess the input format from a file name; defaults to CSV"""
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (row number, dict or error message) for each data row of a text stream
+    Row numbers are line numbers, so they match what the uploader sees in an editor.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f'Invalid JSON: {exc}'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, 'Each line must be a JSON object'
+            continue
+        yield line_number, record
+
+
+def clean_row(record):
+    """Return (values, errors) for one input record"""
+    values = {}
+    for name in IMPORT_FIELDS:
+        value = record.get(name)
+        value = '' if value is None else str(value).strip()
+        if value:
+            values[name] = value
+
+    errors = []
+    for name in REQUIRED_FIELDS:
+        if name not in values:
+            errors.append(f'{name} is required')
+    for name, max_length in MAX_LENGTHS.items():
+        if len(values.get(name, '')) > max_length:
+            errors.append(f'{name} must be at most {max_length} characters')
+    if len(values.get('password', 'x' * 6)) < 6:
+        errors.append('password must be at least 6 characters')
+    if 'email' in values:
+        try:
+            validate_email(values['email'])
+        except ValidationError:
+            errors.append('email is not a valid email address')
+    for name, choices in CHOICE_FIELDS.items():
+        if name in values and values[name] not in choices:
+            errors.append(f'Invalid {name}. Valid options: {", ".join(sorted(choices))}')
+
+    province, district = values.get('province'), values.get('district')
+    if province and province not in PROVINCE_DISTRICTS:
+        errors.append(f'Invalid province. Valid options: {", ".join(PROVINCE_DISTRICTS)}')
+    elif province and district and not is_valid_district(province, district):
+        errors.append(f"District '{district}' is not valid for '{province}' province.")
+    elif district and not province:
+        errors.append('province is required when district is given')
+    return values, errors
+
+
+class PlayerImporter:
+    """
+    Import players from row streams
+
+    Use as a context manager so the hashing pool is shut down afterwards.
+    ``workers=0`` hashes in the calling process; web requests use that, since
+    the pool's processes are meant for the import_players command.
+    """
+
+    def __init__(self, organization=None, batch_size=1000, workers=None):
+        self.organization = organization
+        self.batch_size = batch_size
+        self.workers = import_workers() if workers is None else workers
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def hash_passwords(self, passwords):
+        if self.workers <= 1 or len(passwords) < 2:
+            return [make_password(password) for password in passwords]
+        if self._pool is None:
+            # Spawned, not forked: forking a process that runs threads can deadlock on their locks
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_hash_worker,
+            )
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._pool.map(make_password, passwords, chunksize=chunksize))
+
+    def run(self, rows):
+        """Import (row number, record) pairs as produced by read_rows; returns an ImportResult"""
+        result = ImportResult()
+        chunk = []
+        for row, record in rows:
+            result.rows += 1
+            chunk.append((row, record))
+            if len(chunk) >= self.batch_size:
+                self._import_chunk(chunk, result)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, result)
+        result.errors.sort(key=lambda error: error.row)
+        return result
+
+    def _import_chunk(self, chunk, result):
+        candidates = []
+        seen_usernames, seen_emails = set(), set()
+        for row, record in chunk:
+            if isinstance(record, str):
+                result.add_error(row, '', [record])
+                continue
+            values, errors = clean_row(record)
+            username, email = values.get('username'), values.get('email')
+            if username in seen_usernames:
+                errors.append('Duplicate username in this file')
+            if email and email in seen_emails:
+                errors.append('Duplicate email in this file')
+            if errors:
+                result.add_error(row, username, errors)
+                continue
+            seen_usernames.add(username)
+            if email:
+                seen_emails.add(email)
+            candidates.append((row, values))
+
+        # One query per chunk for rows that clash with existing players
+        taken_usernames, taken_emails = set(), set()
+        lookup = Q(username__in=seen_usernames)
+        if seen_emails:
+            lookup |= Q(email__in=seen_emails)
+        for username, email in Player.objects.filter(lookup).values_list('username', 'email'):
+            taken_usernames.add(username)
+            if email:
+                taken_emails.add(email)
+
+        valid = []
+        for row, values in candidates:
+            errors = []
+            if values['username'] in taken_usernames:
+                errors.append('Username already exists.')
+            if values.get('email') in taken_emails:
+                errors.append('Email already exists.')
+            if errors:
+                result.add_error(row, values['username'], errors)
+            else:
+                valid.append((row, values))
+        if not valid:
+            return
+
+        hashes = self.hash_passwords([values['password'] for _, values in valid])
+        players = []
+        for (row, values), encoded in zip(valid, hashes):
+            players.append(Player(**{**values, 'password': encoded}, organization=self.organization))
+
+        try:
+            with transaction.atomic():
+                Player.objects.bulk_create(players, batch_size=self.batch_size)
+            result.created += len(players)
+        except IntegrityError:
+            # Someone registered one of these names meanwhile; insert row by row to find it
+            for (row, values), player in zip(valid, players):
+                try:
+                    with transaction.atomic():
+                        player.save(force_insert=True)
+                    result.created += 1
+                except IntegrityError:
+                    result.add_error(row, values['username'], ['Username already exists.'])
+
+
+def import_players(stream, fmt='csv', **options):
+    """Import players from a text stream; returns an ImportResult"""
+    with PlayerImporter(**options) as importer:
+        return importer.run(read_rows(stream, fmt))
+
+
+def open_upload(uploaded_file):
+    """Wrap an uploaded file as a text stream (accepts UTF-8 with or without BOM)"""
+    return io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+
+
+def count_rows(uploaded_file, fmt):
+    """Count the data rows of an uploaded file, leaving it open and rewound for the import"""
+    stream = open_upload(uploaded_file)
+    try:
+        return sum(1 for _ in read_rows(stream, fmt))
+    finally:
+        stream.detach()
+        uploaded_file.seek(0)
@@ -0,0 +1,137 @@
+"""
+Per-worker cache of questions keyed by card (and optionally language)
+
+The loser question path and the card listing endpoints look up
+``Question.objects.filter(card=...)`` on every request although questions
+rarely change during a game night. This module keeps compact, immutable
+question records per ``(card, language)`` in process memory.
+
+Entries are dropped when a question is saved or deleted in this process
+(see ``signals.py``) and expire after ``QUESTION_CACHE_TTL`` seconds so
+that changes made by other workers are picked up as well.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from .cards import get_card_info
+from .models import Question
+
+
+RECORD_FIELDS = (
+    'id', 'language', 'question_text', 'question_type', 'options',
+    'correct_answer', 'explanation', 'points', 'difficulty', 'card', 'created_at',
+)
+
+
+class QuestionRecord(namedtuple('QuestionRecord', RECORD_FIELDS)):
+    """Lightweight read-only copy of a Question row"""
+    __slots__ = ()
+
+    def get_card_info(self):
+        """Return card information as a dictionary"""
+        return get_card_info(self.card)
+
+
+class CardQuestionCache:
+    """Question records grouped by card, with hit/miss counters"""
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'QUESTION_CACHE_TTL', 300)
+
+    def get(self, card, language=None):
+        """Return a tuple of records for the card, ordered by id"""
+        key = (card, language)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+
+        queryset = Question.objects.filter(card=card)
+        if language:
+            queryset = queryset.filter(language=language)
+        records = tuple(
+            QuestionRecord(*row)
+            for row in queryset.order_by('id').values_list(*RECORD_FIELDS)
+        )
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (now, records)
+        return records
+
+    def get_many(self, cards, language=None):
+        """
+        Return {card: records} for several cards, loading every missing card
+        with a single ``card__in`` query
+        """
+        now = time.monotonic()
+        result = {}
+        missing = []
+        for card in set(cards):
+            entry = self._entries.get((card, language))
+            if entry is not None and now - entry[0] < self.ttl:
+                result[card] = entry[1]
+            else:
+                missing.append(card)
+
+        if missing:
+            queryset = Question.objects.filter(card__in=missing)
+            if language:
+                queryset = queryset.filter(language=language)
+            loaded = {card: [] for card in missing}
+            for row in queryset.order_by('id').values_list(*RECORD_FIELDS):
+                record = QuestionRecord(*row)
+                loaded[record.card].append(record)
+            for card, records in loaded.items():
+                result[card] = tuple(records)
+
+        with self._lock:
+            self.hits += len(result) - len(missing)
+            self.misses += len(missing)
+            for card in missing:
+                self._entries[(card, language)] = (now, result[card])
+        return result
+
+    def invalidate(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+            }
+
+
+card_cache = CardQuestionCache()
+
+
+def questions_for_card(card, language=None):
+    """Return cached question records for a card using the shared per-worker cache"""
+    return card_cache.get(card, language)
+
+
+def questions_for_cards(cards, language=None):
+    """Return {card: records} for several cards using the shared per-worker cache"""
+    return card_cache.get_many(cards, language)
@@ -0,0 +1,117 @@
+"""
+Random question selection without ``ORDER BY RANDOM()``
+
+Each worker keeps a pool of question ids per filter combination
+(language, card, difficulty). Picking a question is a ``random.choice``
+over the pool followed by a primary-key lookup, so the cost does not
+grow with the size of the question table.
+
+Pools are dropped when a question is saved or deleted in this process
+(see ``signals.py``) and are rebuilt after ``QUESTION_POOL_TTL`` seconds
+so that changes made by other workers are picked up as well.
+"""
+import random
+import threading
+import time
+from array import array
+
+from django.conf import settings
+
+from .models import Question
+
+
+class QuestionSampler:
+    """Per-worker pools of question ids used for random selection"""
+
+    # Number of attempts before giving up on ids deleted by other workers
+    max_attempts = 3
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'QUESTION_POOL_TTL', 300)
+
+    @staticmethod
+    def _filters(language=None, card=None, difficulty=None):
+        filters = {}
+        if language:
+            filters['language'] = language
+        if card:
+            filters['card'] = card
+        if difficulty:
+            filters['difficulty'] = difficulty
+        return filters
+
+    def get_pool(self, **filters):
+        """Return the cached id pool for the given filters, loading it if needed"""
+        key = tuple(sorted(filters.items()))
+        now = time.monotonic()
+        pool = self._pools.get(key)
+        if pool is not None and now - pool[0] < self.ttl:
+            return pool[1]
+
+        ids = array('q', Question.objects.filter(**filters).order_by('id').values_list('id', flat=True).iterator())
+        with self._lock:
+            self._pools[key] = (now, ids)
+        return ids
+
+    def random_question(self, language=None, card=None, difficulty=None):
+        """
+        Return a random question matching the filters, or None if there is none
+        """
+        filters = self._filters(language, card, difficulty)
+
+        for _ in range(self.max_attempts):
+            ids = self.get_pool(**filters)
+            if not ids:
+                return None
+
+            question = Question.objects.filter(pk=random.choice(ids)).first()
+            if question is not None:
+                return question
+
+            # The id was deleted by another worker, reload the pool and retry
+            self.invalidate()
+
+        return None
+
+    def random_questions(self, count, language=None, card=None, difficulty=None):
+        """
+        Return `count` random questions (repeats allowed) fetched with a single query
+
+        Ids deleted by other workers are skipped, so fewer questions may be returned.
+        """
+        if count <= 0:
+            return []
+
+        ids = self.get_pool(**self._filters(language, card, difficulty))
+        if not ids:
+            return []
+
+        picks = [random.choice(ids) for _ in range(count)]
+        found = Question.objects.in_bulk(set(picks))
+        return [found[pk] for pk in picks if pk in found]
+
+    def invalidate(self):
+        """Drop all cached pools"""
+        with self._lock:
+            self._pools.clear()
+
+
+sampler = QuestionSampler()
+
+
+def random_question(language=None, card=None, difficulty=None):
+    """Return a random question using the shared per-worker sampler"""
+    return sampler.random_question(language=language, card=card, difficulty=difficulty)
+
+
+def random_questions(count, language=None, card=None, difficulty=None):
+    """Return `count` random questions with one query using the shared per-worker sampler"""
+    return sampler.random_questions(count, language=language, card=card, difficulty=difficulty)
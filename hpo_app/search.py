@@ -0,0 +1,222 @@
+"""
+Text search over game content and questions
+
+``topic__icontains`` filters are leading-wildcard scans that no B-tree index
+can serve, and the content text (``info``, the additional subtopics) and
+question text could not be searched at all. This module keeps a small
+inverted index instead: every document is tokenized into ``SearchIndexEntry``
+rows (term, document, language, field, weight), which signals.py rewrites
+whenever a GameContent or Question is saved or deleted. Rows written with
+``bulk_create``/``update()`` bypass the signals; run
+``manage.py rebuild_search_index`` after such loads.
+
+A search looks up the query terms on the (term, language, ...) index. The
+last term also matches as a prefix, using a range lookup the same index can
+serve on every backend. Documents must contain every term and are ranked by
+the summed weights of the matching terms. Weights favour titles and topics
+over body text.
+"""
+import re
+import unicodedata
+from collections import Counter
+
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+
+from .models import GameContent, Question, SearchIndexEntry
+
+
+KINDS = ('content', 'question')
+
+CONTENT_FIELD_WEIGHTS = {
+    'title': 4,
+    'topic': 4,
+    'subtopic': 3,
+    'tags': 3,
+    'subtopics': 2,
+    'info': 1,
+}
+QUESTION_FIELD_WEIGHTS = {
+    'question_text': 2,
+}
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+MIN_PREFIX_LENGTH = 3
+MAX_QUERY_TERMS = 8
+
+STOPWORDS = frozenset(
+    'an and are as at be by for from has in is it its of on or that the to was were will with '
+    'au aux ce de des du en est et la le les un une'.split()
+)
+
+_TOKEN = re.compile(r'\w+')
+# Sorts after every term that starts with the prefix it is appended to
+_PREFIX_END = '\uffff'
+
+
+def normalize(text):
+    """Case-fold and strip accents, so 'Économie' and 'economie' index alike"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """Return the index terms of a text, in order, repeats included"""
+    if not text:
+        return []
+    return [
+        token for token in _TOKEN.findall(normalize(text))
+        if MIN_TERM_LENGTH <= len(token) <= MAX_TERM_LENGTH and token not in STOPWORDS
+    ]
+
+
+def query_terms(text):
+    """Unique terms of a search query, at most MAX_QUERY_TERMS"""
+    return list(dict.fromkeys(tokenize(text)))[:MAX_QUERY_TERMS]
+
+
+def content_fields(content):
+    """Searchable text of a game content document by field"""
+    subtopics = []
+    for item in content.subtopics_data or []:
+        if isinstance(item, dict):
+            subtopics.append(str(item.get('subtopic', '')))
+            subtopics.append(str(item.get('info', '')))
+    return {
+        'title': content.title,
+        'topic': content.topic,
+        'subtopic': content.subtopic,
+        'tags': content.tags,
+        'subtopics': ' '.join(subtopics),
+        'info': content.info,
+    }
+
+
+def question_fields(question):
+    return {'question_text': question.question_text}
+
+
+def build_entries(kind, document):
+    """Return unsaved index entries for one document"""
+    if kind == 'content':
+        fields, weights = content_fields(document), CONTENT_FIELD_WEIGHTS
+    else:
+        fields, weights = question_fields(document), QUESTION_FIELD_WEIGHTS
+    entries = []
+    for field, text in fields.items():
+        for term, occurrences in Counter(tokenize(text)).items():
+            entries.append(SearchIndexEntry(
+                term=term, kind=kind, object_id=document.pk, language=document.language or '',
+                field=field, weight=occurrences * weights[field],
+            ))
+    return entries
+
+
+def index_documents(kind, documents, batch_size=1000):
+    """Replace the index entries of some documents; returns the number of entries written"""
+    documents = list(documents)
+    if not documents:
+        return 0
+    SearchIndexEntry.objects.filter(kind=kind, object_id__in=[document.pk for document in documents]).delete()
+    entries = [entry for document in documents for entry in build_entries(kind, document)]
+    SearchIndexEntry.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
+
+
+def remove_document(kind, pk):
+    SearchIndexEntry.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def rebuild(batch_size=500):
+    """Re-index every game content and question; returns the number of entries"""
+    SearchIndexEntry.objects.all().delete()
+    written = 0
+    for kind, queryset in (('content', GameContent.objects.all()), ('question', Question.objects.all())):
+        batch = []
+        for document in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                written += _insert(kind, batch)
+                batch = []
+        written += _insert(kind, batch)
+    return written
+
+
+def _insert(kind, documents):
+    entries = [entry for document in documents for entry in build_entries(kind, document)]
+    SearchIndexEntry.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+def _term_lookup(term, prefix):
+    if prefix and len(term) >= MIN_PREFIX_LENGTH:
+        return Q(term__gte=term, term__lt=term + _PREFIX_END)
+    return Q(term=term)
+
+
+def ranked(terms, kinds=KINDS, language=None, field=None, published_only=True):
+    """
+    Return a queryset of {'kind', 'object_id', 'score'} rows for documents
+    containing every term (the last one as a prefix), best match first
+    """
+    lookups = [_term_lookup(term, index == len(terms) - 1) for index, term in enumerate(terms)]
+    matches = Q()
+    for lookup in lookups:
+        matches |= lookup
+    entries = SearchIndexEntry.objects.filter(matches, kind__in=kinds)
+    if language:
+        entries = entries.filter(language=language)
+    if field:
+        entries = entries.filter(field=field)
+    if published_only and 'content' in kinds:
+        published = GameContent.objects.filter(status='published').values('pk')
+        entries = entries.filter(~Q(kind='content') | Q(object_id__in=published))
+
+    # Number the query term each entry matched, so documents can be required to match all of them
+    matched_term = Case(
+        *[When(lookup, then=Value(index)) for index, lookup in enumerate(lookups)],
+        output_field=IntegerField(),
+    )
+    return (
+        entries.annotate(matched_term=matched_term)
+        .values('kind', 'object_id')
+        .annotate(score=Sum('weight'), matched=Count('matched_term', distinct=True))
+        .filter(matched=len(terms))
+        .order_by('-score', 'kind', 'object_id')
+    )
+
+
+def matching_ids(kind, text, field=None, language=None):
+    """
+    Ids of documents of one kind whose field matches every term of `text`,
+    as a subquery for ``pk__in`` filters; None when the text has no terms
+    """
+    terms = query_terms(text)
+    if not terms:
+        return None
+    return ranked(terms, (kind,), language, field, published_only=False).values('object_id')
+
+
+def search(text, kinds=KINDS, language=None, limit=20, offset=0):
+    """
+    Run a ranked search; returns (total, [(kind, document, score), ...]) for
+    one page, loading the page's documents with one query per kind
+    """
+    terms = query_terms(text)
+    if not terms:
+        return 0, []
+    rows = ranked(terms, kinds, language)
+    total = rows.count()
+    page = list(rows[offset:offset + limit])
+
+    documents = {}
+    for kind, model in (('content', GameContent), ('question', Question)):
+        ids = [row['object_id'] for row in page if row['kind'] == kind]
+        if ids:
+            documents[kind] = model.objects.in_bulk(ids)
+    results = [
+        (row['kind'], documents[row['kind']][row['object_id']], row['score'])
+        for row in page
+        if row['object_id'] in documents.get(row['kind'], {})
+    ]
+    return total, results
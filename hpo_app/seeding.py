@@ -0,0 +1,322 @@
+"""
+Deterministic bulk data generation for scale testing
+
+``ScaleSeeder`` creates players, questions (per card and language), game
+content and completed historical games with participants, responses and
+results, all with ``bulk_create`` in batches. The same seed, counts and end
+date always produce the same rows, so production-sized workloads can be
+reproduced locally (``manage.py seed_scale``).
+
+Seeded players share one precomputed password hash (``SEED_PASSWORD``);
+hashing a million distinct passwords would dominate the run. Player game
+statistics are recomputed from the seeded participations with one aggregate
+UPDATE, after which the leaderboard table and the daily rollups are rebuilt.
+"""
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import leaderboard
+from .cards import CARD_IDS
+from .locations import PROVINCE_DISTRICTS
+from .models import (
+    Game, GameContent, GameParticipant, GameResponse, GameResult, Player, Question,
+)
+
+
+SEED_PASSWORD = 'seed-password'
+
+# Participant counts of seeded games, weighted like real traffic
+PARTICIPANT_WEIGHTS = {2: 5, 4: 4, 6: 1}
+
+LOSER_ANSWER_RATE = 0.8
+LOSER_CORRECT_RATE = 0.6
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """
+    Let bulk_create keep the timestamps set on the instances
+    ``auto_now``/``auto_now_add`` would otherwise overwrite them with the current time.
+    """
+    previous = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, previous):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _field(model, name):
+    return model._meta.get_field(name)
+
+
+def _choices(choices):
+    return [value for value, _ in choices]
+
+
+class ScaleSeeder:
+    def __init__(self, seed=0, batch_size=5000, prefix='seed', end_date=None, progress=None):
+        self.seed = seed
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.end_date = end_date or timezone.localdate()
+        self.progress = progress or (lambda message: None)
+
+    def rng(self, stream):
+        """Independent generator per dataset, so changing one count leaves the others unchanged"""
+        return random.Random(f'{self.seed}:{stream}')
+
+    def end_of_day(self):
+        return datetime.combine(self.end_date + timedelta(days=1), time.min, tzinfo=timezone.get_current_timezone())
+
+    def _bulk_create(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def players(self, count):
+        rng = self.rng('players')
+        password = make_password(SEED_PASSWORD)
+        locations = [(province, district) for province, districts in PROVINCE_DISTRICTS.items() for district in districts]
+        age_groups = _choices(Player.AGE_GROUP_CHOICES)
+        genders = _choices(Player.GENDER_CHOICES)
+
+        created = 0
+        while created < count:
+            batch = []
+            for i in range(created, min(created + self.batch_size, count)):
+                province, district = rng.choice(locations)
+                batch.append(Player(
+                    username=f'{self.prefix}_{i}',
+                    player_name=f'Seed Player {i}',
+                    email=f'{self.prefix}_{i}@example.com',
+                    password=password,
+                    phone=f'078{rng.randrange(10 ** 7):07d}',
+                    age_group=rng.choice(age_groups),
+                    gender=rng.choice(genders),
+                    province=province,
+                    district=district,
+                ))
+            self._bulk_create(Player, batch)
+            created += len(batch)
+            self.progress(f'players: {created}/{count}')
+        return created
+
+    def questions(self, per_card):
+        """Create `per_card` questions for every card and question language"""
+        rng = self.rng('questions')
+        languages = _choices(Question.LANGUAGE_CHOICES)
+        difficulties = ['easy', 'medium', 'hard']
+        batch = []
+        created = 0
+        for card in CARD_IDS:
+            for language in languages:
+                for i in range(per_card):
+                    if rng.random() < 0.3:
+                        question_type, options = 'true_false', ['True', 'False']
+                    else:
+                        question_type, options = 'multiple_choice', [f'Option {n}' for n in 'ABCD']
+                    batch.append(Question(
+                        question_text=f'[{self.prefix}] {card} {language} question {i}',
+                        language=language,
+                        question_type=question_type,
+                        card=card,
+                        options=options,
+                        correct_answer=rng.choice(options),
+                        explanation=f'[{self.prefix}] Fact {i} about card {card} in {language}.',
+                        difficulty=rng.choice(difficulties),
+                    ))
+                    if len(batch) >= self.batch_size:
+                        self._bulk_create(Question, batch)
+                        created += len(batch)
+                        batch = []
+        if batch:
+            self._bulk_create(Question, batch)
+            created += len(batch)
+        self.progress(f'questions: {created}')
+        return created
+
+    def game_content(self, count):
+        rng = self.rng('content')
+        languages = _choices(GameContent.LANGUAGE_CHOICES)
+        age_groups = _choices(GameContent.AGE_GROUP_CHOICES)
+        content_types = _choices(GameContent.CONTENT_TYPE_CHOICES)
+        statuses = ['published'] * 6 + ['draft', 'review', 'approved', 'archived']
+        published_at = self.end_of_day()
+        topics = ['History', 'Science', 'Culture', 'Health', 'Geography', 'Technology', 'Sports', 'Arts']
+
+        created = 0
+        while created < count:
+            batch = []
+            for i in range(created, min(created + self.batch_size, count)):
+                topic = rng.choice(topics)
+                status = rng.choice(statuses)
+                batch.append(GameContent(
+                    title=f'[{self.prefix}] {topic} {i}',
+                    language=rng.choice(languages),
+                    age_group=rng.choice(age_groups),
+                    topic=topic,
+                    subtopic=f'{topic} part {i % 20}',
+                    subtopics_data=[
+                        {'subtopic': f'{topic} detail {n}', 'info': f'Detail {n} of content {i}.'}
+                        for n in range(rng.randrange(3))
+                    ],
+                    info=f'Seeded {topic.lower()} content {i}. ' * rng.randint(1, 5),
+                    content_type=rng.choice(content_types),
+                    status=status,
+                    published_at=published_at if status == 'published' else None,
+                    tags=', '.join(rng.sample(['rwanda', 'africa', 'youth', 'health', 'science', 'culture'], 2)),
+                    card_association=rng.choice(CARD_IDS),
+                ))
+            self._bulk_create(GameContent, batch)
+            created += len(batch)
+            self.progress(f'game content: {created}/{count}')
+        return created
+
+    def games(self, count, days=90):
+        """
+        Create `count` completed games spread evenly over the `days` days up to
+        end_date, each with participants, responses and a result
+        Returns (games, participants, responses) created.
+        """
+        rng = self.rng('games')
+        player_ids = list(Player.objects.filter(username__startswith=f'{self.prefix}_').values_list('pk', flat=True))
+        if len(player_ids) < max(PARTICIPANT_WEIGHTS):
+            raise ValueError(f'Seed at least {max(PARTICIPANT_WEIGHTS)} players before games')
+        questions = {}
+        for pk, card, explanation in Question.objects.filter(card__in=CARD_IDS).values_list('pk', 'card', 'explanation'):
+            questions.setdefault(card, []).append((pk, explanation))
+        if not questions:
+            raise ValueError('Seed questions before games')
+        cards = sorted(questions)
+        sizes, weights = list(PARTICIPANT_WEIGHTS), list(PARTICIPANT_WEIGHTS.values())
+
+        end = self.end_of_day()
+        span = timedelta(days=days).total_seconds()
+        totals = [0, 0, 0]
+        timestamps = (
+            _field(Game, 'created_at'), _field(Game, 'updated_at'), _field(GameParticipant, 'joined_at'),
+            _field(GameResponse, 'created_at'), _field(GameResult, 'created_at'),
+        )
+        with explicit_timestamps(*timestamps):
+            while totals[0] < count:
+                size = min(self.batch_size, count - totals[0])
+                games = []
+                for i in range(totals[0], totals[0] + size):
+                    completed_at = end - timedelta(seconds=span * (count - i) / count - rng.random() * 60)
+                    participant_count = rng.choices(sizes, weights)[0]
+                    games.append(Game(
+                        participant_count=participant_count,
+                        team_count=2,
+                        status='completed',
+                        winning_team=rng.choice((1, 2)),
+                        cards_chosen=rng.sample(cards, min(participant_count // 2, len(cards))),
+                        created_at=completed_at - timedelta(minutes=rng.randint(3, 20)),
+                        completed_at=completed_at,
+                        updated_at=completed_at,
+                    ))
+                self._bulk_create(Game, games)
+
+                participants, plans = [], []
+                for game in games:
+                    for index, player_id in enumerate(rng.sample(player_ids, game.participant_count)):
+                        team = index % 2 + 1
+                        is_winner = team == game.winning_team
+                        answered = not is_winner and rng.random() < LOSER_ANSWER_RATE
+                        correct = answered and rng.random() < LOSER_CORRECT_RATE
+                        lost_card = None if is_winner else rng.choice(cards)
+                        participants.append(GameParticipant(
+                            game=game, player_id=player_id, team=team, is_winner=is_winner,
+                            marks_earned=int(is_winner) + int(correct), lost_card=lost_card,
+                            question_answered=answered, answer_correct=correct, joined_at=game.created_at,
+                        ))
+                        plans.append(rng.choice(questions[game.cards_chosen[0] if is_winner else lost_card]))
+                self._bulk_create(GameParticipant, participants)
+
+                responses, results = [], []
+                for participant, (question_id, explanation) in zip(participants, plans):
+                    game = participant.game
+                    if participant.is_winner:
+                        responses.append(GameResponse(
+                            game=game, participant=participant, response_type='fun_fact',
+                            fun_fact_text=explanation, fun_fact_card=game.cards_chosen[0],
+                            created_at=game.completed_at,
+                        ))
+                    else:
+                        responses.append(GameResponse(
+                            game=game, participant=participant, response_type='question',
+                            question_id=question_id, is_correct=participant.answer_correct,
+                            player_answer=('seeded answer' if participant.question_answered else None),
+                            created_at=game.completed_at,
+                        ))
+                marks = {}
+                for participant in participants:
+                    key = (participant.game.pk, participant.team)
+                    marks[key] = marks.get(key, 0) + participant.marks_earned
+                for game in games:
+                    results.append(GameResult(
+                        game=game, team1_marks=marks.get((game.pk, 1), 0), team2_marks=marks.get((game.pk, 2), 0),
+                        result_summary={'seeded': True, 'winning_team': game.winning_team},
+                        created_at=game.completed_at,
+                    ))
+                self._bulk_create(GameResponse, responses)
+                self._bulk_create(GameResult, results)
+
+                totals[0] += len(games)
+                totals[1] += len(participants)
+                totals[2] += len(responses)
+                self.progress(f'games: {totals[0]}/{count} ({totals[1]} participants)')
+        return tuple(totals)
+
+    def refresh_player_stats(self, days=90):
+        """
+        Recompute the seeded players' game statistics from their participations,
+        then rebuild the leaderboard and the daily rollups of the seeded period
+        Streak columns are left at zero.
+        """
+        participations = GameParticipant.objects.filter(player=OuterRef('pk')).order_by().values('player')
+
+        def aggregate(expression, default=0):
+            return Coalesce(Subquery(participations.annotate(value=expression).values('value')), default)
+
+        Player.objects.filter(username__startswith=f'{self.prefix}_').update(
+            games_played=aggregate(Count('id')),
+            games_won=aggregate(Count('id', filter=Q(is_winner=True))),
+            games_lost=aggregate(Count('id', filter=Q(is_winner=False))),
+            total_game_marks=aggregate(Sum('marks_earned')),
+            questions_answered=aggregate(Count('id', filter=Q(question_answered=True))),
+            correct_answers=aggregate(Count('id', filter=Q(answer_correct=True))),
+            last_game_played=Subquery(participations.annotate(value=Max('joined_at')).values('value')),
+        )
+        entries = leaderboard.rebuild(batch_size=self.batch_size)
+        rollups = leaderboard.rollup(self.end_date - timedelta(days=days), self.end_date)
+        self.progress(f'leaderboard entries: {entries}, daily rollups: {rollups}')
+        return entries, rollups
+
+
+def dataset_summary():
+    """Row counts and distributions computed with aggregate queries only"""
+
+    def distribution(queryset, field):
+        return {
+            row[field]: row['count']
+            for row in queryset.values(field).annotate(count=Count('id')).order_by(field)
+        }
+
+    return {
+        'players': Player.objects.count(),
+        'questions': Question.objects.count(),
+        'questions_by_language': distribution(Question.objects.all(), 'language'),
+        'cards_with_questions': Question.objects.exclude(card__isnull=True).values('card').distinct().count(),
+        'game_content_by_status': distribution(GameContent.objects.all(), 'status'),
+        'games_by_status': distribution(Game.objects.all(), 'status'),
+        'participants': GameParticipant.objects.count(),
+        'responses': GameResponse.objects.count(),
+        'players_by_province': distribution(Player.objects.all(), 'province'),
+    }
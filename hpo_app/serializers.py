@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from django.contrib.auth.hashers import make_password
+from django.db.models import Q
+from .locations import is_valid_district
 from .models import Player
 
 
@@ -16,7 +19,9 @@ class PlayerRegistrationSerializer(serializers.ModelSerializer):
         ]
         extra_kwargs = {
             'player_name': {'required': True},
-            'username': {'required': True},
+            # Uniqueness is checked in validate() together with email; the
+            # database constraint still guards against concurrent sign-ups
+            'username': {'required': True, 'validators': []},
             'phone': {'required': True},
             'email': {'required': False},
             'age_group': {'required': False},
@@ -40,33 +45,30 @@ class PlayerRegistrationSerializer(serializers.ModelSerializer):
         province = attrs.get('province')
         district = attrs.get('district')
         
-        if province and district:
-            # Province-district mapping
-            province_districts = {
-                'Kigali City': ['Gasabo', 'Kicukiro', 'Nyarugenge'],
-                'Northern Province': ['Burera', 'Gakenke', 'Gicumbi', 'Musanze', 'Rulindo'],
-                'Southern Province': ['Gisagara', 'Huye', 'Kamonyi', 'Muhanga', 'Nyamagabe', 'Nyanza', 'Nyaruguru', 'Ruhango'],
-                'Eastern Province': ['Bugesera', 'Gatsibo', 'Kayonza', 'Kirehe', 'Ngoma', 'Nyagatare', 'Rwamagana'],
-                'Western Province': ['Karongi', 'Ngororero', 'Nyabihu', 'Nyamasheke', 'Rubavu', 'Rusizi', 'Rutsiro'],
-            }
-            
-            valid_districts = province_districts.get(province, [])
-            if district not in valid_districts:
-                raise serializers.ValidationError(f"District '{district}' is not valid for '{province}' province.")
+        # Report the district and uniqueness errors together
+        errors = self.unique_identity_errors(attrs.get('username'), attrs.get('email'))
+        if province and district and not is_valid_district(province, district):
+            errors[api_settings.NON_FIELD_ERRORS_KEY] = [
+                f"District '{district}' is not valid for '{province}' province."
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
         
         return attrs
     
-    def validate_username(self, value):
-        """Validate username uniqueness"""
-        if Player.objects.filter(username=value).exists():
-            raise serializers.ValidationError("Username already exists.")
-        return value
-    
-    def validate_email(self, value):
-        """Validate email uniqueness if provided"""
-        if value and Player.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email already exists.")
-        return value
+    def unique_identity_errors(self, username, email):
+        """Return field errors for a taken username or (optional) email, with a single query"""
+        lookup = Q(username=username)
+        if email:
+            lookup |= Q(email=email)
+        
+        errors = {}
+        for existing_username, existing_email in Player.objects.filter(lookup).values_list('username', 'email'):
+            if existing_username == username:
+                errors['username'] = ["Username already exists."]
+            if email and existing_email == email:
+                errors['email'] = ["Email already exists."]
+        return errors
     
     def create(self, validated_data):
         """Create new player with hashed password"""
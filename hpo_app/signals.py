@@ -0,0 +1,93 @@
+from django.core.signals import request_finished
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .authentication import token_cache
+from .counters import content_counters
+from . import search, tags
+from .models import GameContent, LeaderboardEntry, Player, Question, QuestionPackage
+from .question_cache import card_cache
+from .question_sampling import sampler
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_question_caches(sender, **kwargs):
+    """Drop cached question pools and card records when a question changes"""
+    sampler.invalidate()
+    card_cache.invalidate()
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=GameContent)
+def index_search_document(sender, instance, raw=False, **kwargs):
+    """Re-index the text of a saved question or game content document"""
+    if not raw:
+        search.index_documents('question' if sender is Question else 'content', [instance])
+
+
+@receiver(post_save, sender=GameContent)
+def sync_content_tags(sender, instance, raw=False, **kwargs):
+    """Copy the comma-separated tags of saved game content into the Tag table"""
+    if not raw:
+        tags.sync_content(instance)
+
+
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=GameContent)
+def remove_search_document(sender, instance, **kwargs):
+    search.remove_document('question' if sender is Question else 'content', instance.pk)
+
+
+@receiver(m2m_changed, sender=QuestionPackage.questions.through)
+def touch_package_on_question_links(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Bump updated_at of packages whose question links changed, which leaves the
+    package row untouched, so the package catalog ETags change (see conditional.py)
+    """
+    if reverse:
+        # instance is a Question; collect its packages before they are unlinked
+        if action == 'pre_clear':
+            packages = list(instance.packages.values_list('pk', flat=True))
+        elif action in ('post_add', 'post_remove'):
+            packages = pk_set
+        else:
+            return
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        packages = [instance.pk]
+    else:
+        return
+    if packages:
+        QuestionPackage.objects.filter(pk__in=packages).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Player)
+def sync_leaderboard_entry(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Copy profile (and, on full saves, statistics) changes to the player's leaderboard entry"""
+    if raw or created and not instance.games_played:
+        return
+
+    if update_fields is None:
+        if instance.games_played:
+            LeaderboardEntry.sync([instance], update_fields=LeaderboardEntry.PROFILE_FIELDS + LeaderboardEntry.STATS_FIELDS)
+        else:
+            LeaderboardEntry.objects.filter(pk=instance.pk).delete()
+        return
+
+    changed = [field for field in LeaderboardEntry.PROFILE_FIELDS if field in update_fields]
+    if changed:
+        LeaderboardEntry.objects.filter(pk=instance.pk).update(
+            **{field: getattr(instance, field) for field in changed}
+        )
+
+
+@receiver([post_save, post_delete], sender=Player)
+def invalidate_player_tokens(sender, instance, **kwargs):
+    """Drop cached tokens of a changed or deleted player so the next request reloads it"""
+    token_cache.discard_player(instance.pk)
+
+
+@receiver(request_finished)
+def flush_content_counters(sender, **kwargs):
+    """Write buffered game content view/usage counts once the flush interval has passed"""
+    content_counters.flush_if_due()
@@ -0,0 +1,93 @@
+"""
+Normalized tags of game content
+
+``GameContent.tags`` stays the comma-separated text editors type. Every save
+copies it into the ``Tag`` table and the ``GameContent.tag_set`` relation
+(signals.py), whose join table is indexed on both columns. Tag filters then
+become index lookups instead of scans of the text column, and tag counts come
+from one aggregate query.
+
+Names are normalized (trimmed, lowercased, inner whitespace collapsed), so
+'Rwanda', ' rwanda ' and 'RWANDA' are the same tag.
+"""
+from django.db.models import Count
+
+from .models import GameContent, Tag
+
+
+MAX_TAG_LENGTH = Tag._meta.get_field('name').max_length
+
+MATCH_MODES = ('all', 'any')
+
+
+def normalize(name):
+    return ' '.join(name.split()).lower()[:MAX_TAG_LENGTH]
+
+
+def parse(text):
+    """Unique normalized tag names of a comma-separated string, in order"""
+    if not text:
+        return []
+    return list(dict.fromkeys(name for name in (normalize(part) for part in text.split(',')) if name))
+
+
+def get_or_create_tags(names):
+    """Return {name: Tag} for the names, creating missing tags with one insert"""
+    if not names:
+        return {}
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    return {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+
+
+def sync_content(content):
+    """Make a content's tag_set match its tags text"""
+    tags = get_or_create_tags(parse(content.tags))
+    content.tag_set.set(tags.values())
+
+
+def rebuild(batch_size=500):
+    """Re-link the tags of every game content, e.g. after bulk loads; returns the number of links"""
+    Through = GameContent.tag_set.through
+    Through.objects.all().delete()
+    contents = GameContent.objects.exclude(tags__isnull=True).exclude(tags='').order_by('pk').values_list('pk', 'tags')
+    linked = 0
+    batch = []
+    for row in contents.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            linked += _link(Through, batch)
+            batch = []
+    return linked + _link(Through, batch)
+
+
+def _link(Through, rows):
+    parsed = [(pk, parse(text)) for pk, text in rows]
+    tags = get_or_create_tags(sorted({name for _, names in parsed for name in names}))
+    links = [Through(gamecontent_id=pk, tag_id=tags[name].pk) for pk, names in parsed for name in names]
+    Through.objects.bulk_create(links, batch_size=1000)
+    return len(links)
+
+
+def filter_contents(queryset, text, mode='all'):
+    """
+    Keep game content tagged with all (or any) of the comma-separated tags
+    The matching ids come from one grouped query on the indexed join table.
+    """
+    names = parse(text)
+    if not names:
+        return queryset
+    links = GameContent.tag_set.through.objects.filter(tag__name__in=names).values('gamecontent_id')
+    if mode == 'all':
+        links = links.annotate(matched=Count('tag_id', distinct=True)).filter(matched=len(names))
+    return queryset.filter(pk__in=links.values('gamecontent_id'))
+
+
+def tag_cloud(status='published', language=None, limit=50):
+    """Return [{'name', 'count'}] of the most used tags, counted by the database"""
+    links = GameContent.tag_set.through.objects.all()
+    if status:
+        links = links.filter(gamecontent__status=status)
+    if language:
+        links = links.filter(gamecontent__language=language)
+    rows = links.values('tag__name').annotate(count=Count('id')).order_by('-count', 'tag__name')[:limit]
+    return [{'name': row['tag__name'], 'count': row['count']} for row in rows]
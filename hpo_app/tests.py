@@ -1,3 +1,1589 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+import uuid
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models import Sum
+from django.test import Client, TestCase, TransactionTestCase, modify_settings, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import exports, leaderboard
+from .authentication import PlayerPrincipal, TokenCache, player_authenticator, token_cache
+from .locations import PROVINCE_DISTRICTS
+from .login import LoginBusy, PasswordVerifier
+from .metrics import MetricsRegistry, QueryRecorder, fingerprint, registry as metrics_registry
+from .player_import import PlayerImporter, import_players, read_rows
+from .tokens import issue_token, read_token, revocation_list
+from .counters import CounterBuffer, content_counters
+from .cards import CARD_IDS, CARD_REGISTRY, get_card_info
+from .models import Game, GameContent, GameParticipant, GameResponse, GameResult, LeaderboardEntry, Player, PlayerDailyStats, Question, QuestionPackage, RevokedToken, SearchIndexEntry, Tag
+from .question_cache import CardQuestionCache, card_cache
+from .question_sampling import QuestionSampler, sampler
+from .views import filter_questions, finalize_game_if_complete
+
+
+def make_question(**kwargs):
+    defaults = {
+        'question_text': 'What is the capital of Rwanda?',
+        'language': 'english',
+        'card': 'S3',
+        'options': ['Kigali', 'Huye'],
+        'correct_answer': 'Kigali',
+        'explanation': 'Kigali is the capital of Rwanda.',
+    }
+    defaults.update(kwargs)
+    return Question.objects.create(**defaults)
+
+
+def make_player(username, **kwargs):
+    defaults = {'player_name': username.title(), 'password': 'x' * 10}
+    defaults.update(kwargs)
+    return Player.objects.create(username=username, **defaults)
+
+
+def run_in_threads(target, count):
+    """Run target(index) in `count` threads that start together; return raised exceptions"""
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index):
+        try:
+            barrier.wait()
+            target(index)
+        except Exception as exc:  # noqa: BLE001 - reported back to the test
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def skip_unless_concurrent_writes(test_case):
+    """Skip tests that need several connections writing at once (not in-memory SQLite)"""
+    in_memory = connection.vendor == 'sqlite' and connection.is_in_memory_db()
+    return skipIf(in_memory, 'in-memory SQLite does not support concurrent writers')(test_case)
+
+
+class HpoTestCase(TestCase):
+    """TestCase that starts every test with empty per-worker caches"""
+
+    def setUp(self):
+        sampler.invalidate()
+        card_cache.invalidate()
+        token_cache.invalidate()
+        revocation_list.invalidate()
+        content_counters.clear()
+        self.addCleanup(content_counters.clear)
+
+
+class QuestionSamplerTests(HpoTestCase):
+    def test_returns_none_without_questions(self):
+        self.assertIsNone(QuestionSampler().random_question())
+
+    def test_respects_filters(self):
+        english = make_question(language='english', card='S3')
+        french = make_question(language='french', card='HJ', difficulty='hard')
+        qs = QuestionSampler()
+
+        self.assertEqual(qs.random_question(language='english'), english)
+        self.assertEqual(qs.random_question(card='HJ'), french)
+        self.assertEqual(qs.random_question(language='french', difficulty='hard'), french)
+        self.assertIsNone(qs.random_question(language='swahili'))
+
+    def test_does_not_order_by_random(self):
+        make_question()
+        qs = QuestionSampler()
+        qs.random_question()
+
+        with CaptureQueriesContext(connection) as ctx:
+            qs.random_question()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('RANDOM', ctx.captured_queries[0]['sql'].upper())
+
+    def test_pool_refreshes_on_question_changes(self):
+        first = make_question()
+        self.assertEqual(sampler.random_question(), first)
+
+        first.delete()
+        self.assertIsNone(sampler.random_question())
+
+        second = make_question(question_text='Which lake borders Rubavu?')
+        self.assertEqual(sampler.random_question(), second)
+
+    def test_skips_ids_deleted_by_other_workers(self):
+        qs = QuestionSampler(ttl=3600)
+        question = make_question()
+        qs.random_question()
+
+        # Simulate a delete from another process, which sends no signal here
+        Question.objects.filter(pk=question.pk).delete()
+        self.assertIsNone(qs.random_question())
+
+
+class CardQuestionCacheTests(HpoTestCase):
+    def test_counts_hits_and_misses(self):
+        make_question(card='S3', language='english')
+        make_question(card='S3', language='french')
+        cache = CardQuestionCache()
+
+        self.assertEqual(len(cache.get('S3')), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(cache.get('S3')), 2)
+        self.assertEqual([q.language for q in cache.get('S3', 'french')], ['french'])
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 2, 2))
+
+    def test_invalidated_by_question_signals(self):
+        question = make_question(card='HJ')
+        self.assertEqual(len(card_cache.get('HJ')), 1)
+
+        question.card = 'HQ'
+        question.save()
+        self.assertEqual(card_cache.get('HJ'), ())
+
+        question.delete()
+        self.assertEqual(card_cache.get('HQ'), ())
+
+    def test_card_endpoint_is_served_from_cache(self):
+        make_question(card='DA')
+        url = '/api/cards/DA/questions/'
+        self.assertEqual(self.client.get(url).json()['count'], 1)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()['questions'][0]['card'], 'DA')
+
+
+class CardRegistryTests(TestCase):
+    def test_registry_matches_choices(self):
+        self.assertEqual(len(CARD_IDS), 36)
+        self.assertEqual([choice[0] for choice in Question.CARD_CHOICES], list(CARD_IDS))
+        self.assertEqual(GameParticipant._meta.get_field('lost_card').choices, Question.CARD_CHOICES)
+
+    def test_card_info(self):
+        self.assertEqual(
+            Question(card='S7').get_card_info(),
+            {'suit': 'Spades', 'value': '7', 'pointValue': 10, 'symbol': '♠', 'id': 'S7'}
+        )
+        self.assertEqual(get_card_info('DA')['pointValue'], 11)
+        self.assertIsNone(Question().get_card_info())
+        self.assertEqual(get_card_info('X9'), {'id': 'X9'})
+
+    def test_card_info_is_a_copy(self):
+        get_card_info('HQ')['pointValue'] = 99
+        self.assertEqual(get_card_info('HQ')['pointValue'], 2)
+        with self.assertRaises(AttributeError):
+            CARD_REGISTRY['HQ'].point_value = 99
+
+    def test_card_display(self):
+        self.assertEqual(Question(card='HK').get_card_display(), '♥ K (Hearts)')
+        self.assertEqual(Question().get_card_display(), 'No card')
+
+
+class QuestionsApiPaginationTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ids = [make_question(question_text=f'Question {i}').id for i in range(5)]
+
+    def test_walks_pages_with_cursor(self):
+        seen = []
+        cursor = 0
+        while cursor is not None:
+            data = self.client.get('/api/questions/', {'cursor': cursor, 'limit': 2}).json()
+            seen.extend(q['id'] for q in data['questions'])
+            self.assertEqual(data['has_more'], data['next_cursor'] is not None)
+            cursor = data['next_cursor']
+        self.assertEqual(seen, self.ids)
+
+    def test_page_query_count_is_constant(self):
+        # One aggregate for the ETag/Last-Modified validators, one for the page
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/questions/', {'limit': 3}).json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['next_cursor'], self.ids[2])
+
+    def test_rejects_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/questions/', {'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/api/questions/', {'limit': 5000}).status_code, 400)
+        self.assertEqual(self.client.get('/api/questions/', {'cursor': 'abc'}).status_code, 400)
+
+    def test_streams_ndjson(self):
+        response = self.client.get('/api/questions/', {'format': 'ndjson', 'cursor': self.ids[1]})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], self.ids[2:])
+
+
+class QuestionFilterTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.english_easy = make_question(card='S3', language='english', difficulty='easy')
+        self.french_hard = make_question(card='S3', language='french', difficulty='hard')
+        self.tf = make_question(
+            card='HJ', language='english', question_type='true_false', correct_answer='True'
+        )
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be sequentially scanned
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def index_name(self, *fields):
+        for index in Question._meta.indexes:
+            if list(index.fields) == list(fields):
+                return index.name
+        self.fail(f'No index on {fields}')
+
+    def test_questions_api_filters(self):
+        data = self.client.get('/api/questions/', {'language': 'english', 'question_type': 'true_false'}).json()
+        self.assertEqual([q['id'] for q in data['questions']], [self.tf.id])
+        self.assertEqual(data['filters_applied'], {'language': 'english', 'question_type': 'true_false'})
+
+        data = self.client.get('/api/questions/', {'card': 'S3', 'difficulty': 'hard'}).json()
+        self.assertEqual([q['id'] for q in data['questions']], [self.french_hard.id])
+
+        self.assertEqual(self.client.get('/api/questions/', {'language': 'latin'}).status_code, 400)
+
+    def test_card_endpoints_filter(self):
+        data = self.client.get('/api/cards/S3/questions/', {'language': 'french'}).json()
+        self.assertEqual([q['id'] for q in data['questions']], [self.french_hard.id])
+
+        response = self.client.post(
+            '/api/questions/by-card/',
+            data=json.dumps({'card': 'S3', 'difficulty': 'easy'}),
+            content_type='application/json'
+        )
+        self.assertEqual([q['id'] for q in response.json()['questions']], [self.english_easy.id])
+
+        self.assertEqual(self.client.get('/api/cards/S3/questions/', {'difficulty': 'extreme'}).status_code, 400)
+
+    def test_card_language_filter_uses_index(self):
+        queryset = filter_questions(Question.objects.all(), {'card': 'S3', 'language': 'english'})
+        self.assertIn(self.index_name('card', 'language'), self.explain(queryset))
+
+    def test_language_difficulty_filter_uses_index(self):
+        queryset = filter_questions(Question.objects.all(), {'language': 'english', 'difficulty': 'easy'})
+        self.assertIn(self.index_name('language', 'difficulty'), self.explain(queryset))
+
+
+class SubmitGameResultsApiTests(HpoTestCase):
+    url = '/api/games/submit-results/'
+
+    def setUp(self):
+        super().setUp()
+        for card in ('S3', 'HJ', 'C7'):
+            make_question(card=card)
+        self.players = [make_player(f'player{i}') for i in range(6)]
+
+    def submit(self, game, results):
+        return self.client.post(
+            self.url,
+            data=json.dumps({'match_id': str(game.match_id), 'results': results}),
+            content_type='application/json'
+        )
+
+    def results_for(self, count):
+        if count == 1:
+            return [{'player_id': self.players[0].id, 'username': 'player0', 'team': 1, 'is_winner': True}]
+        results = []
+        for i, player in enumerate(self.players[:count]):
+            is_winner = i % 2 == 0
+            results.append({
+                'player_id': player.id,
+                'username': player.username,
+                'team': 1 if is_winner else 2,
+                'is_winner': is_winner,
+                'lost_card': None if is_winner else ('S3', 'HJ', 'C7')[i // 2],
+            })
+        return results
+
+    def test_query_count_is_independent_of_player_count(self):
+        counts = {}
+        for count in (1, 2, 4, 6):
+            game = Game.objects.create(participant_count=count)
+            results = self.results_for(count)
+            # Warm the per-worker question caches so only the endpoint's own queries are counted
+            sampler.get_pool()
+            card_cache.get_many(['S3', 'HJ', 'C7'])
+
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.submit(game, results)
+            self.assertEqual(response.status_code, 200, response.content)
+            counts[count] = len(ctx.captured_queries)
+
+            game.refresh_from_db()
+            self.assertEqual(game.status, 'completed')
+            self.assertEqual(game.participants.count(), count)
+            self.assertEqual(GameResponse.objects.filter(game=game).count(), count)
+            self.assertTrue(GameResult.objects.filter(game=game).exists())
+
+            Player.objects.update(games_played=0, games_won=0, games_lost=0, total_game_marks=0)
+
+        self.assertEqual(len(set(counts.values())), 1, counts)
+        self.assertLessEqual(counts[6], 20)
+
+    def test_updates_player_stats(self):
+        game = Game.objects.create(participant_count=2)
+        data = self.submit(game, self.results_for(2)).json()
+
+        self.assertEqual(data['results'][0]['response']['type'], 'explanation')
+        self.assertEqual(data['results'][1]['response']['type'], 'question')
+        self.assertEqual(data['results'][1]['response']['question']['card'], 'S3')
+
+        winner, loser = Player.objects.get(pk=self.players[0].pk), Player.objects.get(pk=self.players[1].pk)
+        self.assertEqual((winner.games_played, winner.games_won, winner.total_game_marks), (1, 1, 1))
+        self.assertEqual((loser.games_played, loser.games_lost, loser.current_win_streak), (1, 1, 0))
+        self.assertEqual(winner.last_game_result, 'won')
+
+    def test_rejects_duplicate_and_repeat_submissions(self):
+        game = Game.objects.create(participant_count=2)
+        results = self.results_for(2)
+        self.assertEqual(self.submit(game, results[:1] * 2).status_code, 400)
+
+        self.assertEqual(self.submit(game, results[:1]).status_code, 200)
+        self.assertEqual(self.submit(game, results).status_code, 400)
+        self.assertEqual(game.participants.count(), 1)
+
+    def test_renames_update_leaderboard_and_token_cache(self):
+        headers = {'HTTP_AUTHORIZATION': f'Token {self.players[0].uuid}'}
+        self.client.post('/api/v1/auth/logout/', **headers)
+        results = self.results_for(2)
+        results[0]['player_name'] = 'Zero Renamed'
+        results[1]['username'] = 'renamed1'
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.submit(Game.objects.create(participant_count=2), results).status_code, 200)
+
+        # Each profile column is written only for the player whose value changed
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "hpo_app_player"')]
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(sum('"username" =' in sql for sql in updates), 1)
+        self.assertEqual(sum('"player_name" =' in sql for sql in updates), 1)
+        entries = {entry.pk: entry for entry in LeaderboardEntry.objects.all()}
+        self.assertEqual(entries[self.players[0].pk].player_name, 'Zero Renamed')
+        self.assertEqual(entries[self.players[1].pk].username, 'renamed1')
+        # The cached token principal was dropped, so it reloads the new name
+        self.assertEqual(self.client.post('/api/v1/auth/logout/', **headers).json()['player_name'], 'Zero Renamed')
+
+
+class FinalizeGameTests(HpoTestCase):
+    def add_participants(self, game, *winners_by_team):
+        for index, (team, is_winner) in enumerate(winners_by_team):
+            GameParticipant.objects.create(
+                game=game, player=make_player(f'finalize{index}'), team=team,
+                is_winner=is_winner, marks_earned=1 if is_winner else 0,
+            )
+
+    def test_waits_for_all_participants(self):
+        game = Game.objects.create(participant_count=4)
+        self.add_participants(game, (1, True), (2, False))
+
+        status = finalize_game_if_complete(game)
+        self.assertEqual((status['participants_submitted'], status['completed']), (2, False))
+        self.assertFalse(GameResult.objects.filter(game=game).exists())
+
+    def test_finalizes_with_one_aggregate_query(self):
+        game = Game.objects.create(participant_count=4)
+        self.add_participants(game, (1, True), (1, True), (2, False), (2, True))
+
+        with CaptureQueriesContext(connection) as ctx:
+            status = finalize_game_if_complete(game)
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        aggregates = [sql for sql in selects if 'hpo_app_gameparticipant' in sql]
+        self.assertEqual(len(aggregates), 1, aggregates)
+
+        self.assertTrue(status['completed'])
+        game.refresh_from_db()
+        self.assertEqual((game.status, game.winning_team), ('completed', 1))
+        self.assertEqual((game.result.team1_marks, game.result.team2_marks), (2, 1))
+
+    def test_does_not_finalize_twice(self):
+        game = Game.objects.create(participant_count=2)
+        self.add_participants(game, (1, True), (2, True))
+
+        finalize_game_if_complete(game)
+        completed_at = Game.objects.get(pk=game.pk).completed_at
+        self.assertIsNone(game.winning_team)
+
+        self.assertEqual(finalize_game_if_complete(game)['status'], 'completed')
+        self.assertEqual(Game.objects.get(pk=game.pk).completed_at, completed_at)
+        self.assertEqual(GameResult.objects.filter(game=game).count(), 1)
+
+
+@skip_unless_concurrent_writes
+class ConcurrentFinalizeTests(TransactionTestCase):
+    """The last two submissions race; exactly one of them must finalize the game"""
+
+    def setUp(self):
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode=WAL')
+
+    def test_last_two_submissions_in_parallel(self):
+        make_question(card='S3')
+        game = Game.objects.create(participant_count=4)
+        players = [make_player(f'racer{i}') for i in range(4)]
+        for team, player in zip((1, 2), players[:2]):
+            GameParticipant.objects.create(game=game, player=player, team=team, is_winner=team == 1)
+
+        responses = [None, None]
+
+        def submit(index):
+            player = players[2 + index]
+            responses[index] = Client().post(
+                '/api/games/submit-player-result/',
+                data=json.dumps({
+                    'match_id': str(game.match_id),
+                    'player_id': player.id,
+                    'username': player.username,
+                    'team': 1 + index,
+                    'is_winner': index == 0,
+                    'lost_card': None if index == 0 else 'S3',
+                }),
+                content_type='application/json'
+            )
+
+        self.assertEqual(run_in_threads(submit, 2), [])
+        for response in responses:
+            self.assertEqual(response.status_code, 200, response.content)
+
+        completed_flags = sorted(r.json()['game_status']['completed'] for r in responses)
+        self.assertEqual(completed_flags, [False, True])
+        game.refresh_from_db()
+        self.assertEqual((game.status, game.winning_team), ('completed', 1))
+        self.assertEqual(GameResult.objects.filter(game=game).count(), 1)
+
+
+class PlayerStatsUpdateTests(HpoTestCase):
+    def test_win_streak_logic(self):
+        player = make_player('streaker', longest_win_streak=2)
+        for won in (True, True, True, False, True):
+            player.update_game_stats(won=won, marks_earned=1 if won else 0)
+
+        player.refresh_from_db()
+        self.assertEqual((player.games_played, player.games_won, player.games_lost), (5, 4, 1))
+        self.assertEqual((player.current_win_streak, player.longest_win_streak), (1, 3))
+        self.assertEqual((player.total_game_marks, player.last_game_result), (4, 'won'))
+
+    def test_writes_only_stat_columns(self):
+        player = make_player('narrow', player_name='Original')
+        Player.objects.filter(pk=player.pk).update(player_name='Renamed elsewhere')
+
+        with CaptureQueriesContext(connection) as ctx:
+            player.update_game_stats(won=True, marks_earned=1)
+        update_sql = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "hpo_app_player"'))
+        self.assertNotIn('player_name', update_sql)
+
+        player.record_answer(correct=True, marks_earned=1)
+        player.refresh_from_db()
+        self.assertEqual(player.player_name, 'Renamed elsewhere')
+        self.assertEqual((player.total_game_marks, player.questions_answered, player.correct_answers), (2, 1, 1))
+
+
+@skip_unless_concurrent_writes
+class ConcurrentPlayerStatsTests(TransactionTestCase):
+    """Runs against a database that supports concurrent writers (Postgres or file-backed SQLite)"""
+
+    def setUp(self):
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode=WAL')
+
+    def test_no_increments_lost_under_contention(self):
+        player = make_player('contended')
+        threads, rounds = 8, 25
+
+        def play(index):
+            local = Player.objects.get(pk=player.pk)
+            for round_number in range(rounds):
+                local.update_game_stats(won=(index + round_number) % 2 == 0, marks_earned=1)
+                local.record_answer(correct=True, marks_earned=1)
+
+        self.assertEqual(run_in_threads(play, threads), [])
+        player.refresh_from_db()
+        self.assertEqual(player.games_played, threads * rounds)
+        self.assertEqual(player.games_won + player.games_lost, threads * rounds)
+        self.assertEqual(player.total_game_marks, threads * rounds * 2)
+        self.assertEqual(player.questions_answered, threads * rounds)
+        self.assertEqual(player.correct_answers, threads * rounds)
+
+
+def play_games(player, wins, losses):
+    for won in [True] * wins + [False] * losses:
+        player.update_game_stats(won=won, marks_earned=1 if won else 0)
+
+
+@override_settings(LEADERBOARD_MIN_GAMES=3, LEADERBOARD_MIN_ANSWERS=2)
+class LeaderboardTests(HpoTestCase):
+    url = '/api/leaderboard/'
+
+    def board(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_entries_follow_player_changes(self):
+        player = make_player('tracked')
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+        play_games(player, wins=2, losses=1)
+        player.record_answer(correct=True, marks_earned=1)
+        entry = LeaderboardEntry.objects.get(player=player)
+        self.assertEqual((entry.games_played, entry.total_marks, entry.longest_win_streak), (3, 3, 2))
+        self.assertAlmostEqual(entry.win_rate, 200 / 3)
+        self.assertEqual(entry.answer_accuracy, 100.0)
+
+        player.province = 'Northern Province'
+        player.save(update_fields=['province'])
+        self.assertEqual(LeaderboardEntry.objects.get(player=player).province, 'Northern Province')
+
+        player.delete()
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_ranks_by_true_win_rate_above_threshold(self):
+        steady, perfect, strong = make_player('steady'), make_player('perfect'), make_player('strong')
+        play_games(steady, wins=3, losses=1)
+        play_games(perfect, wins=2, losses=0)
+        play_games(strong, wins=9, losses=1)
+
+        data = self.board(metric='win_rate')
+        self.assertEqual([row['username'] for row in data['leaderboard']], ['strong', 'steady'])
+        self.assertEqual(data['leaderboard'][1]['win_rate'], 75.0)
+        self.assertEqual(data['min_games'], 3)
+
+        data = self.board(metric='total_marks', limit=1)
+        self.assertEqual([row['username'] for row in data['leaderboard']], ['strong'])
+
+    def test_scoped_boards_and_my_rank(self):
+        for index, province in enumerate(['Kigali City', 'Kigali City', 'Kigali City', 'Western Province']):
+            player = make_player(f'scoped{index}', province=province, district='Gasabo' if index else 'Huye')
+            play_games(player, wins=index + 1, losses=0)
+
+        data = self.board(metric='games_won', province='Kigali City', username='scoped0', limit=1)
+        self.assertEqual(data['leaderboard'][0]['username'], 'scoped2')
+        self.assertEqual(data['my_rank']['rank'], 3)
+        self.assertEqual(data['scope'], {'province': 'Kigali City'})
+
+        data = self.board(metric='games_won', district='Gasabo', username='scoped0')
+        self.assertEqual([row['username'] for row in data['leaderboard']], ['scoped3', 'scoped2', 'scoped1'])
+        self.assertIsNone(data['my_rank'])
+
+    def test_reads_are_independent_of_player_count(self):
+        for index in range(30):
+            play_games(make_player(f'bulk{index}'), wins=index % 4, losses=1)
+
+        with self.assertNumQueries(1):
+            self.board(metric='win_streak', limit=5)
+        with self.assertNumQueries(3):
+            self.board(metric='answer_accuracy', username='bulk7')
+
+    def test_rejects_invalid_parameters(self):
+        for params in ({'metric': 'bogus'}, {'limit': 0}, {'limit': 'x'}, {'province': 'Atlantis'}, {'organization': 'x'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+    def test_rebuild_command(self):
+        player = make_player('rebuilt')
+        play_games(player, wins=1, losses=1)
+        LeaderboardEntry.objects.all().delete()
+
+        call_command('rebuild_leaderboard', stdout=StringIO())
+        entry = LeaderboardEntry.objects.get(player=player)
+        self.assertEqual((entry.games_played, entry.games_won, entry.win_rate), (2, 1, 50.0))
+
+
+class WindowedLeaderboardTests(HpoTestCase):
+    url = '/api/leaderboard/'
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+
+    def participate(self, player, is_winner, days_ago=0, **kwargs):
+        participant = GameParticipant.objects.create(
+            game=Game.objects.create(participant_count=2), player=player, team=1,
+            is_winner=is_winner, marks_earned=1 if is_winner else 0, **kwargs
+        )
+        GameParticipant.objects.filter(pk=participant.pk).update(
+            joined_at=timezone.now() - timedelta(days=days_ago)
+        )
+        return participant
+
+    def test_rollup_aggregates_per_player_and_day(self):
+        player = make_player('daily')
+        self.participate(player, True)
+        self.participate(player, False, question_answered=True, answer_correct=True)
+        stale = self.participate(player, True, days_ago=1)
+
+        self.assertEqual(leaderboard.rollup(self.today - timedelta(days=1), self.today), 2)
+        stats = PlayerDailyStats.objects.get(player=player, day=self.today)
+        self.assertEqual(
+            [getattr(stats, field) for field in PlayerDailyStats.COUNTER_FIELDS], [2, 1, 1, 1, 1]
+        )
+
+        # Re-running replaces the buckets, including ones that no longer have games
+        stale.delete()
+        self.assertEqual(leaderboard.rollup(self.today - timedelta(days=1), self.today), 1)
+        self.assertFalse(PlayerDailyStats.objects.filter(day=self.today - timedelta(days=1)).exists())
+
+    def test_month_window_ignores_older_games(self):
+        veteran, newcomer = make_player('veteran'), make_player('newcomer')
+        for _ in range(5):
+            self.participate(veteran, True, days_ago=40)
+        self.participate(veteran, False)
+        self.participate(newcomer, True)
+        call_command('rollup_player_stats', '--since', (self.today - timedelta(days=45)).isoformat(), stdout=StringIO())
+
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url, {'metric': 'total_marks', 'window': 'month'}).json()
+        self.assertEqual(data['window'], {'name': 'month', 'start': self.today.replace(day=1).isoformat()})
+        self.assertEqual([row['username'] for row in data['leaderboard']], ['newcomer', 'veteran'])
+        self.assertEqual(data['leaderboard'][1]['games_played'], 1)
+
+        data = self.client.get(self.url, {'metric': 'games_won', 'window': 'day', 'username': 'veteran'}).json()
+        self.assertEqual((data['my_rank']['rank'], data['my_rank']['games_won']), (2, 0))
+
+    def test_rejects_invalid_windows(self):
+        for params in ({'window': 'year'}, {'window': 'week', 'metric': 'win_streak'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+
+class TokenAuthenticationTests(HpoTestCase):
+    def auth_header(self, player):
+        return {'HTTP_AUTHORIZATION': f'Token {player.uuid}'}
+
+    def test_warm_requests_do_not_query_for_the_token(self):
+        player = make_player('authed')
+        headers = self.auth_header(player)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.post('/api/v1/auth/logout/', **headers).status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/v1/auth/logout/', **headers)
+        self.assertEqual(response.json()['player_name'], 'Authed')
+
+        # The profile view authenticates from the cache and only loads the full row
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/auth/profile/', **headers)
+        self.assertEqual(response.json()['username'], 'authed')
+
+    def test_invalid_and_missing_tokens(self):
+        self.assertEqual(self.client.post('/api/v1/auth/logout/').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/auth/profile/').status_code, 401)
+        # DRF rejects unknown tokens before the view runs
+        for token in ('not-a-uuid', '00000000-0000-0000-0000-000000000000'):
+            headers = {'HTTP_AUTHORIZATION': f'Token {token}'}
+            self.assertEqual(self.client.post('/api/v1/auth/logout/', **headers).status_code, 403)
+            self.assertEqual(self.client.get('/api/v1/auth/profile/', **headers).status_code, 403)
+
+    def test_cache_is_dropped_on_player_changes(self):
+        player = make_player('rotating')
+        headers = self.auth_header(player)
+        self.client.post('/api/v1/auth/logout/', **headers)
+
+        player.player_name = 'Renamed'
+        player.save()
+        self.assertEqual(self.client.post('/api/v1/auth/logout/', **headers).json()['player_name'], 'Renamed')
+
+        # Rotating the token revokes the cached one
+        player.uuid = uuid.uuid4()
+        player.save(update_fields=['uuid'])
+        self.assertEqual(self.client.post('/api/v1/auth/logout/', **headers).status_code, 403)
+        self.assertEqual(self.client.post('/api/v1/auth/logout/', **self.auth_header(player)).status_code, 200)
+
+        player.delete()
+        self.assertEqual(self.client.post('/api/v1/auth/logout/', **self.auth_header(player)).status_code, 403)
+
+    def test_lru_eviction_and_ttl(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        principals = [PlayerPrincipal(i, None, f'user{i}', f'User {i}') for i in range(3)]
+        for index, principal in enumerate(principals):
+            cache.set(f'token{index}', principal)
+            if index == 1:
+                cache.get('token0')
+
+        self.assertEqual(cache.get('token0'), principals[0])
+        self.assertIsNone(cache.get('token1'))
+        cache.discard_player(2)
+        self.assertIsNone(cache.get('token2'))
+
+        expired = TokenCache(ttl=0)
+        expired.set('token', principals[0])
+        self.assertIsNone(expired.get('token'))
+
+
+class SignedTokenTests(HpoTestCase):
+    def login(self, username='signed'):
+        make_player(username, password=make_password('secret123'))
+        response = self.client.post(
+            '/api/v1/auth/login/', data={'username': username, 'password': 'secret123'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_login_issues_verifiable_expiring_token(self):
+        data = self.login()
+        payload = read_token(data['token'])
+        self.assertEqual(payload['p'], Player.objects.get(username='signed').pk)
+        self.assertIn('token_expires_at', data)
+
+        # Cold: one query for the principal; warm: signature and expiry are checked in memory
+        with self.assertNumQueries(1):
+            principal, _ = player_authenticator.authenticate_credentials(data['token'])
+        with self.assertNumQueries(0):
+            self.assertEqual(player_authenticator.authenticate_credentials(data['token'])[0], principal)
+
+    def test_rejects_tampered_and_expired_tokens(self):
+        player = make_player('expiring')
+        token, _ = issue_token(player)
+        self.assertIsNone(read_token(token[:-2] + ('aa' if not token.endswith('aa') else 'bb')))
+        self.assertIsNone(read_token(issue_token(player, ttl=-1)[0]))
+        self.assertIsNone(read_token('garbage'))
+
+    def test_logout_revokes_token(self):
+        token = self.login()['token']
+        headers = {'HTTP_AUTHORIZATION': f'Token {token}'}
+        self.assertEqual(self.client.get('/api/v1/auth/profile/', **headers).status_code, 200)
+
+        self.assertEqual(self.client.post('/api/v1/auth/logout/', **headers).status_code, 200)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+        self.assertEqual(self.client.get('/api/v1/auth/profile/', **headers).status_code, 403)
+
+        # Other workers see the revocation once they reload the list
+        token_cache.invalidate()
+        revocation_list.invalidate()
+        self.assertIsNone(read_token(token))
+
+    def test_legacy_tokens_still_accepted(self):
+        player = make_player('legacy')
+        headers = {'HTTP_AUTHORIZATION': f'Token {player.uuid}'}
+        response = self.client.post('/api/v1/auth/logout/', **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()['token_revoked'])
+
+        token_cache.invalidate()
+        with override_settings(PLAYER_TOKEN_ACCEPT_LEGACY=False):
+            self.assertEqual(self.client.post('/api/v1/auth/logout/', **headers).status_code, 403)
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class LoginTests(HpoTestCase):
+    def login(self, username, password):
+        return self.client.post(
+            '/api/v1/auth/login/', data={'username': username, 'password': password}, content_type='application/json'
+        )
+
+    def test_login_updates_only_last_login(self):
+        player = make_player('burst', password=make_password('secret123'))
+        Player.objects.filter(pk=player.pk).update(player_name='Renamed elsewhere')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.login('burst', 'secret123')
+        self.assertEqual(response.status_code, 200)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('last_login', updates[0])
+        self.assertNotIn('player_name', updates[0])
+
+        player.refresh_from_db()
+        self.assertIsNotNone(player.last_login)
+        self.assertEqual(player.player_name, 'Renamed elsewhere')
+        self.assertEqual(self.login('burst', 'wrong-password').status_code, 401)
+
+    def test_outdated_hashes_are_upgraded_on_login(self):
+        player = make_player('legacy-hash', password=make_password('secret123', hasher='pbkdf2_sha1'))
+        self.assertEqual(self.login('legacy-hash', 'secret123').status_code, 200)
+        player.refresh_from_db()
+        self.assertTrue(player.password.startswith('pbkdf2_sha256$1000$'))
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login('legacy-hash', 'secret123').status_code, 200)
+        player.refresh_from_db()
+        self.assertTrue(player.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertEqual(self.login('legacy-hash', 'secret123').status_code, 200)
+
+    def test_verifier_rejects_when_saturated(self):
+        verifier = PasswordVerifier(workers=1, queue_size=0)
+        encoded = make_password('secret123')
+        self.assertEqual(verifier.verify('secret123', encoded), (True, None))
+
+        verifier._slots.acquire()
+        with self.assertRaises(LoginBusy):
+            verifier.verify('secret123', encoded)
+        verifier._slots.release()
+        verifier.shutdown()
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class RegistrationTests(HpoTestCase):
+    url = '/api/v1/auth/register/'
+
+    def register(self, username, email=None, **extra):
+        data = {
+            'player_name': username.title(), 'username': username, 'phone': '0780000000',
+            'password': 'secret123', 'password_confirm': 'secret123', **extra,
+        }
+        if email:
+            data['email'] = email
+        return self.client.post(self.url, data=data, content_type='application/json')
+
+    def test_uniqueness_is_checked_with_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.register('fresh', email='fresh@example.com')
+        self.assertEqual(response.status_code, 201, response.content)
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1, selects)
+
+    def test_reports_duplicate_username_and_email(self):
+        make_player('taken', email='taken@example.com')
+        make_player('other', email='shared@example.com')
+
+        details = self.register('taken', email='shared@example.com').json()['details']
+        self.assertEqual(details['username'], ['Username already exists.'])
+        self.assertEqual(details['email'], ['Email already exists.'])
+        self.assertNotIn('email', self.register('taken', email='new@example.com').json()['details'])
+
+    def test_validates_province_district(self):
+        response = self.register('located', province='Kigali City', district='Huye')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.register('located', province='Southern Province', district='Huye').status_code, 201)
+
+    def test_reports_district_and_uniqueness_errors_together(self):
+        make_player('taken')
+
+        details = self.register('taken', province='Kigali City', district='Huye').json()['details']
+        self.assertEqual(details['username'], ['Username already exists.'])
+        self.assertIn("District 'Huye'", details['non_field_errors'][0])
+
+    def test_provinces_endpoint_uses_shared_mapping(self):
+        data = self.client.get('/api/v1/form-data/provinces-districts/').json()
+        self.assertEqual([row['province'] for row in data['provinces']], list(PROVINCE_DISTRICTS))
+        self.assertEqual(data['provinces'][0]['districts'][0], {'value': 'Gasabo', 'label': 'Gasabo'})
+        self.assertEqual(Player.DISTRICT_CHOICES[0], ('Gasabo', 'Gasabo'))
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class PlayerImportTests(HpoTestCase):
+    CSV = (
+        'player_name,username,password,email,age_group,province,district\n'
+        'Ada One,ada,secret123,ada@example.com,15-19,Southern Province,Huye\n'
+        'Bad District,bad,secret123,,15-19,Kigali City,Huye\n'
+        'Ada Again,ada,secret123,,,,\n'
+        'Taken,taken,secret123,,,,\n'
+        'Old Age,old,secret123,,99+,,\n'
+        'No Password,nopass,,,,,\n'
+        'Ben Two,ben,secret123,ben@example.com,25+,,\n'
+    )
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        make_player('taken')
+        result = import_players(StringIO(self.CSV), 'csv', workers=0)
+
+        self.assertEqual((result.rows, result.created, result.failed), (7, 2, 5))
+        self.assertEqual([error.row for error in result.errors], [3, 4, 5, 6, 7])
+        self.assertIn("District 'Huye' is not valid for 'Kigali City' province.", result.errors[0].errors)
+        self.assertEqual(result.errors[1].errors, ['Duplicate username in this file'])
+        self.assertEqual(result.errors[2].errors, ['Username already exists.'])
+
+        ada = Player.objects.get(username='ada')
+        self.assertEqual((ada.province, ada.district, ada.age_group), ('Southern Province', 'Huye', '15-19'))
+        self.assertTrue(check_password('secret123', ada.password))
+
+    def test_inserts_each_chunk_with_constant_queries(self):
+        rows = ''.join(f'Player {i},player{i},secret123\n' for i in range(50))
+        with CaptureQueriesContext(connection) as ctx:
+            result = import_players(StringIO('player_name,username,password\n' + rows), 'csv', workers=0)
+        self.assertEqual(result.created, 50)
+        statements = [q['sql'].split()[0] for q in ctx.captured_queries]
+        self.assertEqual(statements.count('SELECT'), 1)
+        # SQLite splits the insert by its bound-parameter limit, other backends use one statement
+        self.assertLessEqual(statements.count('INSERT'), 3)
+
+    def test_jsonl_with_process_pool(self):
+        lines = [json.dumps({'player_name': f'J {i}', 'username': f'json{i}', 'password': 'secret123'}) for i in range(4)]
+        lines.insert(2, '{not json')
+        with PlayerImporter(workers=2, batch_size=3) as importer:
+            result = importer.run(read_rows(StringIO('\n'.join(lines)), 'jsonl'))
+
+        self.assertEqual((result.created, result.failed), (4, 1))
+        self.assertEqual(result.errors[0].row, 3)
+        self.assertTrue(check_password('secret123', Player.objects.get(username='json3').password))
+
+    def test_command_reports_row_errors(self):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as stream:
+            stream.write(self.CSV)
+        self.addCleanup(os.remove, path)
+
+        make_player('taken')
+        out, err = StringIO(), StringIO()
+        call_command('import_players', path, '--workers', '0', stdout=out, stderr=err)
+        self.assertIn('Imported 2 of 7 players (5 rows rejected)', out.getvalue())
+        self.assertIn('Row 6 old: Invalid age_group', err.getvalue())
+
+    def test_admin_upload(self):
+        admin_user = User.objects.create_superuser('root', 'root@example.com', 'secret123')
+        self.client.force_login(admin_user)
+        upload = SimpleUploadedFile('players.csv', self.CSV.encode('utf-8-sig'))
+
+        storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        # The upload hashes in the request thread, never in a process pool
+        pool = mock.patch('hpo_app.player_import.ProcessPoolExecutor', side_effect=AssertionError('pool started'))
+        with pool, override_settings(PLAYER_IMPORT_WORKERS=4, STATICFILES_STORAGE=storage):
+            response = self.client.post('/admin/hpo_app/player/import/', {'file': upload}, secure=True)
+            changelist = self.client.get('/admin/hpo_app/player/', secure=True)
+        self.assertContains(changelist, '/admin/hpo_app/player/import/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result'].created, 3)
+        self.assertEqual(len(response.context['errors_shown']), 4)
+        self.assertContains(response, 'Duplicate username in this file')
+
+    def test_admin_upload_rejects_files_over_the_limit(self):
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'secret123'))
+        storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        with override_settings(PLAYER_IMPORT_ADMIN_MAX_ROWS=6, STATICFILES_STORAGE=storage):
+            upload = SimpleUploadedFile('players.csv', self.CSV.encode('utf-8-sig'))
+            response = self.client.post('/admin/hpo_app/player/import/', {'file': upload}, secure=True)
+            self.assertContains(response, 'The file has 7 rows; the upload takes at most 6.')
+            self.assertContains(response, 'manage.py import_players')
+            self.assertIsNone(response.context['result'])
+
+            with override_settings(PLAYER_IMPORT_ADMIN_MAX_BYTES=100):
+                upload = SimpleUploadedFile('players.csv', self.CSV.encode('utf-8-sig'))
+                response = self.client.post('/admin/hpo_app/player/import/', {'file': upload}, secure=True)
+            self.assertContains(response, 'The file is larger than 100\xa0bytes.')
+        self.assertFalse(Player.objects.filter(username='ada').exists())
+
+
+@override_settings(EXPORT_WATERMARK_LAG=0)
+class GameHistoryExportTests(HpoTestCase):
+    def play(self, completed_at, *players):
+        game = Game.objects.create(
+            participant_count=2, status='completed', winning_team=1, completed_at=completed_at, cards_chosen=['S3']
+        )
+        for team, player in enumerate(players, start=1):
+            participant = GameParticipant.objects.create(game=game, player=player, team=team, is_winner=team == 1)
+            GameResponse.objects.create(
+                game=game, participant=participant, response_type='fun_fact' if team == 1 else 'question'
+            )
+        GameResult.objects.create(game=game, team1_marks=1, result_summary={'winner': 1})
+        # A game played earlier was last changed when it completed
+        Game.objects.filter(pk=game.pk).update(updated_at=completed_at)
+        return game
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.ada = make_player('ada', province='Southern Province', district='Huye', age_group='15-19')
+        self.ben = make_player('ben', gender='male')
+        self.old = self.play(self.now - timedelta(days=2), self.ada, self.ben)
+        self.new = self.play(self.now - timedelta(hours=1), self.ben, self.ada)
+        Game.objects.create(participant_count=2, status='active')
+
+    def test_csv_rows_with_demographics(self):
+        out = StringIO()
+        written, _ = exports.export('participants', 'csv', out)
+        lines = out.getvalue().splitlines()
+
+        self.assertEqual(written, 4)
+        self.assertEqual(lines[0], ','.join(exports.columns('participants')))
+        self.assertIn(f'{self.old.match_id},', lines[1])
+        self.assertIn(',15-19,,Southern Province,Huye,1,True,', lines[1])
+
+    def test_incremental_jsonl_since_watermark(self):
+        out = StringIO()
+        written, watermark = exports.export('results', 'jsonl', out, since=self.now - timedelta(days=1))
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        self.assertEqual(written, 1)
+        self.assertEqual((rows[0]['match_id'], rows[0]['result_summary']), (str(self.new.match_id), {'winner': 1}))
+        self.assertEqual(exports.export('results', 'jsonl', StringIO(), since=watermark)[0], 0)
+
+    def test_incremental_export_includes_changes_after_completion(self):
+        _, watermark = exports.export('participants', 'jsonl', StringIO())
+        question = make_question()
+        response = self.client.post('/api/games/award-points/', {
+            'match_id': str(self.old.match_id), 'username': 'ben', 'question_id': question.id, 'answer': 'Kigali',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        out = StringIO()
+        self.assertEqual(exports.export('participants', 'jsonl', out, since=watermark)[0], 2)
+        rows = {row['player_id']: row for row in map(json.loads, out.getvalue().splitlines())}
+        self.assertEqual((rows[self.ben.pk]['match_id'], rows[self.ben.pk]['marks_earned']), (str(self.old.match_id), 1))
+        results = StringIO()
+        exports.export('results', 'jsonl', results, since=watermark)
+        self.assertEqual(json.loads(results.getvalue())['team2_marks'], 1)
+
+    @override_settings(EXPORT_WATERMARK_LAG=600)
+    def test_watermark_lags_behind_recent_changes(self):
+        recent = self.play(timezone.now() - timedelta(minutes=5), self.ada, self.ben)
+        _, watermark = exports.export('games', 'jsonl', StringIO())
+        self.assertLess(watermark, recent.updated_at)
+
+        with override_settings(EXPORT_WATERMARK_LAG=0):
+            out = StringIO()
+            self.assertEqual(exports.export('games', 'jsonl', out, since=watermark)[0], 1)
+        self.assertEqual(json.loads(out.getvalue())['match_id'], str(recent.match_id))
+
+    def test_streams_with_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(exports.export('responses', 'csv', StringIO())[0], 4)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_command_writes_watermark_file(self):
+        handle, watermark_file = tempfile.mkstemp()
+        os.close(handle)
+        os.remove(watermark_file)
+        self.addCleanup(lambda: os.path.exists(watermark_file) and os.remove(watermark_file))
+
+        out, err = StringIO(), StringIO()
+        call_command('export_game_history', 'games', '--watermark-file', watermark_file, stdout=out, stderr=err)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+        self.assertIn('Exported 2 games rows', err.getvalue())
+
+        self.play(timezone.now(), self.ada, self.ben)
+        out = StringIO()
+        call_command('export_game_history', 'games', '--format', 'jsonl', '--watermark-file', watermark_file,
+                     stdout=out, stderr=StringIO())
+        self.assertEqual(len(out.getvalue().splitlines()), 1)
+
+    def test_admin_endpoint_is_staff_only(self):
+        url = '/admin/hpo_app/game/export/?dataset=games&format=jsonl'
+        self.assertEqual(self.client.get(url, secure=True).status_code, 302)
+
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'secret123'))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['X-Export-Watermark'])
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 2)
+        self.assertEqual(self.client.get(url + '&since=yesterday', secure=True).status_code, 400)
+
+
+class GameReadQueryTests(HpoTestCase):
+    CARDS = ('S3', 'HJ', 'DA')
+
+    def make_game(self, participants):
+        for card in self.CARDS:
+            make_question(card=card, explanation=f'{card} fact')
+        game = Game.objects.create(
+            participant_count=participants, status='completed', winning_team=1,
+            completed_at=timezone.now(), cards_chosen=['S3'],
+        )
+        for index in range(participants):
+            winner = index % 2 == 0
+            GameParticipant.objects.create(
+                game=game, player=make_player(f'reader{participants}_{index}'), team=1 if winner else 2, is_winner=winner,
+                lost_card=None if winner else self.CARDS[index % len(self.CARDS)],
+            )
+        GameResult.objects.create(game=game, team1_marks=participants // 2)
+        return game
+
+    def count_queries(self, url):
+        card_cache.invalidate()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries), response.json()
+
+    def test_status_queries_do_not_grow_with_participants(self):
+        small, large = self.make_game(2), self.make_game(6)
+        small_count, _ = self.count_queries(f'/api/games/{small.match_id}/status/')
+        large_count, data = self.count_queries(f'/api/games/{large.match_id}/status/')
+
+        self.assertEqual(large_count, small_count)
+        self.assertLessEqual(large_count, 2)
+        self.assertEqual(len(data['game']['participants']), 6)
+        self.assertEqual(data['game']['result']['team1_marks'], 3)
+
+    def test_responses_queries_do_not_grow_with_participants(self):
+        small, large = self.make_game(2), self.make_game(6)
+        small_count, _ = self.count_queries(f'/api/games/{small.match_id}/responses/')
+        large_count, data = self.count_queries(f'/api/games/{large.match_id}/responses/')
+
+        # game, participants with players, stored responses, card questions, bulk insert, updated_at bump
+        self.assertEqual(large_count, small_count)
+        self.assertLessEqual(large_count, 6)
+        self.assertEqual(GameResponse.objects.filter(game=large).count(), 6)
+        self.assertEqual(data['responses'][0]['fun_fact'], 'S3 fact')
+
+    def test_responses_are_stable_across_calls(self):
+        game = self.make_game(6)
+        url = f'/api/games/{game.match_id}/responses/'
+        _, first = self.count_queries(url)
+        count, second = self.count_queries(url)
+
+        self.assertEqual(first['responses'], second['responses'])
+        self.assertEqual(GameResponse.objects.filter(game=game).count(), 6)
+        # Stored responses are reused: nothing is inserted
+        self.assertLessEqual(count, 4)
+        stored = GameResponse.objects.get(game=game, participant__player__username='reader6_1')
+        self.assertEqual(second['responses'][1]['question']['id'], stored.question_id)
+
+
+@modify_settings(MIDDLEWARE={'prepend': 'hpo_app.metrics.QueryMetricsMiddleware'})
+@override_settings(METRICS_SAMPLE_RATE=1.0, METRICS_TOKEN='scrape-me')
+class RequestMetricsTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics_registry.reset()
+
+    def test_fingerprint_collapses_parameter_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'),
+            fingerprint('SELECT  * FROM "t" WHERE "id" IN (%s, %s) LIMIT 5'),
+        )
+        self.assertIn('"team1_marks"', fingerprint('SELECT "team1_marks" FROM "t"'))
+
+    def test_records_queries_per_endpoint(self):
+        game = Game.objects.create(participant_count=2)
+        for index in range(2):
+            GameParticipant.objects.create(game=game, player=make_player(f'metric{index}'), team=index + 1)
+        self.client.get(f'/api/games/{game.match_id}/status/')
+        self.client.get(f'/api/games/{game.match_id}/status/')
+
+        stats = metrics_registry.snapshot()['endpoints']['hpo_app:get_game_status_api']
+        self.assertEqual((stats['requests'], stats['sampled']), (2, 2))
+        self.assertEqual(stats['queries']['max'], 2)
+        self.assertEqual(stats['latency_buckets']['+Inf'], 2)
+        top = metrics_registry.snapshot()['top_fingerprints'][0]
+        self.assertEqual(top['executions'], 2)
+        self.assertEqual(top['endpoints'], {'hpo_app:get_game_status_api': 2})
+
+    def test_unsampled_requests_only_record_latency(self):
+        with override_settings(METRICS_SAMPLE_RATE=0.0):
+            self.client.get('/api/leaderboard/')
+        stats = metrics_registry.snapshot()['endpoints']['hpo_app:get_leaderboard_api']
+        self.assertEqual((stats['requests'], stats['sampled'], stats['queries']['mean']), (1, 0, None))
+        self.assertEqual(metrics_registry.snapshot()['top_fingerprints'], [])
+
+    def test_fingerprint_table_is_bounded(self):
+        bounded = MetricsRegistry(max_fingerprints=1)
+        recorder = QueryRecorder()
+        recorder.fingerprints = {'SELECT 1': [1, 0.001], 'SELECT "a"': [3, 0.002]}
+        bounded.record('view', 200, 0.01, recorder)
+        self.assertEqual(len(bounded.snapshot()['top_fingerprints']), 1)
+        self.assertEqual(bounded.snapshot()['dropped_fingerprints'], 1)
+
+    def test_endpoints_require_staff_or_token(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+        self.client.get('/api/leaderboard/')
+        data = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer scrape-me').json()
+        self.assertIn('hpo_app:get_leaderboard_api', data['metrics']['endpoints'])
+
+        text = self.client.get('/api/metrics/prometheus/', HTTP_AUTHORIZATION='Bearer scrape-me').content.decode()
+        self.assertIn('# TYPE hpo_http_request_duration_seconds histogram', text)
+        self.assertIn('hpo_http_requests_total{endpoint="hpo_app:get_leaderboard_api"} 1', text)
+        self.assertIn('hpo_db_queries_per_request_count{endpoint="hpo_app:get_leaderboard_api"} 1', text)
+
+    def test_report_command_summarizes_log_lines(self):
+        lines = [
+            {'endpoint': 'hpo_app:a', 'status': 200, 'duration_ms': ms, 'queries': 12, 'db_ms': 4.0,
+             'fingerprints': {'SELECT "x" WHERE "id" = %s': [10, 3.0]}}
+            for ms in (10.0, 20.0, 30.0, 40.0)
+        ] + [{'endpoint': 'hpo_app:b', 'status': 500, 'duration_ms': 5.0, 'queries': 1, 'db_ms': 1.0}]
+        handle, path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(handle, 'w') as stream:
+            stream.write('\n'.join(json.dumps(line) for line in lines) + '\nnot json\n')
+        self.addCleanup(os.remove, path)
+
+        out, err = StringIO(), StringIO()
+        call_command('metrics_report', path, '--json', stdout=out, stderr=err)
+        report = json.loads(out.getvalue())
+        first = report['endpoints'][0]
+        self.assertEqual((first['endpoint'], first['requests'], first['p50_ms'], first['p95_ms']), ('hpo_app:a', 4, 20.0, 40.0))
+        self.assertEqual(report['endpoints'][1]['errors'], 1)
+        self.assertEqual(report['top_fingerprints'][0]['max_per_request'], 10)
+        self.assertEqual(report['skipped_lines'], 1)
+
+
+class ScaleSeedingTests(HpoTestCase):
+    def seed(self, prefix='seed', seed=3, questions=1):
+        call_command(
+            'seed_scale', '--players', '12', '--questions-per-card', str(questions), '--content', '5', '--games', '20',
+            '--days', '10', '--seed', str(seed), '--prefix', prefix, '--end-date', '2026-01-31',
+            '--batch-size', '7', stdout=StringIO(), stderr=StringIO(),
+        )
+
+    def test_seeds_consistent_history(self):
+        self.seed()
+        participants = GameParticipant.objects.filter(player__username__startswith='seed_')
+        self.assertEqual(Question.objects.count(), len(CARD_IDS) * 4)
+        self.assertEqual(Game.objects.filter(status='completed', result__isnull=False).count(), 20)
+        self.assertEqual(GameResponse.objects.count(), participants.count())
+        totals = Player.objects.aggregate(played=Sum('games_played'), won=Sum('games_won'))
+        self.assertEqual(totals['played'], participants.count())
+        self.assertEqual(totals['won'], participants.filter(is_winner=True).count())
+        self.assertEqual(LeaderboardEntry.objects.count(), Player.objects.filter(games_played__gt=0).count())
+        self.assertTrue(Game.objects.filter(completed_at__date__lt=date(2026, 1, 25)).exists())
+
+    def test_same_seed_generates_same_games(self):
+        def history(prefix):
+            return list(
+                GameParticipant.objects.filter(player__username__startswith=f'{prefix}_')
+                .order_by('game__completed_at', 'team', 'player__username')
+                .values_list('player__username', 'team', 'marks_earned', 'lost_card')
+            )
+
+        self.seed('first')
+        self.seed('second', questions=0)
+        first, second = history('first'), history('second')
+        self.assertEqual(
+            [(name.split('_')[1], *rest) for name, *rest in first],
+            [(name.split('_')[1], *rest) for name, *rest in second],
+        )
+
+        with self.assertRaises(CommandError):
+            self.seed('first')
+
+
+@override_settings(CONTENT_COUNTER_FLUSH_INTERVAL=3600)
+class ContentCounterTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = GameContent.objects.create(topic='Health', subtopic='Sleep', info='Sleep well.')
+        self.other = GameContent.objects.create(topic='Health', subtopic='Water', info='Drink water.')
+
+    def counts(self, content):
+        content.refresh_from_db()
+        return content.view_count, content.usage_count
+
+    def test_views_are_buffered_until_flush(self):
+        for expected in (1, 2, 3):
+            response = self.client.get(f'/api/game-content/{self.content.pk}/', secure=True)
+            self.assertEqual(response.json()['content']['view_count'], expected)
+        response = self.client.post(
+            '/api/game-content/increment-usage/', data=json.dumps({'content_id': self.content.pk}),
+            content_type='application/json', secure=True,
+        )
+        self.assertEqual(response.json()['content']['usage_count'], 1)
+        self.client.get(f'/api/game-content/{self.other.pk}/', secure=True)
+        self.assertEqual(self.counts(self.content), (0, 0))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(content_counters.flush(), 2)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(self.counts(self.content), (3, 1))
+        self.assertEqual(self.counts(self.other), (1, 0))
+        self.assertEqual(content_counters.flush(), 0)
+
+    def test_flushes_from_several_workers_add_up(self):
+        workers = [CounterBuffer(), CounterBuffer()]
+        for worker in workers:
+            for _ in range(5):
+                worker.add(self.content.pk, 'view_count')
+        self.content.increment_usage_count()
+        for worker in workers:
+            worker.flush()
+        self.assertEqual(self.counts(self.content), (10, 1))
+
+    def test_flush_when_due_after_request(self):
+        content_counters.add(self.content.pk, 'view_count')
+        self.client.get('/api/game-content/', secure=True)
+        self.assertEqual(self.counts(self.content), (0, 0))
+
+        content_counters._last_flush -= 3600
+        self.client.get('/api/game-content/', secure=True)
+        self.assertEqual(self.counts(self.content), (1, 0))
+
+    @override_settings(CONTENT_COUNTER_FLUSH_INTERVAL=0)
+    def test_zero_interval_writes_immediately(self):
+        content_counters.add(self.content.pk, 'usage_count', 2)
+        self.assertEqual(self.counts(self.content), (0, 2))
+
+
+class SearchTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.water = GameContent.objects.create(
+            title='The Water Cycle', topic='Science', subtopic='Water', language='english', status='published',
+            info='Rain falls, rivers flow and the sun evaporates water again.', tags='nature, science',
+            subtopics_data=[{'subtopic': 'Clouds', 'info': 'Condensation forms clouds.'}],
+        )
+        self.history = GameContent.objects.create(
+            title='Kingdom of Rwanda', topic='History', subtopic='Monarchy', language='english', status='published',
+            info='Rivers marked the borders of the old kingdom.',
+        )
+        self.draft = GameContent.objects.create(
+            title='Water draft', topic='Science', subtopic='Water', language='english', status='draft', info='Water.',
+        )
+        self.french = GameContent.objects.create(
+            title="L'économie", topic='Économie', subtopic='Eau', language='french', status='published',
+            info="L'eau et les rivières.",
+        )
+        self.question = make_question(question_text='Which clouds bring rain?', language='english')
+
+    def search(self, **params):
+        response = self.client.get('/api/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_ranks_published_documents_containing_every_term(self):
+        data = self.search(q='water')
+        self.assertEqual([(r['type'], r['id']) for r in data['results']], [('content', self.water.id)])
+
+        data = self.search(q='rivers')
+        self.assertEqual([r['id'] for r in data['results']], [self.water.id, self.history.id])
+        self.assertEqual(self.search(q='clouds rain', type='question')['results'][0]['id'], self.question.id)
+        self.assertEqual(self.search(q='condensation')['total'], 1)
+        self.assertEqual(self.search(q='water kingdom')['total'], 0)
+        self.assertEqual(self.search(q='ECONOMIE')['results'][0]['id'], self.french.id)
+        self.assertEqual(self.search(q='rivers', language='french')['total'], 0)
+        self.assertEqual(self.search(q='evap')['results'][0]['id'], self.water.id)
+
+    def test_title_matches_rank_above_body_matches(self):
+        GameContent.objects.create(
+            title='Kingdom facts', topic='Rivers', subtopic='Nile', language='english', status='published', info='Nile.',
+        )
+        results = self.search(q='rivers')['results']
+        self.assertEqual(results[0]['topic'], 'Rivers')
+        self.assertGreater(results[0]['score'], results[-1]['score'])
+
+    def test_paginates(self):
+        first = self.search(q='rivers', limit=1)
+        second = self.search(q='rivers', limit=1, page=2)
+        self.assertEqual((first['total'], first['has_more'], second['has_more']), (2, True, False))
+        self.assertNotEqual(first['results'][0]['id'], second['results'][0]['id'])
+        self.assertEqual(self.client.get('/api/search/', {'q': 'x', 'limit': 500}).status_code, 400)
+        self.assertEqual(self.client.get('/api/search/').status_code, 400)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.water.title = 'Ocean currents'
+        self.water.info = 'Currents.'
+        self.water.subtopics_data = []
+        self.water.save()
+        self.assertEqual(self.search(q='cycle')['total'], 0)
+        self.assertEqual(self.search(q='ocean')['results'][0]['id'], self.water.id)
+        self.water.delete()
+        self.assertEqual(self.search(q='ocean')['total'], 0)
+
+        SearchIndexEntry.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search(q='kingdom')['results'][0]['id'], self.history.id)
+
+    def test_content_topic_filter_uses_index(self):
+        data = self.client.get('/api/game-content/', {'topic': 'scien'}).json()
+        self.assertEqual([item['id'] for item in data['content']], [self.water.id])
+        data = self.client.get('/api/game-content/english/15-19/', {'topic': 'history'}).json()
+        self.assertEqual(data['success'], True)
+
+
+class ContentTagTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.a = GameContent.objects.create(topic='A', subtopic='a', info='a', tags='Rwanda, Culture', status='published')
+        self.b = GameContent.objects.create(topic='B', subtopic='b', info='b', tags='rwanda,  History ', status='published')
+        self.c = GameContent.objects.create(topic='C', subtopic='c', info='c', tags='culture', status='draft')
+
+    def ids(self, **params):
+        data = self.client.get('/api/game-content/', params).json()
+        return sorted(item['id'] for item in data['content'])
+
+    def test_saves_normalized_tags(self):
+        self.assertEqual(sorted(Tag.objects.values_list('name', flat=True)), ['culture', 'history', 'rwanda'])
+        self.assertEqual(sorted(self.b.tag_set.values_list('name', flat=True)), ['history', 'rwanda'])
+        self.b.tags = 'science'
+        self.b.save()
+        self.assertEqual(list(self.b.tag_set.values_list('name', flat=True)), ['science'])
+
+    def test_filters_with_all_and_any(self):
+        self.assertEqual(self.ids(tags='RWANDA'), sorted([self.a.id, self.b.id]))
+        self.assertEqual(self.ids(tags='rwanda,culture'), [self.a.id])
+        self.assertEqual(self.ids(tags='culture,history', tags_match='any'), sorted([self.a.id, self.b.id]))
+        self.assertEqual(self.ids(tags='culture', status='draft'), [self.c.id])
+        self.assertEqual(self.client.get('/api/game-content/', {'tags': 'x', 'tags_match': 'some'}).status_code, 400)
+
+    def test_tag_cloud_counts_with_one_query(self):
+        with self.assertNumQueries(1):
+            data = self.client.get('/api/game-content/tags/').json()
+        self.assertEqual(data['tags'], [
+            {'name': 'rwanda', 'count': 2}, {'name': 'culture', 'count': 1}, {'name': 'history', 'count': 1},
+        ])
+        self.assertEqual(self.client.get('/api/game-content/tags/', {'limit': 1}).json()['count'], 1)
+
+    def test_rebuild_relinks_bulk_loaded_content(self):
+        GameContent.objects.bulk_create([GameContent(topic='D', subtopic='d', info='d', tags='Music', status='published')])
+        call_command('rebuild_content_tags', stdout=StringIO())
+        self.assertEqual(self.client.get('/api/game-content/', {'tags': 'music'}).json()['count'], 1)
+        self.assertEqual(GameContent.tag_set.through.objects.count(), 6)
+
+
+class GameContentListingTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.contents = [
+            GameContent.objects.create(
+                title=f'Content {i}', topic='Science', subtopic=f'Part {i}', info='Long text. ' * 200,
+                subtopics_data=[{'subtopic': 'More', 'info': 'Details. ' * 50}], status='published', tags='science',
+            )
+            for i in range(5)
+        ]
+        # Same timestamp for two rows, so the id has to break the tie
+        GameContent.objects.filter(pk=self.contents[3].pk).update(created_at=self.contents[2].created_at)
+
+    def get(self, **params):
+        response = self.client.get('/api/game-content/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_walks_pages_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+            data = self.get(**params).json()
+            seen.extend(item['id'] for item in data['content'])
+            cursor = data['next_cursor']
+            self.assertEqual(data['has_more'], cursor is not None)
+            if cursor is None:
+                break
+        expected = GameContent.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(seen, list(expected))
+        self.assertEqual(self.client.get('/api/game-content/', {'cursor': 'bogus'}).status_code, 400)
+
+    def test_summary_and_fields_projection(self):
+        full = self.get()
+        summary = self.get(view='summary')
+        item = summary.json()['content'][0]
+        self.assertNotIn('info', item)
+        self.assertNotIn('all_subtopics', item)
+        self.assertEqual(item['tags'], ['science'])
+        self.assertLess(len(summary.content) * 10, len(full.content))
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(fields='title').json()
+        self.assertEqual(data['content'][0], {'id': self.contents[4].id, 'title': 'Content 4'})
+        select = queries.captured_queries[0]['sql']
+        self.assertNotIn('"info"', select)
+        self.assertNotIn('"subtopics_data"', select)
+
+        self.assertEqual(self.client.get('/api/game-content/', {'fields': 'title,secret'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/game-content/', {'view': 'tiny'}).status_code, 400)
+
+
+class ConditionalCatalogTests(HpoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.question = make_question(question_text='Conditional question')
+        self.content = GameContent.objects.create(topic='Science', subtopic='Light', info='Light.', status='published')
+
+    def revalidate(self, path, response, **params):
+        return self.client.get(path, params, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_catalog_returns_not_modified(self):
+        for path, params in (('/api/questions/', {'limit': 10}), ('/api/game-content/', {'view': 'summary'})):
+            first = self.client.get(path, params)
+            self.assertEqual(first.status_code, 200)
+            self.assertIn('no-cache', first['Cache-Control'])
+            with self.assertNumQueries(1):
+                second = self.revalidate(path, first, **params)
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(second.content, b'')
+            # Deletes would not move a Last-Modified, so none is offered
+            self.assertFalse(first.has_header('Last-Modified'))
+
+    def test_changes_produce_a_new_etag(self):
+        questions = self.client.get('/api/questions/')
+        content = self.client.get('/api/game-content/')
+
+        make_question(question_text='Another question')
+        self.assertEqual(self.revalidate('/api/questions/', questions).status_code, 200)
+        self.question.delete()
+        self.assertEqual(self.revalidate('/api/questions/', questions).status_code, 200)
+
+        # Counter flushes bypass updated_at but are part of the full listing's version
+        content_counters.add(self.content.pk, 'view_count')
+        content_counters.flush()
+        self.assertEqual(self.revalidate('/api/game-content/', content).status_code, 200)
+
+    def test_etags_cover_only_the_page_window(self):
+        later = [make_question(question_text=f'Later {i}') for i in range(2)]
+        first = self.client.get('/api/questions/', {'limit': 1})
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.revalidate('/api/questions/', first, limit=1).status_code, 304)
+        self.assertIn('LIMIT 2', ctx.captured_queries[0]['sql'])
+
+        # Beyond the limit + 1 window: the page is unchanged
+        later[1].question_text = 'Edited'
+        later[1].save()
+        self.assertEqual(self.revalidate('/api/questions/', first, limit=1).status_code, 304)
+        # A deleted row lets the next one into the window
+        later[0].delete()
+        self.assertEqual(self.revalidate('/api/questions/', first, limit=1).status_code, 200)
+
+        params = {'language': 'english', 'view': 'summary'}
+        content = self.client.get('/api/game-content/', params)
+        GameContent.objects.create(topic='Culture', subtopic='Dance', info='Dance.', status='published', language='french')
+        self.assertEqual(self.revalidate('/api/game-content/', content, **params).status_code, 304)
+        GameContent.objects.create(topic='Culture', subtopic='Song', info='Song.', status='published', language='english')
+        self.assertEqual(self.revalidate('/api/game-content/', content, **params).status_code, 200)
+
+    def test_filters_have_their_own_etags(self):
+        english = self.client.get('/api/questions/', {'language': 'english'})
+        french = self.client.get('/api/questions/', {'language': 'french'})
+        self.assertNotEqual(english['ETag'], french['ETag'])
+        self.assertEqual(self.client.get('/api/questions/', {'limit': 0}).status_code, 400)
+
+    def test_package_endpoints_track_question_links(self):
+        package = QuestionPackage.objects.create(
+            name='Pack', description='Pack', type='public', category='general', visibility='public', status='published',
+            created_by=make_player('packager'),
+        )
+        package.questions.add(self.question)
+        paths = ['/api/packages/', f'/api/packages/{package.pk}/questions/']
+        first = {path: self.client.get(path) for path in paths}
+        for path in paths:
+            self.assertEqual(self.revalidate(path, first[path]).status_code, 304)
+
+        package.questions.add(make_question(question_text='Added later'))
+        for path in paths:
+            self.assertEqual(self.revalidate(path, first[path]).status_code, 200)
+        self.assertEqual(self.client.get('/api/packages/999/questions/').status_code, 404)
+
+    def test_package_etags_change_when_a_question_link_is_swapped(self):
+        package = QuestionPackage.objects.create(
+            name='Pack', description='Pack', type='public', category='general', visibility='public', status='published',
+            created_by=make_player('swapper'),
+        )
+        other = make_question(question_text='Swapped in')
+        package.questions.add(self.question)
+        QuestionPackage.objects.filter(pk=package.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        paths = ['/api/packages/', f'/api/packages/{package.pk}/questions/']
+        first = {path: self.client.get(path) for path in paths}
+
+        # Same number of links and no question edited, so only the link change bump tells them apart
+        package.questions.remove(self.question)
+        other.packages.add(package)
+        for path in paths:
+            self.assertEqual(self.revalidate(path, first[path]).status_code, 200, path)
+
+        second = {path: self.client.get(path) for path in paths}
+        self.question.packages.clear()
+        other.packages.clear()
+        for path in paths:
+            self.assertEqual(self.revalidate(path, second[path]).status_code, 200, path)
+
+    def test_static_form_data_needs_no_query(self):
+        first = self.client.get('/api/v1/form-data/genders/')
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            second = self.revalidate('/api/v1/form-data/genders/', first)
+        self.assertEqual(second.status_code, 304)
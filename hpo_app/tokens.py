@@ -0,0 +1,112 @@
+"""
+Signed, expiring player tokens
+
+A token is ``signing.Signer``-signed JSON carrying the player id, the expiry
+(unix seconds) and a random token id, e.g. ``eyJwIjo0MiwiZSI6...:<hmac>``.
+Signature and expiry are checked without touching the database. Logout adds
+the token id to ``RevokedToken``; each worker keeps the unexpired revoked ids
+in memory and reloads them every ``PLAYER_TOKEN_REVOCATION_REFRESH`` seconds.
+
+Tokens are valid for ``PLAYER_TOKEN_TTL`` seconds. Legacy tokens (the
+permanent ``Player.uuid``) are still accepted by ``PlayerTokenAuthentication``
+while ``PLAYER_TOKEN_ACCEPT_LEGACY`` is enabled.
+"""
+import secrets
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+TOKEN_SALT = 'hpo_app.player_token'
+
+_signer = signing.Signer(salt=TOKEN_SALT)
+
+
+def token_ttl():
+    return getattr(settings, 'PLAYER_TOKEN_TTL', 7 * 24 * 3600)
+
+
+def accept_legacy_tokens():
+    return getattr(settings, 'PLAYER_TOKEN_ACCEPT_LEGACY', True)
+
+
+def issue_token(player, ttl=None):
+    """Return (token, expires_at) for a new signed token"""
+    expires = int(time.time()) + (token_ttl() if ttl is None else ttl)
+    token = _signer.sign_object({'p': player.pk, 'e': expires, 'j': secrets.token_hex(8)})
+    return token, datetime.fromtimestamp(expires, tz=dt_timezone.utc)
+
+
+def read_token(token):
+    """
+    Return the payload {'p': player id, 'e': expiry, 'j': token id} of a valid,
+    unexpired and unrevoked token, or None
+    """
+    try:
+        payload = _signer.unsign_object(token)
+    except (signing.BadSignature, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get('e', 0) <= time.time():
+        return None
+    if revocation_list.is_revoked(payload.get('j')):
+        return None
+    return payload
+
+
+def revoke_token(token):
+    """Revoke a signed token until its expiry; returns False for invalid tokens"""
+    payload = read_token(token)
+    if payload is None:
+        return False
+    expires_at = datetime.fromtimestamp(payload['e'], tz=dt_timezone.utc)
+    RevokedToken.objects.get_or_create(
+        jti=payload['j'], defaults={'player_id': payload['p'], 'expires_at': expires_at}
+    )
+    # Expired entries can never match again
+    RevokedToken.objects.filter(expires_at__lt=timezone.now()).delete()
+    revocation_list.add(payload['j'])
+    return True
+
+
+class RevocationList:
+    """Per-worker copy of the ids of unexpired revoked tokens"""
+
+    def __init__(self, refresh=None):
+        self._refresh = refresh
+        self._ids = frozenset()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def refresh(self):
+        if self._refresh is not None:
+            return self._refresh
+        return getattr(settings, 'PLAYER_TOKEN_REVOCATION_REFRESH', 30)
+
+    def is_revoked(self, jti):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at >= self.refresh:
+            ids = frozenset(
+                RevokedToken.objects.filter(expires_at__gte=timezone.now()).values_list('jti', flat=True)
+            )
+            with self._lock:
+                self._ids, self._loaded_at = ids, now
+        return jti in self._ids
+
+    def add(self, jti):
+        with self._lock:
+            self._ids = self._ids | {jti}
+
+    def invalidate(self):
+        """Reload from the database on the next check"""
+        with self._lock:
+            self._loaded_at = None
+
+
+revocation_list = RevocationList()
@@ -24,6 +24,7 @@ urlpatterns = [
     path('api/games/complete/', views.complete_game_api, name='complete_game_api'),
     path('api/games/submit-completed/', views.submit_completed_game_api, name='submit_completed_game_api'),
     path('api/games/submit-player-result/', views.submit_player_result_api, name='submit_player_result_api'),
+    path('api/games/submit-results/', views.submit_game_results_api, name='submit_game_results_api'),
     path('api/games/<uuid:match_id>/responses/', views.get_game_responses_api, name='get_game_responses_api'),
     path('api/games/<uuid:match_id>/status/', views.get_game_status_api, name='get_game_status_api'),
     path('api/games/submit-answer/', views.submit_answer_api, name='submit_answer_api'),
@@ -34,12 +35,18 @@ urlpatterns = [
     path('api/players/<str:username>/stats/', views.get_player_stats_api, name='get_player_stats_api'),
     path('api/leaderboard/', views.get_leaderboard_api, name='get_leaderboard_api'),
     
+    # Request metrics (staff or METRICS_TOKEN)
+    path('api/metrics/', views.metrics_api, name='metrics_api'),
+    path('api/metrics/prometheus/', views.metrics_prometheus, name='metrics_prometheus'),
+    
     # Game Content API endpoints
     path('api/game-content/', views.get_game_content_api, name='get_game_content_api'),
+    path('api/game-content/tags/', views.game_content_tags_api, name='game_content_tags_api'),
     path('api/game-content/<int:content_id>/', views.get_game_content_detail_api, name='get_game_content_detail_api'),
     path('api/game-content/<str:language>/<str:age_group>/', views.get_game_content_by_language_age_api, name='get_game_content_by_language_age_api'),
     path('api/game-content/<int:content_id>/update/', views.update_game_content_api, name='update_game_content_api'),
     path('api/game-content/<int:content_id>/delete/', views.delete_game_content_api, name='delete_game_content_api'),
     path('api/game-content/create/', views.create_game_content_api, name='create_game_content_api'),
     path('api/game-content/increment-usage/', views.increment_content_usage_api, name='increment_content_usage_api'),
+    path('api/search/', views.search_api, name='search_api'),
 ]
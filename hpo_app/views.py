@@ -1,15 +1,92 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from .models import Question, QuestionPackage, Game, GameParticipant, GameResult, GameResponse, Player, GameContent, Topic, Subtopic
+from .models import Question, QuestionPackage, Game, GameParticipant, GameResult, GameResponse, Player, LeaderboardEntry, GameContent, Topic, Subtopic
+from . import leaderboard, search, tags
+from .metrics import registry as metrics_registry
+from .authentication import token_cache
+from .cards import CARD_IDS, get_card_info, is_valid_card
+from .conditional import catalog_condition, catalog_version
+from .counters import content_counters
+from .question_cache import questions_for_card, questions_for_cards
+from .question_sampling import random_question, random_questions
+import base64
+import binascii
+import hmac
 import json
 import random
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.db import transaction
-from django.db.models import Sum
+from django.db.models import Count, F, Max, Prefetch, Q, Sum
+
+# Keyset pagination limits for question listings
+QUESTIONS_PAGE_SIZE = 100
+QUESTIONS_MAX_PAGE_SIZE = 1000
+QUESTIONS_STREAM_CHUNK_SIZE = 500
+LEADERBOARD_MAX_LIMIT = 100
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+TAG_CLOUD_SIZE = 50
+CONTENT_PAGE_SIZE = 100
+CONTENT_MAX_PAGE_SIZE = 1000
+TAG_CLOUD_MAX_SIZE = 500
+
+# Allowed values for the question filters, backed by the Question indexes
+QUESTION_FILTER_CHOICES = {
+    'language': tuple(choice[0] for choice in Question.LANGUAGE_CHOICES),
+    'difficulty': tuple(choice[0] for choice in Question._meta.get_field('difficulty').choices),
+    'question_type': tuple(choice[0] for choice in Question._meta.get_field('question_type').choices),
+    'card': CARD_IDS,
+}
 
 # Helper function to avoid code duplication
+def serialize_question(question):
+    """Return the public JSON representation of a question"""
+    return {
+        'id': question.id,
+        'question_text': question.question_text,
+        'question_type': question.question_type,
+        'options': question.options,
+        'correct_answer': question.correct_answer,
+        'explanation': question.explanation,
+        'points': question.points,
+        'difficulty': question.difficulty,
+        'card': question.card,
+        'card_info': question.get_card_info(),
+        'created_at': question.created_at.isoformat(),
+    }
+
+def parse_question_filters(params, fields=tuple(QUESTION_FILTER_CHOICES)):
+    """
+    Extract question filters from query parameters or a JSON payload
+    Returns (filters, error) where error is a message for invalid values
+    """
+    filters = {}
+    for field in fields:
+        value = params.get(field)
+        if not value:
+            continue
+        if value not in QUESTION_FILTER_CHOICES[field]:
+            return None, f'Invalid {field}. Valid options: {", ".join(QUESTION_FILTER_CHOICES[field])}'
+        filters[field] = value
+    return filters, None
+
+def filter_questions(queryset, filters):
+    """Apply parsed question filters to a queryset"""
+    return queryset.filter(**filters)
+
+def filter_question_records(records, filters):
+    """Apply parsed question filters to cached question records"""
+    if not filters:
+        return records
+    return [
+        record for record in records
+        if all(getattr(record, field) == value for field, value in filters.items())
+    ]
+
 def create_game_participant(game, player, team, is_winner, lost_card=None):
     """
     Helper function to create a game participant with proper marks allocation
@@ -38,20 +115,16 @@ def create_game_participant(game, player, team, is_winner, lost_card=None):
     
     return participant
 
-def generate_post_game_response(participant, lost_card=None):
+def build_post_game_response(participant, lost_card=None, question=None):
     """
-    Helper function to generate appropriate response for winners/losers
-    Returns response data and creates GameResponse record
+    Build the response for a winner/loser without touching the database
+    `question` is the fun fact source for winners or the question for losers
+    Returns (response_data, unsaved GameResponse or None)
     """
-    response_data = {}
-    
     if participant.is_winner:
         # Winners get explanation (fun fact) from a question
-        # Get random question explanation for winner
-        all_questions = Question.objects.all()
-        if all_questions.exists():
-            random_question = all_questions.order_by('?').first()
-            explanation_text = random_question.explanation
+        if question is not None:
+            explanation_text = question.explanation
         else:
             explanation_text = 'Congratulations on your victory!'
             
@@ -60,55 +133,68 @@ def generate_post_game_response(participant, lost_card=None):
             'explanation': explanation_text,
             'marks_earned': participant.marks_earned
         }
-            
-        # Create winner response in GameResponse model
-        GameResponse.objects.create(
+        
+        game_response = GameResponse(
             game=participant.game,
             participant=participant,
             response_type='fun_fact',
             fun_fact_text=explanation_text
         )
-        
+        return response_data, game_response
+    
+    # Losers get full question object for their lost card
+    if not lost_card:
+        return {
+            'type': 'no_card',
+            'message': 'No card specified for loser'
+        }, None
+    
+    if question is None:
+        return {
+            'type': 'no_question',
+            'message': f'No questions available for card {lost_card}'
+        }, None
+    
+    response_data = {
+        'type': 'question',
+        'question': {
+            'id': question.id,
+            'question_text': question.question_text,
+            'question_type': question.question_type,
+            'options': question.options,
+            'correct_answer': question.correct_answer,  # Frontend will validate
+            'explanation': question.explanation,
+            'points': question.points,
+            'difficulty': question.difficulty,
+            'card': question.card,
+            'card_info': question.get_card_info()
+        },
+        'instruction': 'Answer this question correctly to earn 1 mark'
+    }
+    
+    game_response = GameResponse(
+        game=participant.game,
+        participant=participant,
+        response_type='question',
+        question_id=question.id
+    )
+    return response_data, game_response
+
+def generate_post_game_response(participant, lost_card=None):
+    """
+    Helper function to generate appropriate response for winners/losers
+    Returns response data and creates GameResponse record
+    """
+    if participant.is_winner:
+        # Get random question explanation for winner
+        question = random_question()
     else:
-        # Losers get full question object for their lost card
-        if lost_card:
-            questions = Question.objects.filter(card=lost_card)
-            if questions.exists():
-                question = questions.first()
-                response_data = {
-                    'type': 'question',
-                    'question': {
-                        'id': question.id,
-                        'question_text': question.question_text,
-                        'question_type': question.question_type,
-                        'options': question.options,
-                        'correct_answer': question.correct_answer,  # Frontend will validate
-                        'explanation': question.explanation,
-                        'points': question.points,
-                        'difficulty': question.difficulty,
-                        'card': question.card,
-                        'card_info': question.get_card_info()
-                    },
-                    'instruction': 'Answer this question correctly to earn 1 mark'
-                }
-                
-                # Create loser response in GameResponse model
-                GameResponse.objects.create(
-                    game=participant.game,
-                    participant=participant,
-                    response_type='question',
-                    question=question
-                )
-            else:
-                response_data = {
-                    'type': 'no_question',
-                    'message': f'No questions available for card {lost_card}'
-                }
-        else:
-            response_data = {
-                'type': 'no_card',
-                'message': 'No card specified for loser'
-            }
+        questions = questions_for_card(lost_card) if lost_card else ()
+        question = questions[0] if questions else None
+    
+    response_data, game_response = build_post_game_response(participant, lost_card, question)
+    if game_response is not None:
+        game_response.save()
     
     return response_data
 
@@ -116,44 +202,56 @@ def finalize_game_if_complete(game):
     """
     Helper function to check if game is complete and finalize it
     Returns game status information
+
+    The game row is locked for the rest of the transaction, so when the last
+    submissions arrive together exactly one of them finalizes the game.
+    Participant count, team winners and team marks come from one aggregate query.
     """
-    participants_submitted = game.participants.count()
-    participants_expected = game.participant_count
-    
-    if participants_submitted >= participants_expected:
-        game.status = 'completed'
-        game.completed_at = timezone.now()
-        
-        # Determine winning team
-        team1_winners = game.participants.filter(team=1, is_winner=True).count()
-        team2_winners = game.participants.filter(team=2, is_winner=True).count()
-        
-        if team1_winners > team2_winners:
-            game.winning_team = 1
-        elif team2_winners > team1_winners:
-            game.winning_team = 2
-        # If tie, leave winning_team as None
-        
-        game.save()
-        
-        # Create or update game result
-        team1_marks = game.participants.filter(team=1).aggregate(
-            total=Sum('marks_earned'))['total'] or 0
-        team2_marks = game.participants.filter(team=2).aggregate(
-            total=Sum('marks_earned'))['total'] or 0
-        
-        GameResult.objects.get_or_create(
-            game=game,
-            defaults={
-                'team1_marks': team1_marks,
-                'team2_marks': team2_marks,
-                'result_summary': {
-                    'winning_team': game.winning_team,
-                    'completed_at': game.completed_at.isoformat(),
-                    'participants_count': participants_submitted
-                }
-            }
+    with transaction.atomic():
+        locked = Game.objects.select_for_update().get(pk=game.pk)
+        totals = locked.participants.aggregate(
+            submitted=Count('id'),
+            team1_winners=Count('id', filter=Q(team=1, is_winner=True)),
+            team2_winners=Count('id', filter=Q(team=2, is_winner=True)),
+            team1_marks=Sum('marks_earned', filter=Q(team=1)),
+            team2_marks=Sum('marks_earned', filter=Q(team=2)),
         )
+        participants_submitted = totals['submitted']
+        participants_expected = locked.participant_count
+        
+        if participants_submitted >= participants_expected and locked.status != 'completed':
+            locked.status = 'completed'
+            locked.completed_at = timezone.now()
+            
+            # Determine winning team, if tie leave winning_team as None
+            if totals['team1_winners'] > totals['team2_winners']:
+                locked.winning_team = 1
+            elif totals['team2_winners'] > totals['team1_winners']:
+                locked.winning_team = 2
+            
+            locked.save(update_fields=['status', 'completed_at', 'winning_team', 'updated_at'])
+            
+            # Create or update game result
+            GameResult.objects.get_or_create(
+                game=locked,
+                defaults={
+                    'team1_marks': totals['team1_marks'] or 0,
+                    'team2_marks': totals['team2_marks'] or 0,
+                    'result_summary': {
+                        'winning_team': locked.winning_team,
+                        'completed_at': locked.completed_at.isoformat(),
+                        'participants_count': participants_submitted
+                    }
+                }
+            )
+        elif locked.status == 'completed':
+            # A late submission added a participant to a finalized game
+            locked.mark_changed()
+    
+    # Keep the caller's instance in sync with the row
+    game.status = locked.status
+    game.completed_at = locked.completed_at
+    game.winning_team = locked.winning_team
     
     return {
         'participants_submitted': participants_submitted,
@@ -170,6 +268,7 @@ def questions_by_card_api(request):
     """
     API endpoint to get questions by card for unauthenticated users
     POST payload: {"card": "S3"} or {"card": "HJ"} etc.
+    Optional payload filters: language, difficulty, question_type
     """
     try:
         # Parse JSON payload
@@ -183,15 +282,22 @@ def questions_by_card_api(request):
             }, status=400)
         
         # Validate card format
-        valid_cards = [choice[0] for choice in Question.CARD_CHOICES]
-        if card not in valid_cards:
+        if not is_valid_card(card):
             return JsonResponse({
                 'success': False,
-                'error': f'Invalid card. Valid cards are: {", ".join(valid_cards)}'
+                'error': f'Invalid card. Valid cards are: {", ".join(CARD_IDS)}'
+            }, status=400)
+        
+        filters, error = parse_question_filters(data, fields=('language', 'difficulty', 'question_type'))
+        if error:
+            return JsonResponse({
+                'success': False,
+                'error': error
             }, status=400)
         
         # Get questions for the specified card
-        questions = Question.objects.filter(card=card)
+        questions = questions_for_card(card, filters.pop('language', None))
+        questions = filter_question_records(questions, filters)
         
         # Convert to JSON format
         questions_data = []
@@ -213,8 +319,7 @@ def questions_by_card_api(request):
             questions_data.append(question_data)
         
         # Get card info for the requested card
-        dummy_question = Question(card=card)
-        card_info = dummy_question.get_card_info()
+        card_info = get_card_info(card)
         
         return JsonResponse({
             'success': True,
@@ -236,37 +341,79 @@ def questions_by_card_api(request):
             'error': str(e)
         }, status=500)
 
+def parse_questions_page(params):
+    """
+    Return (questions after the cursor that pass the filters, limit, filters, error)
+    for a questions listing request; the queryset is ordered by id
+    """
+    try:
+        cursor = int(params.get('cursor', 0))
+        limit = int(params.get('limit', QUESTIONS_PAGE_SIZE))
+    except ValueError:
+        return None, None, None, 'cursor and limit must be integers'
+    if limit < 1 or limit > QUESTIONS_MAX_PAGE_SIZE:
+        return None, None, None, f'limit must be between 1 and {QUESTIONS_MAX_PAGE_SIZE}'
+    filters, error = parse_question_filters(params)
+    if error:
+        return None, None, None, error
+    return filter_questions(Question.objects.filter(id__gt=cursor), filters).order_by('id'), limit, filters, None
+
+
+def questions_version(request):
+    """Validators of a questions page, aggregated over the rows the page is built from"""
+    questions, limit, _, error = parse_questions_page(request.GET)
+    if error:
+        return None
+    if request.GET.get('format') == 'ndjson':
+        # The stream serves every question after the cursor
+        return catalog_version(questions)
+    # The limit + 1 ids after the cursor; the last id moves when rows enter or leave the window
+    window = questions[:limit + 1].values('id')
+    return catalog_version(Question.objects.filter(pk__in=window), last_id=Max('id'))
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
+@catalog_condition(questions_version)
 def questions_api(request):
     """
     API endpoint to get questions as JSON for unauthenticated users
+    Query parameters:
+    - cursor: id of the last question already received (default 0)
+    - limit: page size (default 100, max 1000)
+    - format: 'ndjson' to stream every question after the cursor, one JSON object per line
+    - language, difficulty, question_type, card: optional filters
+    
+    Pages are ordered by id; pass next_cursor back as cursor to get the next page.
     """
     try:
-        # Get all questions
-        questions = Question.objects.all()
+        questions, limit, filters, error = parse_questions_page(request.GET)
+        if error:
+            return JsonResponse({
+                'success': False,
+                'error': error
+            }, status=400)
         
-        # Convert to JSON format
-        questions_data = []
-        for question in questions:
-            question_data = {
-                'id': question.id,
-                'question_text': question.question_text,
-                'question_type': question.question_type,
-                'options': question.options,
-                'correct_answer': question.correct_answer,
-                'explanation': question.explanation,
-                'points': question.points,
-                'difficulty': question.difficulty,
-                'card': question.card,
-                'card_info': question.get_card_info(),
-                'created_at': question.created_at.isoformat(),
-            }
-            questions_data.append(question_data)
+        if request.GET.get('format') == 'ndjson':
+            # Stream with a server-side iterator so memory stays flat for any table size
+            rows = questions.iterator(chunk_size=QUESTIONS_STREAM_CHUNK_SIZE)
+            return StreamingHttpResponse(
+                (json.dumps(serialize_question(question)) + '\n' for question in rows),
+                content_type='application/x-ndjson'
+            )
+        
+        # Fetch one extra row to know whether another page exists
+        questions_data = [serialize_question(question) for question in questions[:limit + 1]]
+        has_more = len(questions_data) > limit
+        questions_data = questions_data[:limit]
         
         return JsonResponse({
             'success': True,
             'count': len(questions_data),
+            'limit': limit,
+            'next_cursor': questions_data[-1]['id'] if has_more else None,
+            'has_more': has_more,
+            'filters_applied': filters,
             'questions': questions_data
         })
     
@@ -286,23 +433,9 @@ def question_detail_api(request, question_id):
     try:
         question = Question.objects.get(id=question_id)
         
-        question_data = {
-            'id': question.id,
-            'question_text': question.question_text,
-            'question_type': question.question_type,
-            'options': question.options,
-            'correct_answer': question.correct_answer,
-            'explanation': question.explanation,
-            'points': question.points,
-            'difficulty': question.difficulty,
-            'card': question.card,
-            'card_info': question.get_card_info(),
-            'created_at': question.created_at.isoformat(),
-        }
-        
         return JsonResponse({
             'success': True,
-            'question': question_data
+            'question': serialize_question(question)
         })
     
     except Question.DoesNotExist:
@@ -318,8 +451,14 @@ def question_detail_api(request, question_id):
         }, status=500)
 
 
+def packages_version(request):
+    # Link changes bump the package's updated_at (signals.py); cascade deletes of questions only change the count
+    return catalog_version(QuestionPackage.objects.filter(status='published'), question_links=Count('questions'))
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
+@catalog_condition(packages_version)
 def packages_api(request):
     """
     API endpoint to get question packages as JSON
@@ -362,8 +501,19 @@ def packages_api(request):
         }, status=500)
 
 
+def package_questions_version(request, package_id):
+    package_updated_at = (
+        QuestionPackage.objects.filter(id=package_id, status='published').values_list('updated_at', flat=True).first()
+    )
+    if package_updated_at is None:
+        return None
+    # package_updated_at moves whenever a question is linked or unlinked (signals.py)
+    return catalog_version(Question.objects.filter(packages=package_id)) + [('package_updated_at', package_updated_at)]
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
+@catalog_condition(package_questions_version)
 def package_questions_api(request, package_id):
     """
     API endpoint to get questions from a specific package
@@ -498,12 +648,11 @@ def complete_game_api(request):
         
         # Validate cards_chosen if provided
         if cards_chosen:
-            valid_cards = [choice[0] for choice in Question.CARD_CHOICES]
-            invalid_cards = [card for card in cards_chosen if card not in valid_cards]
+            invalid_cards = [card for card in cards_chosen if not is_valid_card(card)]
             if invalid_cards:
                 return JsonResponse({
                     'success': False,
-                    'error': f'Invalid cards: {", ".join(invalid_cards)}. Valid cards are: {", ".join(valid_cards)}'
+                    'error': f'Invalid cards: {", ".join(invalid_cards)}. Valid cards are: {", ".join(CARD_IDS)}'
                 }, status=400)
         
         try:
@@ -570,9 +719,8 @@ def complete_game_api(request):
                     participant.save()
             elif losing_players:
                 # If no cards chosen, assign random cards to losing players
-                all_cards = [choice[0] for choice in Question.CARD_CHOICES]
                 for participant in losing_players:
-                    participant.lost_card = random.choice(all_cards)
+                    participant.lost_card = random.choice(CARD_IDS)
                     participant.save()
             
             # Create game result
@@ -622,38 +770,46 @@ def get_game_responses_api(request, match_id):
                 'error': 'Game not found or not completed'
             }, status=404)
         
+        # Participants with players, their stored responses and every card's
+        # questions are loaded up front, so the query count does not grow
+        # with the number of participants
+        participants = list(game.participants.select_related('player').order_by('id'))
+        existing = {
+            response.participant_id: response
+            for response in GameResponse.objects.filter(game=game).select_related('question').order_by('id')
+        }
+        cards = list(game.cards_chosen or [])
+        cards += [p.lost_card for p in participants if not p.is_winner and p.lost_card]
+        card_questions = questions_for_cards(cards) if cards else {}
+        
+        # Fun fact from the first chosen card that has an explanation
+        fun_fact_card = None
+        fun_fact_text = "Congratulations on winning!"
+        for card in game.cards_chosen or []:
+            question = next((q for q in card_questions.get(card, ()) if q.explanation), None)
+            if question is not None:
+                fun_fact_text = question.explanation
+                fun_fact_card = card
+                break
+        
         responses_data = []
+        new_responses = []
         
-        for participant in game.participants.all():
+        for participant in participants:
+            response = existing.get(participant.id)
             if participant.is_winner:
-                # Winner gets fun fact from chosen cards
-                fun_fact_card = None
-                fun_fact_text = "Congratulations on winning!"
-                
-                # Try to get fun fact from chosen cards
-                if game.cards_chosen:
-                    for card in game.cards_chosen:
-                        card_questions = Question.objects.filter(
-                            card=card,
-                            explanation__isnull=False
-                        ).exclude(explanation='')
-                        
-                        if card_questions.exists():
-                            question = card_questions.first()
-                            fun_fact_text = question.explanation
-                            fun_fact_card = card
-                            break
-                
-                # Create response record
-                response, created = GameResponse.objects.get_or_create(
-                    game=game,
-                    participant=participant,
-                    defaults={
-                        'response_type': 'fun_fact',
-                        'fun_fact_text': fun_fact_text,
-                        'fun_fact_card': fun_fact_card
-                    }
-                )
+                if response is not None and response.response_type == 'fun_fact':
+                    text, card = response.fun_fact_text, response.fun_fact_card
+                else:
+                    text, card = fun_fact_text, fun_fact_card
+                    if response is None:
+                        new_responses.append(GameResponse(
+                            game=game,
+                            participant=participant,
+                            response_type='fun_fact',
+                            fun_fact_text=text,
+                            fun_fact_card=card
+                        ))
                 
                 responses_data.append({
                     'username': participant.player.username,
@@ -661,28 +817,25 @@ def get_game_responses_api(request, match_id):
                     'team': participant.team,
                     'is_winner': True,
                     'response_type': 'fun_fact',
-                    'fun_fact': fun_fact_text,
-                    'card': fun_fact_card,
-                    'card_info': Question(card=fun_fact_card).get_card_info() if fun_fact_card else None
+                    'fun_fact': text,
+                    'card': card,
+                    'card_info': get_card_info(card)
                 })
             
             else:
                 # Loser gets question related to their assigned card
                 if participant.lost_card:
-                    card_questions = Question.objects.filter(card=participant.lost_card)
-                    if card_questions.exists():
-                        question = random.choice(card_questions)
-                        
-                        # Create response record
-                        response, created = GameResponse.objects.get_or_create(
+                    question = response.question if response is not None else None
+                    if question is None and response is None and card_questions.get(participant.lost_card):
+                        question = random.choice(card_questions[participant.lost_card])
+                        new_responses.append(GameResponse(
                             game=game,
                             participant=participant,
-                            defaults={
-                                'response_type': 'question',
-                                'question': question
-                            }
-                        )
-                        
+                            response_type='question',
+                            question_id=question.id
+                        ))
+                    
+                    if question is not None:
                         responses_data.append({
                             'username': participant.player.username,
                             'player_name': participant.player.player_name,
@@ -709,7 +862,7 @@ def get_game_responses_api(request, match_id):
                             'is_winner': False,
                             'response_type': 'question',
                             'card': participant.lost_card,
-                            'card_info': Question(card=participant.lost_card).get_card_info(),
+                            'card_info': get_card_info(participant.lost_card),
                             'question': None,
                             'message': 'No questions available for this card'
                         })
@@ -726,6 +879,10 @@ def get_game_responses_api(request, match_id):
                         'message': 'No card assigned'
                     })
         
+        if new_responses:
+            GameResponse.objects.bulk_create(new_responses)
+            game.mark_changed()
+        
         return JsonResponse({
             'success': True,
             'game': {
@@ -787,21 +944,16 @@ def submit_answer_api(request):
             # Update response
             response.player_answer = answer
             response.is_correct = is_correct
-            response.save()
+            response.save(update_fields=['player_answer', 'is_correct'])
             
             # Update participant
             participant.question_answered = True
             participant.answer_correct = is_correct
-            participant.save()
+            participant.save(update_fields=['question_answered', 'answer_correct'])
+            game.mark_changed()
             
             # Update player's question answering statistics
-            current_correct = participant.player.correct_answers
-            current_total = participant.player.questions_answered
-            
-            participant.player.questions_answered = current_total + 1
-            if is_correct:
-                participant.player.correct_answers = current_correct + 1
-            participant.player.save()
+            participant.player.record_answer(correct=is_correct)
             
             return JsonResponse({
                 'success': True,
@@ -833,7 +985,11 @@ def get_game_status_api(request, match_id):
     """
     try:
         try:
-            game = Game.objects.get(match_id=match_id)
+            # The result (reverse one-to-one) is joined in; participants and
+            # their players are loaded with one more query
+            game = Game.objects.select_related('result').prefetch_related(
+                Prefetch('participants', queryset=GameParticipant.objects.select_related('player').order_by('id'))
+            ).get(match_id=match_id)
         except Game.DoesNotExist:
             return JsonResponse({
                 'success': False,
@@ -952,56 +1108,92 @@ def get_leaderboard_api(request):
     Get player leaderboard based on various metrics
     Query parameters:
     - metric: 'win_rate', 'total_marks', 'games_won', 'answer_accuracy', 'win_streak'
-    - limit: number of players to return (default 10)
+    - limit: number of players to return (default 10, max 100)
+    - province, district, age_group, organization: restrict to a scoped board
+    - username: also return this player's rank on the board as "my_rank"
+    - window: 'day', 'week' or 'month' to rank the current period only (default all-time)
+    
+    win_rate and answer_accuracy only rank players with at least
+    LEADERBOARD_MIN_GAMES games / LEADERBOARD_MIN_ANSWERS answers.
+    Windowed boards are read from the rollups kept by `manage.py rollup_player_stats`.
     """
     try:
         metric = request.GET.get('metric', 'total_marks')
-        limit = int(request.GET.get('limit', 10))
+        try:
+            limit = int(request.GET.get('limit', 10))
+        except ValueError:
+            limit = -1
+        if not 1 <= limit <= LEADERBOARD_MAX_LIMIT:
+            return JsonResponse({
+                'success': False,
+                'error': f'limit must be an integer between 1 and {LEADERBOARD_MAX_LIMIT}'
+            }, status=400)
         
         # Validate metric
-        valid_metrics = ['win_rate', 'total_marks', 'games_won', 'answer_accuracy', 'win_streak']
+        valid_metrics = list(leaderboard.METRICS)
         if metric not in valid_metrics:
             return JsonResponse({
                 'success': False,
                 'error': f'Invalid metric. Valid options: {", ".join(valid_metrics)}'
             }, status=400)
         
-        # Order players based on metric
-        if metric == 'win_rate':
-            # For win rate, we need players who have played at least 1 game
-            players = Player.objects.filter(games_played__gt=0).order_by('-games_won', '-games_played')[:limit]
-        elif metric == 'total_marks':
-            players = Player.objects.filter(games_played__gt=0).order_by('-total_game_marks')[:limit]
-        elif metric == 'games_won':
-            players = Player.objects.filter(games_played__gt=0).order_by('-games_won')[:limit]
-        elif metric == 'answer_accuracy':
-            players = Player.objects.filter(questions_answered__gt=0).order_by('-correct_answers', '-questions_answered')[:limit]
-        elif metric == 'win_streak':
-            players = Player.objects.filter(games_played__gt=0).order_by('-longest_win_streak')[:limit]
-        
-        leaderboard_data = []
-        for i, player in enumerate(players, 1):
-            player_data = {
-                'rank': i,
-                'username': player.username,
-                'player_name': player.player_name,
-                'games_played': player.games_played,
-                'games_won': player.games_won,
-                'total_marks': player.total_game_marks,
-                'win_rate': player.win_rate,
-                'answer_accuracy': player.answer_accuracy,
-                'current_win_streak': player.current_win_streak,
-                'longest_win_streak': player.longest_win_streak,
-                'last_played': player.last_game_played.isoformat() if player.last_game_played else None
-            }
-            leaderboard_data.append(player_data)
+        window = request.GET.get('window')
+        if window and window not in leaderboard.WINDOWS:
+            return JsonResponse({
+                'success': False,
+                'error': f'Invalid window. Valid options: {", ".join(leaderboard.WINDOWS)}'
+            }, status=400)
+        if window and metric not in leaderboard.WINDOW_METRICS:
+            return JsonResponse({
+                'success': False,
+                'error': f'Metric {metric} is only available all-time. '
+                         f'Windowed metrics: {", ".join(leaderboard.WINDOW_METRICS)}'
+            }, status=400)
         
-        return JsonResponse({
+        scope, error = leaderboard.parse_scope(request.GET)
+        if error:
+            return JsonResponse({
+                'success': False,
+                'error': error
+            }, status=400)
+        
+        username = request.GET.get('username')
+        my_rank = None
+        if window:
+            start_day = leaderboard.window_start(window)
+            rows = leaderboard.top_window_rows(metric, limit, start_day, scope)
+            leaderboard_data = [
+                leaderboard.serialize_window_row(row, rank) for rank, row in enumerate(rows, 1)
+            ]
+            if username:
+                rank, row = leaderboard.window_rank(username, metric, start_day, scope)
+                my_rank = leaderboard.serialize_window_row(row, rank) if rank else None
+        else:
+            entries = leaderboard.top_entries(metric, limit, scope)
+            leaderboard_data = [
+                leaderboard.serialize_entry(entry, rank) for rank, entry in enumerate(entries, 1)
+            ]
+            if username:
+                entry = LeaderboardEntry.objects.filter(player__username=username).first()
+                rank = leaderboard.rank_of(entry, metric, scope) if entry else None
+                my_rank = leaderboard.serialize_entry(entry, rank) if rank else None
+        
+        response = {
             'success': True,
             'metric': metric,
+            'window': {'name': window, 'start': start_day.isoformat()} if window else None,
+            'scope': {param: request.GET[param] for param in leaderboard.SCOPES if request.GET.get(param)},
             'total_players': len(leaderboard_data),
             'leaderboard': leaderboard_data
-        })
+        }
+        if metric == 'win_rate':
+            response['min_games'] = leaderboard.min_games()
+        elif metric == 'answer_accuracy':
+            response['min_answers'] = leaderboard.min_answers()
+        if username:
+            response['my_rank'] = my_rank
+        
+        return JsonResponse(response)
     
     except Exception as e:
         return JsonResponse({
@@ -1015,21 +1207,28 @@ def get_leaderboard_api(request):
 def get_card_questions_api(request, card_id):
     """
     Get questions associated with a specific card
-    GET /api/cards/{card_id}/questions/
+    GET /api/cards/{card_id}/questions/?language=english&difficulty=easy&question_type=true_false
     """
     try:
         # Validate card format
-        valid_cards = [choice[0] for choice in Question.CARD_CHOICES]
-        if card_id not in valid_cards:
+        if not is_valid_card(card_id):
+            return JsonResponse({
+                'success': False,
+                'error': f'Invalid card. Valid cards are: {", ".join(CARD_IDS)}'
+            }, status=400)
+        
+        filters, error = parse_question_filters(request.GET, fields=('language', 'difficulty', 'question_type'))
+        if error:
             return JsonResponse({
                 'success': False,
-                'error': f'Invalid card. Valid cards are: {", ".join(valid_cards)}'
+                'error': error
             }, status=400)
         
         # Get questions for the specified card
-        questions = Question.objects.filter(card=card_id)
+        questions = questions_for_card(card_id, filters.pop('language', None))
+        questions = filter_question_records(questions, filters)
         
-        if not questions.exists():
+        if not questions:
             return JsonResponse({
                 'success': False,
                 'error': f'No questions found for card {card_id}'
@@ -1054,7 +1253,7 @@ def get_card_questions_api(request, card_id):
             questions_data.append(question_data)
         
         # Get card info
-        card_info = Question(card=card_id).get_card_info()
+        card_info = get_card_info(card_id)
         
         return JsonResponse({
             'success': True,
@@ -1111,19 +1310,24 @@ def award_points_api(request):
                     'error': 'Answer is not correct'
                 }, status=400)
             
-            # Check if already answered to prevent duplicate points
-            if participant.question_answered and participant.answer_correct:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Player has already answered this question correctly'
-                }, status=400)
-            
             with transaction.atomic():
                 # Update participant with correct answer and award marks
-                participant.question_answered = True
-                participant.answer_correct = True
-                participant.marks_earned += points  # Add the earned mark
-                participant.save()
+                # The filter makes the duplicate check and the update a single atomic statement
+                updated = GameParticipant.objects.filter(pk=participant.pk).exclude(
+                    question_answered=True, answer_correct=True
+                ).update(
+                    question_answered=True,
+                    answer_correct=True,
+                    marks_earned=F('marks_earned') + points  # Add the earned mark
+                )
+                
+                # Check if already answered to prevent duplicate points
+                if not updated:
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Player has already answered this question correctly'
+                    }, status=400)
+                participant.refresh_from_db(fields=['question_answered', 'answer_correct', 'marks_earned'])
                 
                 # Update or create game response
                 response, created = GameResponse.objects.get_or_create(
@@ -1141,22 +1345,17 @@ def award_points_api(request):
                     # Update existing response
                     response.player_answer = answer
                     response.is_correct = True
-                    response.save()
+                    response.save(update_fields=['player_answer', 'is_correct'])
                 
                 # Update player's overall statistics
                 player = participant.player
-                player.total_game_marks += points
-                player.questions_answered += 1
-                player.correct_answers += 1
-                player.save()
+                player.record_answer(correct=True, marks_earned=points)
                 
                 # Update game result marks
-                game_result = GameResult.objects.get(game=game)
-                if participant.team == 1:
-                    game_result.team1_marks += points
-                else:
-                    game_result.team2_marks += points
-                game_result.save()
+                team_field = 'team1_marks' if participant.team == 1 else 'team2_marks'
+                if not GameResult.objects.filter(game=game).update(**{team_field: F(team_field) + points}):
+                    raise GameResult.DoesNotExist('GameResult matching query does not exist.')
+                game.mark_changed()
             
             return JsonResponse({
                 'success': True,
@@ -1252,18 +1451,16 @@ def record_wrong_answer_api(request):
                 # Update existing response
                 response.player_answer = answer
                 response.is_correct = False
-                response.save()
+                response.save(update_fields=['player_answer', 'is_correct'])
             
             # Update participant
             participant.question_answered = True
             participant.answer_correct = False
-            participant.save()
+            participant.save(update_fields=['question_answered', 'answer_correct'])
+            game.mark_changed()
             
             # Update player's question answering statistics
-            with transaction.atomic():
-                current_total = participant.player.questions_answered
-                participant.player.questions_answered = current_total + 1
-                participant.player.save()
+            participant.player.record_answer(correct=False)
             
             return JsonResponse({
                 'success': True,
@@ -1332,11 +1529,10 @@ def submit_completed_game_api(request):
             
         # Validate lost_card if provided
         if lost_card:
-            valid_cards = [choice[0] for choice in Question.CARD_CHOICES]
-            if lost_card not in valid_cards:
+            if not is_valid_card(lost_card):
                 return JsonResponse({
                     'success': False,
-                    'error': f'Invalid lost_card: {lost_card}. Valid cards are: {", ".join(valid_cards)}'
+                    'error': f'Invalid lost_card: {lost_card}. Valid cards are: {", ".join(CARD_IDS)}'
                 }, status=400)
 
         with transaction.atomic():
@@ -1411,76 +1607,214 @@ def submit_completed_game_api(request):
 
 # ==================== GAME CONTENT API ENDPOINTS ====================
 
+# Listing fields: name -> (model fields loaded with .only(), value of a loaded content)
+CONTENT_LIST_FIELDS = {
+    'id': (('id',), lambda content: content.id),
+    'title': (('title',), lambda content: content.title),
+    'language': (('language',), lambda content: content.language),
+    'age_group': (('age_group',), lambda content: content.age_group),
+    'topic': (('topic',), lambda content: content.topic),
+    'subtopic': (('subtopic',), lambda content: content.subtopic),
+    'all_subtopics': (('subtopic', 'info', 'subtopics_data'), lambda content: content.get_all_subtopics()),
+    'subtopics_count': (('subtopic', 'subtopics_data'), lambda content: content.get_subtopics_count()),
+    'hierarchy': (('topic', 'subtopic'), lambda content: content.get_hierarchy_display()),
+    'info': (('info',), lambda content: content.info),
+    'content_type': (('content_type',), lambda content: content.content_type),
+    'difficulty_level': (('difficulty_level',), lambda content: content.difficulty_level),
+    'status': (('status',), lambda content: content.status),
+    'tags': (('tags',), lambda content: content.get_tags_list()),
+    'card_association': (('card_association',), lambda content: content.card_association),
+    'view_count': (('view_count',), lambda content: content.view_count),
+    'usage_count': (('usage_count',), lambda content: content.usage_count),
+    'created_at': (('created_at',), lambda content: content.created_at.isoformat()),
+    'updated_at': (('updated_at',), lambda content: content.updated_at.isoformat()),
+}
+# view=summary: what menus need, without the info text and subtopic details
+CONTENT_SUMMARY_FIELDS = (
+    'id', 'title', 'language', 'age_group', 'topic', 'subtopic', 'hierarchy',
+    'content_type', 'difficulty_level', 'tags', 'card_association',
+)
+CONTENT_VIEWS = ('full', 'summary')
+
+
+def parse_content_fields(params):
+    """
+    Return (field names, error) for the fields/view listing parameters
+    fields is a comma-separated subset of CONTENT_LIST_FIELDS; id is always included.
+    """
+    if params.get('fields'):
+        names = [name.strip() for name in params['fields'].split(',') if name.strip()]
+        unknown = [name for name in names if name not in CONTENT_LIST_FIELDS]
+        if unknown:
+            return None, f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(CONTENT_LIST_FIELDS)}"
+        return ['id'] + [name for name in dict.fromkeys(names) if name != 'id'], None
+    view = params.get('view', 'full')
+    if view not in CONTENT_VIEWS:
+        return None, f"view must be one of: {', '.join(CONTENT_VIEWS)}"
+    return list(CONTENT_SUMMARY_FIELDS if view == 'summary' else CONTENT_LIST_FIELDS), None
+
+
+def encode_content_cursor(content):
+    """Opaque cursor after a content row of a newest-first listing"""
+    key = f'{content.created_at.isoformat()}|{content.id}'
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+
+def decode_content_cursor(cursor):
+    """Return (created_at, id) of a content cursor, or None if it is invalid"""
+    try:
+        key = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = key.rsplit('|', 1)
+        created_at = parse_datetime(created_at)
+        return (created_at, int(pk)) if created_at else None
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def filter_by_terms(queryset, field, text):
+    """
+    Keep game content whose field contains every word of text (the last one as
+    a prefix), using the search index instead of an icontains scan
+    """
+    ids = search.matching_ids('content', text, field=field)
+    if ids is None:
+        # Nothing indexable (e.g. a single letter): fall back to a substring match
+        return queryset.filter(**{f'{field}__icontains': text})
+    return queryset.filter(pk__in=ids)
+
+
+def parse_content_listing(params):
+    """
+    Return (listing, error) for a content listing request; listing holds the
+    filtered, newest-first queryset after the cursor, the fields, the limit
+    and the filters applied
+    """
+    fields, error = parse_content_fields(params)
+    if error:
+        return None, error
+    try:
+        limit = int(params.get('limit', CONTENT_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= CONTENT_MAX_PAGE_SIZE:
+        return None, f'limit must be an integer between 1 and {CONTENT_MAX_PAGE_SIZE}'
+    cursor = params.get('cursor')
+    after = decode_content_cursor(cursor) if cursor else None
+    if cursor and after is None:
+        return None, 'Invalid cursor'
+    
+    # Get query parameters
+    language = params.get('language')
+    age_group = params.get('age_group')
+    topic = params.get('topic')
+    subtopic = params.get('subtopic')
+    content_type = params.get('content_type')
+    status = params.get('status', 'published')  # Default to published
+    tag_filter = params.get('tags')
+    tags_match = params.get('tags_match', 'all')
+    if tags_match not in tags.MATCH_MODES:
+        return None, f"tags_match must be one of: {', '.join(tags.MATCH_MODES)}"
+    
+    # Start with published content only (unless specified otherwise)
+    content_queryset = GameContent.objects.filter(status=status)
+    
+    # Apply filters
+    if language:
+        content_queryset = content_queryset.filter(language=language)
+    if age_group:
+        content_queryset = content_queryset.filter(age_group=age_group)
+    if topic:
+        content_queryset = filter_by_terms(content_queryset, 'topic', topic)
+    if subtopic:
+        content_queryset = filter_by_terms(content_queryset, 'subtopic', subtopic)
+    if content_type:
+        content_queryset = content_queryset.filter(content_type=content_type)
+    if tag_filter:
+        content_queryset = tags.filter_contents(content_queryset, tag_filter, tags_match)
+    
+    # Newest first; the id breaks ties so the keyset cursor is exact
+    if after:
+        created_at, pk = after
+        content_queryset = content_queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    return {
+        'queryset': content_queryset.order_by('-created_at', '-id'),
+        'fields': fields,
+        'limit': limit,
+        'filters': {
+            'language': language,
+            'age_group': age_group,
+            'topic': topic,
+            'subtopic': subtopic,
+            'content_type': content_type,
+            'status': status,
+            'tags': tags.parse(tag_filter),
+            'tags_match': tags_match
+        },
+    }, None
+
+
+def game_content_version(request):
+    """
+    Validators of a content page, aggregated over the rows the page is built from
+    View and usage counters are written with update(), which leaves updated_at alone,
+    so their totals are part of the version when the response includes them.
+    """
+    listing, error = parse_content_listing(request.GET)
+    if error:
+        return None
+    counters = {
+        f'{name}_total': Sum(name) for name in ('view_count', 'usage_count') if name in listing['fields']
+    }
+    # The limit + 1 rows after the cursor; the last id moves when rows enter or leave the window
+    window = listing['queryset'][:listing['limit'] + 1].values('id')
+    return catalog_version(GameContent.objects.filter(pk__in=window), last_id=Max('id'), **counters)
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
+@catalog_condition(game_content_version)
 def get_game_content_api(request):
     """
     API endpoint to get game content with filtering options
     GET /api/game-content/?language=english&age_group=15-19&topic=history
+    GET /api/game-content/?tags=rwanda,culture&tags_match=any
+    GET /api/game-content/?view=summary&limit=50&cursor=<next_cursor>
+    
+    tags: comma-separated tags; content must have all of them (tags_match=all, default) or any (tags_match=any)
+    fields: comma-separated fields to return (see CONTENT_LIST_FIELDS); view=summary leaves out info and subtopics
+    limit, cursor: page size (default 100, max 1000) and the next_cursor of the previous page; newest first
     """
     try:
-        # Get query parameters
-        language = request.GET.get('language')
-        age_group = request.GET.get('age_group')
-        topic = request.GET.get('topic')
-        subtopic = request.GET.get('subtopic')
-        content_type = request.GET.get('content_type')
-        status = request.GET.get('status', 'published')  # Default to published
-        
-        # Start with published content only (unless specified otherwise)
-        content_queryset = GameContent.objects.filter(status=status)
-        
-        # Apply filters
-        if language:
-            content_queryset = content_queryset.filter(language=language)
-        if age_group:
-            content_queryset = content_queryset.filter(age_group=age_group)
-        if topic:
-            content_queryset = content_queryset.filter(topic__icontains=topic)
-        if subtopic:
-            content_queryset = content_queryset.filter(subtopic__icontains=subtopic)
-        if content_type:
-            content_queryset = content_queryset.filter(content_type=content_type)
-        
-        # Order by creation date (most recent first)
-        content_queryset = content_queryset.order_by('-created_at')
-        
-        # Convert to JSON format
-        content_data = []
-        for content in content_queryset:
-            content_data.append({
-                'id': content.id,
-                'title': content.title,
-                'language': content.language,
-                'age_group': content.age_group,
-                'topic': content.topic,
-                'subtopic': content.subtopic,
-                'all_subtopics': content.get_all_subtopics(),
-                'subtopics_count': content.get_subtopics_count(),
-                'hierarchy': content.get_hierarchy_display(),
-                'info': content.info,
-                'content_type': content.content_type,
-                'difficulty_level': content.difficulty_level,
-                'status': content.status,
-                'tags': content.get_tags_list(),
-                'card_association': content.card_association,
-                'view_count': content.view_count,
-                'usage_count': content.usage_count,
-                'created_at': content.created_at.isoformat(),
-                'updated_at': content.updated_at.isoformat(),
-            })
+        listing, error = parse_content_listing(request.GET)
+        if error:
+            return JsonResponse({
+                'success': False,
+                'error': error
+            }, status=400)
+        fields, limit = listing['fields'], listing['limit']
+        
+        model_fields = {'id', 'created_at'}
+        for name in fields:
+            model_fields.update(CONTENT_LIST_FIELDS[name][0])
+        content_queryset = listing['queryset'].only(*model_fields)
+        
+        # Fetch one extra row to know whether another page exists
+        contents = list(content_queryset[:limit + 1])
+        has_more = len(contents) > limit
+        contents = contents[:limit]
+        content_data = [
+            {name: CONTENT_LIST_FIELDS[name][1](content) for name in fields}
+            for content in contents
+        ]
         
         return JsonResponse({
             'success': True,
             'count': len(content_data),
-            'filters_applied': {
-                'language': language,
-                'age_group': age_group,
-                'topic': topic,
-                'subtopic': subtopic,
-                'content_type': content_type,
-                'status': status
-            },
+            'limit': limit,
+            'next_cursor': encode_content_cursor(contents[-1]) if has_more else None,
+            'has_more': has_more,
+            'fields': fields,
+            'filters_applied': listing['filters'],
             'content': content_data
         })
         
@@ -1501,8 +1835,9 @@ def get_game_content_detail_api(request, content_id):
     try:
         content = GameContent.objects.get(id=content_id)
         
-        # Increment view count
-        content.increment_view_count()
+        # Count the view in the per-worker buffer (written in batches, see counters.py)
+        content_counters.add(content.pk, 'view_count')
+        content_counters.apply_pending(content)
         
         # Prepare detailed response
         content_data = {
@@ -1585,7 +1920,7 @@ def get_game_content_by_language_age_api(request, language, age_group):
         # Apply additional filters
         topic = request.GET.get('topic', '')
         if topic:
-            contents = contents.filter(topic__icontains=topic)
+            contents = filter_by_terms(contents, 'topic', topic)
         
         difficulty = request.GET.get('difficulty', '')
         if difficulty:
@@ -1847,7 +2182,8 @@ def increment_content_usage_api(request):
             }, status=400)
         
         content = GameContent.objects.get(id=content_id)
-        content.increment_usage_count()
+        content_counters.add(content.pk, 'usage_count')
+        content_counters.apply_pending(content)
         
         return JsonResponse({
             'success': True,
@@ -1876,6 +2212,104 @@ def increment_content_usage_api(request):
         }, status=500)
 
 
+@csrf_exempt
+@require_http_methods(["GET"])
+def game_content_tags_api(request):
+    """
+    Tag cloud: the most used tags of game content with their counts
+    GET /api/game-content/tags/?language=english&status=published&limit=50
+    """
+    try:
+        limit = int(request.GET.get('limit', TAG_CLOUD_SIZE))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= TAG_CLOUD_MAX_SIZE:
+        return JsonResponse({
+            'success': False,
+            'error': f'limit must be an integer between 1 and {TAG_CLOUD_MAX_SIZE}'
+        }, status=400)
+
+    language = request.GET.get('language') or None
+    status = request.GET.get('status', 'published')
+    cloud = tags.tag_cloud(status=status, language=language, limit=limit)
+    return JsonResponse({
+        'success': True,
+        'count': len(cloud),
+        'filters_applied': {'language': language, 'status': status},
+        'tags': cloud,
+    })
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def search_api(request):
+    """
+    Ranked text search over published game content and questions
+    GET /api/search/?q=water%20cycle&type=content&language=english&page=1&limit=20
+
+    - q: search words; documents must contain all of them (the last one may be a prefix)
+    - type: 'content', 'question' or 'all' (default)
+    - language: restrict results to one language
+    - page, limit: 1-based page number and page size (default 20, max 100)
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'success': False, 'error': 'q is required'}, status=400)
+
+    kind = request.GET.get('type', 'all')
+    if kind not in ('all',) + search.KINDS:
+        return JsonResponse({
+            'success': False,
+            'error': f"type must be one of: all, {', '.join(search.KINDS)}"
+        }, status=400)
+    language = request.GET.get('language') or None
+
+    try:
+        page = int(request.GET.get('page', 1))
+        limit = int(request.GET.get('limit', SEARCH_PAGE_SIZE))
+    except ValueError:
+        page = limit = 0
+    if page < 1 or not 1 <= limit <= SEARCH_MAX_PAGE_SIZE:
+        return JsonResponse({
+            'success': False,
+            'error': f'page must be a positive integer and limit between 1 and {SEARCH_MAX_PAGE_SIZE}'
+        }, status=400)
+
+    kinds = search.KINDS if kind == 'all' else (kind,)
+    total, matches = search.search(query, kinds, language, limit=limit, offset=(page - 1) * limit)
+
+    results = []
+    for match_kind, document, score in matches:
+        if match_kind == 'content':
+            result = {
+                'id': document.id,
+                'title': document.title,
+                'topic': document.topic,
+                'subtopic': document.subtopic,
+                'age_group': document.age_group,
+                'content_type': document.content_type,
+            }
+        else:
+            result = {
+                'id': document.id,
+                'question_text': document.question_text,
+                'card': document.card,
+                'difficulty': document.difficulty,
+            }
+        results.append({'type': match_kind, 'language': document.language, 'score': score, **result})
+
+    return JsonResponse({
+        'success': True,
+        'query': query,
+        'terms': search.query_terms(query),
+        'total': total,
+        'page': page,
+        'limit': limit,
+        'has_more': page * limit < total,
+        'results': results,
+    })
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def submit_player_result_api(request):
@@ -1982,4 +2416,236 @@ def submit_player_result_api(request):
         return JsonResponse({
             'success': False,
             'error': str(e)
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def submit_game_results_api(request):
+    """
+    Submit every participant's result for a game in one request
+    POST payload: {
+        "match_id": "uuid-string",
+        "results": [
+            {"player_id": 1, "username": "alice", "player_name": "Alice", "team": 1, "is_winner": true},
+            {"player_id": 2, "username": "bob", "team": 2, "is_winner": false, "lost_card": "S3"}
+        ]
+    }
+    
+    Same post-game logic as submit-player-result, but participants, responses
+    and player statistics are written with bulk queries and the game is
+    finalized once, so the query count does not depend on the number of players.
+    bulk_update sends no post_save, so the leaderboard profile columns and the
+    token cache of renamed players are refreshed here instead of in signals.py.
+    """
+    try:
+        data = json.loads(request.body)
+        match_id = data.get('match_id')
+        results = data.get('results')
+        
+        if not match_id or not isinstance(results, list) or not results:
+            return JsonResponse({
+                'success': False,
+                'error': 'match_id and a non-empty results list are required'
+            }, status=400)
+        
+        # Validate every result before touching the database
+        required_fields = ['player_id', 'username', 'team', 'is_winner']
+        for index, result in enumerate(results):
+            if not isinstance(result, dict):
+                return JsonResponse({
+                    'success': False,
+                    'error': f'results[{index}] must be an object'
+                }, status=400)
+            missing_fields = [field for field in required_fields if result.get(field) is None]
+            if missing_fields:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'results[{index}] missing required fields: {", ".join(missing_fields)}'
+                }, status=400)
+            lost_card = result.get('lost_card')
+            if lost_card and not is_valid_card(lost_card):
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Invalid lost_card: {lost_card}. Valid cards are: {", ".join(CARD_IDS)}'
+                }, status=400)
+        
+        try:
+            player_ids = [int(result['player_id']) for result in results]
+        except (TypeError, ValueError):
+            return JsonResponse({
+                'success': False,
+                'error': 'player_id values must be integers'
+            }, status=400)
+        if len(set(player_ids)) != len(player_ids):
+            return JsonResponse({
+                'success': False,
+                'error': 'Each player can only appear once in results'
+            }, status=400)
+        
+        with transaction.atomic():
+            try:
+                game = Game.objects.select_for_update().get(match_id=match_id)
+            except Game.DoesNotExist:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Game with match_id {match_id} not found'
+                }, status=404)
+            
+            players = Player.objects.in_bulk(player_ids)
+            missing_players = [str(player_id) for player_id in player_ids if player_id not in players]
+            if missing_players:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Players not found: {", ".join(missing_players)}'
+                }, status=400)
+            
+            already_submitted = list(GameParticipant.objects.filter(
+                game=game, player_id__in=player_ids
+            ).values_list('player__username', flat=True))
+            if already_submitted:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Players have already submitted results for this game: {", ".join(already_submitted)}'
+                }, status=400)
+            
+            # Create all participants and set their stats to atomic update expressions
+            participants = []
+            # Only changed profile columns are written, so concurrent edits of the others survive
+            renamed = {'username': [], 'player_name': []}
+            for player_id, result in zip(player_ids, results):
+                player = players[player_id]
+                # Update player info if provided, like submit-player-result
+                if player.username != result['username']:
+                    player.username = result['username']
+                    renamed['username'].append(player)
+                if result.get('player_name') and player.player_name != result['player_name']:
+                    player.player_name = result['player_name']
+                    renamed['player_name'].append(player)
+                is_winner = bool(result['is_winner'])
+                marks_earned = 1 if is_winner else 0  # Winners automatically get 1 mark
+                participants.append(GameParticipant(
+                    game=game,
+                    player=player,
+                    team=result['team'],
+                    is_winner=is_winner,
+                    marks_earned=marks_earned,
+                    lost_card=result.get('lost_card') if not is_winner else None,
+                ))
+                for field, value in Player.game_stats_updates(won=is_winner, marks_earned=marks_earned).items():
+                    setattr(player, field, value)
+            
+            GameParticipant.objects.bulk_create(participants)
+            Player.objects.bulk_update(players.values(), Player.GAME_STATS_FIELDS)
+            for field, changed in renamed.items():
+                if changed:
+                    Player.objects.bulk_update(changed, [field])
+            renamed_ids = {player.pk for changed in renamed.values() for player in changed}
+            update_fields = LeaderboardEntry.STATS_FIELDS
+            if renamed_ids:
+                update_fields = LeaderboardEntry.PROFILE_FIELDS + update_fields
+            LeaderboardEntry.sync(Player.objects.filter(pk__in=players), update_fields=update_fields)
+            for player_id in renamed_ids:
+                token_cache.discard_player(player_id)
+            
+            # Resolve fun facts and loser questions with one query each
+            winners = [participant for participant in participants if participant.is_winner]
+            fun_facts = iter(random_questions(len(winners)))
+            loser_cards = [p.lost_card for p in participants if not p.is_winner and p.lost_card]
+            card_questions = questions_for_cards(loser_cards) if loser_cards else {}
+            
+            results_data = []
+            game_responses = []
+            for participant in participants:
+                if participant.is_winner:
+                    question = next(fun_facts, None)
+                else:
+                    questions = card_questions.get(participant.lost_card, ())
+                    question = questions[0] if questions else None
+                
+                response_data, game_response = build_post_game_response(
+                    participant, participant.lost_card, question
+                )
+                if game_response is not None:
+                    game_responses.append(game_response)
+                
+                results_data.append({
+                    'player': {
+                        'player_id': participant.player.id,
+                        'username': participant.player.username,
+                        'team': participant.team,
+                        'is_winner': participant.is_winner,
+                        'marks_earned': participant.marks_earned
+                    },
+                    'response': response_data
+                })
+            
+            GameResponse.objects.bulk_create(game_responses)
+            
+            # Finalize once for the whole batch
+            game_status = finalize_game_if_complete(game)
+            
+            return JsonResponse({
+                'success': True,
+                'message': f'{len(participants)} player result(s) submitted successfully',
+                'results': results_data,
+                'game_status': {
+                    'match_id': str(game.match_id),
+                    **game_status
+                }
+            })
+    
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid JSON payload'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+def metrics_access_allowed(request):
+    """Staff sessions, or `Authorization: Bearer <METRICS_TOKEN>` when a token is configured"""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+
+
+@require_http_methods(["GET"])
+def metrics_api(request):
+    """
+    Per-endpoint latency, SQL query counts and the most repeated SQL statements
+    of this worker process (see metrics.py)
+    Query params: top (number of SQL fingerprints, default 20, max 100)
+    """
+    if not metrics_access_allowed(request):
+        return JsonResponse({
+            'success': False,
+            'error': 'Permission denied'
+        }, status=403)
+    
+    try:
+        top = min(max(int(request.GET.get('top', 20)), 1), 100)
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'error': 'top must be an integer'
+        }, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'enabled': getattr(settings, 'METRICS_ENABLED', False),
+        'metrics': metrics_registry.snapshot(top)
+    })
+
+
+@require_http_methods(["GET"])
+def metrics_prometheus(request):
+    """The same metrics in the Prometheus text format"""
+    if not metrics_access_allowed(request):
+        return HttpResponse('Permission denied\n', status=403, content_type='text/plain')
+    return HttpResponse(metrics_registry.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')